@@ -0,0 +1,445 @@
+"""
+Benchmark cases - hot paths of the game measured at a given entity count.
+
+Each case is a setup function that takes N and returns a zero-argument
+callable running one frame's worth of work.
+"""
+
+import math
+import os
+import random
+import tempfile
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from ai.agents import ChasingAI, FlockingAI, SimpleAI
+from ai.env import DEFAULT_ENEMIES, GameEnvBatch
+from ai.flocking import FlockingSystem
+from ai.navigation import NavigationGrid
+from ai.observation import SceneObserver
+from ai.policy import PolicyAI, PolicySystem
+from game.collision import CollisionSystem
+from game.entities import Enemy, Entity
+from game.scenes import GameScene
+from game.snapshot import WorldSnapshot
+from game.spatial import SpatialHash
+from game.store import EntityStore
+from game.streaming import ChunkFile
+from utils.constants import CHUNK_SIZE
+from utils.text import TextRenderer
+
+# Fixed frame step used by every case
+FRAME_DT = 1.0 / 60
+
+# Area per entity in pixels, so density stays constant as N grows
+AREA_PER_ENTITY = 40.0 * 40.0
+
+
+def _spawn_enemies(count: int, store: EntityStore, seed: int = 0) -> list[Enemy]:
+    """Create enemies scattered at constant density with random velocities."""
+    rng = random.Random(seed)
+    side = (count * AREA_PER_ENTITY) ** 0.5
+    enemies = []
+    for _ in range(count):
+        enemy = Enemy(rng.uniform(0, side), rng.uniform(0, side), store)
+        enemy.velocity_x = rng.uniform(-50, 50)
+        enemy.velocity_y = rng.uniform(-50, 50)
+        enemies.append(enemy)
+    return enemies
+
+
+def entity_move(count: int) -> Callable[[], None]:
+    """Per-entity Entity.move calls."""
+    enemies = _spawn_enemies(count, EntityStore())
+
+    def frame() -> None:
+        for enemy in enemies:
+            enemy.move(FRAME_DT)
+
+    return frame
+
+
+def store_integrate(count: int) -> Callable[[], None]:
+    """Bulk EntityStore.integrate over rows allocated without Entity views."""
+    rng = np.random.default_rng(0)
+    side = (count * AREA_PER_ENTITY) ** 0.5
+    store = EntityStore()
+    store.allocate_many(
+        rng.uniform(0, side, count), rng.uniform(0, side, count), 24, 24
+    )
+    store.view("velocity_x")[:] = rng.uniform(-50, 50, count)
+    store.view("velocity_y")[:] = rng.uniform(-50, 50, count)
+
+    def frame() -> None:
+        store.integrate(FRAME_DT)
+
+    return frame
+
+
+def enemy_update(count: int) -> Callable[[], None]:
+    """Enemy.update (steer and move) for every enemy."""
+    enemies = _spawn_enemies(count, EntityStore())
+
+    def frame() -> None:
+        for enemy in enemies:
+            enemy.update(FRAME_DT)
+
+    return frame
+
+
+def simple_ai(count: int) -> Callable[[], None]:
+    """SimpleAI.update for every agent."""
+    agents = [SimpleAI(enemy) for enemy in _spawn_enemies(count, EntityStore())]
+
+    def frame() -> None:
+        for agent in agents:
+            agent.update(FRAME_DT, {})
+
+    return frame
+
+
+def chasing_ai(count: int) -> Callable[[], None]:
+    """ChasingAI.update for every agent chasing one target."""
+    store = EntityStore()
+    target = Enemy(0, 0, store)
+    agents = [ChasingAI(enemy) for enemy in _spawn_enemies(count, store)]
+    for agent in agents:
+        agent.set_target(target)
+
+    def frame() -> None:
+        for agent in agents:
+            agent.update(FRAME_DT, {})
+
+    return frame
+
+
+def chasing_flow_field(count: int) -> Callable[[], None]:
+    """ChasingAI.update for every agent following one shared flow field.
+
+    The target hops to a new cell every frame, so each frame pays for one
+    field rebuild on top of the per-agent lookups.
+    """
+    store = EntityStore()
+    target = Enemy(0, 0, store)
+    enemies = _spawn_enemies(count, store)
+    side = (count * AREA_PER_ENTITY) ** 0.5
+    navigation = NavigationGrid(side, side, cell_size=max(32.0, side / 128))
+    agents = [ChasingAI(enemy) for enemy in enemies]
+    for agent in agents:
+        agent.set_target(target)
+    game_state = {"navigation": navigation}
+
+    def frame() -> None:
+        target.x = (target.x + navigation.cell_size) % side
+        for agent in agents:
+            agent.update(FRAME_DT, game_state)
+
+    return frame
+
+
+def spatial_rebuild(count: int) -> Callable[[], None]:
+    """SpatialHash.rebuild after moving every entity one frame."""
+    store = EntityStore()
+    entities: list[Entity] = _spawn_enemies(count, store)
+    spatial_hash = SpatialHash()
+
+    def frame() -> None:
+        store.integrate(FRAME_DT)
+        spatial_hash.rebuild(entities, store)
+
+    return frame
+
+
+def flocking_ai(count: int) -> Callable[[], None]:
+    """Per-agent FlockingAI.update with a spatial hash rebuilt each frame."""
+    store = EntityStore()
+    entities: list[Entity] = _spawn_enemies(count, store)
+    agents = [FlockingAI(entity) for entity in entities]
+    spatial_hash = SpatialHash()
+    game_state = {"entities": entities, "spatial_hash": spatial_hash}
+
+    def frame() -> None:
+        spatial_hash.rebuild(entities, store)
+        for agent in agents:
+            agent.update(FRAME_DT, game_state)
+
+    return frame
+
+
+def flocking_system(count: int) -> Callable[[], None]:
+    """Batched FlockingSystem.update over every agent."""
+    entities: list[Entity] = _spawn_enemies(count, EntityStore())
+    system = FlockingSystem()
+    for entity in entities:
+        system.add(FlockingAI(entity))
+    game_state = {"entities": entities}
+
+    def frame() -> None:
+        system.update(FRAME_DT, game_state)
+
+    return frame
+
+
+def policy_ai(count: int) -> Callable[[], None]:
+    """PolicyAI.update for every agent, one forward pass each."""
+    store = EntityStore()
+    player = Enemy(0, 0, store)
+    agents = [PolicyAI(enemy) for enemy in _spawn_enemies(count, store)]
+    state = {"player": player}
+
+    def frame() -> None:
+        for agent in agents:
+            agent.update(FRAME_DT, state)
+
+    return frame
+
+
+def policy_system(count: int) -> Callable[[], None]:
+    """Batched PolicySystem.update over every agent."""
+    store = EntityStore()
+    player = Enemy(0, 0, store)
+    system = PolicySystem()
+    for enemy in _spawn_enemies(count, store):
+        system.add(PolicyAI(enemy))
+    state = {"player": player}
+
+    def frame() -> None:
+        system.update(FRAME_DT, state)
+
+    return frame
+
+
+def collisions(count: int) -> Callable[[], None]:
+    """CollisionSystem.update over every enemy, with contact tracking."""
+    entities: list[Entity] = _spawn_enemies(count, EntityStore())
+    system = CollisionSystem()
+
+    def frame() -> None:
+        system.update(entities)
+
+    return frame
+
+
+def enemy_waves(count: int) -> Callable[[], None]:
+    """A wave of pooled enemies with SimpleAI agents spawned and despawned."""
+    scene = GameScene()
+    scene.prewarm(count, SimpleAI)
+
+    def frame() -> None:
+        wave = [scene.spawn_enemy(0.0, 0.0, SimpleAI) for _ in range(count)]
+        scene.despawn_enemies(wave)
+
+    return frame
+
+
+def _chasing_scene(count: int) -> GameScene:
+    """Build a scene of N enemies chasing the player at constant density."""
+    rng = random.Random(0)
+    side = max((count * AREA_PER_ENTITY) ** 0.5, 800.0)
+    scene = GameScene(world_size=(side, side))
+    scene.despawn_enemies(list(scene.enemies))
+    for _ in range(count):
+        scene.spawn_enemy(rng.uniform(0, side), rng.uniform(0, side), ChasingAI)
+    return scene
+
+
+def scheduled_ai(count: int) -> Callable[[], None]:
+    """AIScheduler.update of N ChasingAI agents in this process."""
+    scene = _chasing_scene(count)
+    game_state = scene.game_state
+
+    def frame() -> None:
+        scene.scheduler.update(FRAME_DT, game_state)
+
+    return frame
+
+
+def parallel_ai(count: int) -> Callable[[], None]:
+    """The scheduled_ai work stepped in one worker process per core."""
+    scene = _chasing_scene(count)
+    scene.start_parallel_ai(os.cpu_count())
+    game_state = scene.game_state
+
+    def frame() -> None:
+        due = scene.scheduler.take_due(FRAME_DT)
+        scene.parallel.update(FRAME_DT, game_state, due)
+
+    # Shut the workers down once the runner drops the frame
+    weakref.finalize(frame, scene.stop_parallel_ai)
+    return frame
+
+
+def _streamed_world(
+    count: int, agent_type: type, walls: bool = False
+) -> Callable[[], None]:
+    """GameScene.update with the player crossing a chunk-file world of N enemies.
+
+    With ``walls`` every chunk has a wall of terrain across its middle.
+    """
+    rng = random.Random(0)
+    side = (count * AREA_PER_ENTITY) ** 0.5
+    columns = math.ceil(side / CHUNK_SIZE)
+    directory = tempfile.TemporaryDirectory()
+    chunks = ChunkFile.create(Path(directory.name) / "world.chunks", columns, columns)
+    for _ in range(count):
+        chunks.add_enemy(rng.uniform(0, side), rng.uniform(0, side), agent_type)
+    if walls:
+        tiles = np.zeros((chunks.tiles, chunks.tiles), np.uint8)
+        tiles[chunks.tiles // 2, 2:-2] = 1
+        for col in range(columns):
+            for row in range(columns):
+                chunks.write_tiles((col, row), tiles)
+    world = columns * CHUNK_SIZE
+    scene = GameScene(world_size=(world, world))
+    scene.despawn_enemies(list(scene.enemies))
+    scene.start_streaming(chunks)
+    # Walk the diagonal at a chunk per second, wrapping at the far corner
+    step = CHUNK_SIZE * FRAME_DT
+
+    def frame() -> None:
+        # The closure keeps the temporary directory alive
+        _ = directory
+        player = scene.player
+        player.x = player.y = (player.x + step) % (world - player.width)
+        scene.update(FRAME_DT)
+
+    return frame
+
+
+def world_streaming(count: int) -> Callable[[], None]:
+    """GameScene.update with the player crossing a chunk-file world of N enemies."""
+    return _streamed_world(count, SimpleAI)
+
+
+def chasing_streaming(count: int) -> Callable[[], None]:
+    """World streaming with N chasing enemies and walled terrain in every chunk.
+
+    Terrain loads and unloads as the player moves, so flow fields near the
+    changed chunks are rebuilt while every chaser follows one.
+    """
+    return _streamed_world(count, ChasingAI, walls=True)
+
+
+def snapshot_rollback(count: int) -> Callable[[], None]:
+    """WorldSnapshot capture and restore of a scene, as one rollback."""
+    scene = GameScene()
+    scene.enemies.extend(_spawn_enemies(count, scene.store))
+    previous = WorldSnapshot.capture(scene)
+
+    def frame() -> None:
+        WorldSnapshot.capture(scene, previous).restore(scene)
+
+    return frame
+
+
+def scene_render(count: int) -> Callable[[], None]:
+    """GameScene.render onto an off-screen surface."""
+    scene = GameScene()
+    scene.enemies.extend(_spawn_enemies(count, scene.store))
+    screen = pygame.Surface((800, 600))
+
+    def frame() -> None:
+        screen.fill((0, 0, 0))
+        scene.render(screen)
+
+    return frame
+
+
+def camera_render(count: int) -> Callable[[], None]:
+    """GameScene.render of the camera's view of a world holding every enemy."""
+    side = max((count * AREA_PER_ENTITY) ** 0.5, 800.0)
+    scene = GameScene(world_size=(side, side))
+    scene.enemies.extend(_spawn_enemies(count, scene.store))
+    scene.spatial_hash.rebuild(scene.entities, scene.store)
+    scene.camera.center_on(side / 2, side / 2)
+    screen = pygame.Surface((800, 600))
+
+    def frame() -> None:
+        screen.fill((0, 0, 0))
+        scene.render(screen)
+
+    return frame
+
+
+def scene_observation(count: int) -> Callable[[], None]:
+    """SceneObserver.observe of a scene as an 84x84 pixel view."""
+    scene = GameScene()
+    scene.enemies.extend(_spawn_enemies(count, scene.store))
+    observer = SceneObserver()
+
+    def frame() -> None:
+        observer.observe(scene)
+
+    return frame
+
+
+def occupancy(count: int) -> Callable[[], None]:
+    """SceneObserver.occupancy of a scene as an 84x84 grid per channel."""
+    scene = GameScene()
+    scene.enemies.extend(_spawn_enemies(count, scene.store))
+    observer = SceneObserver()
+
+    def frame() -> None:
+        observer.occupancy(scene)
+
+    return frame
+
+
+def hud_text(count: int) -> Callable[[], None]:
+    """TextRenderer.draw of changing numeric HUD labels, one per entity."""
+    renderer = TextRenderer()
+    screen = pygame.Surface((800, 600))
+    values = [0] * count
+
+    def frame() -> None:
+        for index in range(count):
+            values[index] += 1
+            renderer.draw(
+                screen, f"{values[index]:06d}", (0, index % 580), (255, 255, 255), 18
+            )
+
+    return frame
+
+
+def vec_env(count: int) -> Callable[[], None]:
+    """GameEnvBatch.step with random actions, one enemy per entity."""
+    batch = GameEnvBatch(max(count // DEFAULT_ENEMIES, 1), seed=7)
+    batch.reset()
+    actions = np.random.default_rng(7).uniform(-1.0, 1.0, batch.action_shape)
+
+    def frame() -> None:
+        batch.step(actions)
+
+    return frame
+
+
+CASES: dict[str, Callable[[int], Callable[[], None]]] = {
+    "entity_move": entity_move,
+    "store_integrate": store_integrate,
+    "enemy_update": enemy_update,
+    "simple_ai": simple_ai,
+    "chasing_ai": chasing_ai,
+    "chasing_flow_field": chasing_flow_field,
+    "spatial_rebuild": spatial_rebuild,
+    "flocking_ai": flocking_ai,
+    "flocking_system": flocking_system,
+    "policy_ai": policy_ai,
+    "policy_system": policy_system,
+    "collisions": collisions,
+    "enemy_waves": enemy_waves,
+    "scheduled_ai": scheduled_ai,
+    "parallel_ai": parallel_ai,
+    "world_streaming": world_streaming,
+    "chasing_streaming": chasing_streaming,
+    "snapshot_rollback": snapshot_rollback,
+    "scene_render": scene_render,
+    "camera_render": camera_render,
+    "scene_observation": scene_observation,
+    "occupancy": occupancy,
+    "hud_text": hud_text,
+    "vec_env": vec_env,
+}
@@ -0,0 +1,173 @@
+"""
+Scaling benchmark runner for entities, AI agents and rendering.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare baseline.json --tolerance 0.15
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Run without a window and make the game packages importable
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pygame
+from cases import CASES
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def measure_case(name: str, count: int, min_time: float, max_frames: int) -> dict:
+    """Time one case at one size and record its peak memory."""
+    setup = CASES[name]
+
+    # Peak memory covers setup plus one frame; tracemalloc is too slow to
+    # leave on while timing
+    gc.collect()
+    tracemalloc.start()
+    frame = setup(count)
+    frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del frame
+    gc.collect()
+
+    frame = setup(count)
+    frame()  # Warm-up
+    frame_times = []
+    start = time.perf_counter()
+    while len(frame_times) < max_frames:
+        frame_start = time.perf_counter()
+        frame()
+        frame_times.append(time.perf_counter() - frame_start)
+        if time.perf_counter() - start >= min_time:
+            break
+
+    frame_times.sort()
+    total = sum(frame_times)
+    return {
+        "case": name,
+        "n": count,
+        "frames": len(frame_times),
+        "frame_ms": 1000.0 * frame_times[len(frame_times) // 2],
+        "ops_per_sec": count * len(frame_times) / total if total > 0 else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    case_names: list[str], sizes: list[int], min_time: float, max_frames: int
+) -> dict:
+    """Run every case at every size and collect the results."""
+    results = []
+    for name in case_names:
+        for count in sizes:
+            result = measure_case(name, count, min_time, max_frames)
+            print(
+                f"{name:>16} n={count:<7} {result['frame_ms']:10.3f} ms/frame "
+                f"{result['ops_per_sec']:14.0f} ops/s "
+                f"{result['peak_memory_bytes'] / 1024:10.0f} KiB",
+                file=sys.stderr,
+            )
+            results.append(result)
+
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """List the cases whose frame time regressed beyond the tolerance."""
+    previous = {(r["case"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["case"], result["n"]))
+        if old is None or old["frame_ms"] <= 0:
+            continue
+        ratio = result["frame_ms"] / old["frame_ms"]
+        status = "REGRESSED" if ratio > 1.0 + tolerance else "ok"
+        line = (
+            f"{result['case']:>16} n={result['n']:<7} "
+            f"{old['frame_ms']:10.3f} -> {result['frame_ms']:10.3f} ms "
+            f"({ratio:5.2f}x) {status}"
+        )
+        print(line, file=sys.stderr)
+        if status != "ok":
+            regressions.append(line)
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--cases",
+        default=",".join(CASES),
+        help="comma-separated case names (default: all)",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma-separated entity counts",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="seconds to time each size"
+    )
+    parser.add_argument(
+        "--max-frames", type=int, default=1000, help="frame cap per size"
+    )
+    parser.add_argument("--output", type=Path, help="write JSON results here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed frame-time slowdown before flagging a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark suite."""
+    args = parse_args(argv)
+    case_names = [name for name in args.cases.split(",") if name]
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        print(f"Unknown cases: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    pygame.init()
+    try:
+        report = run_benchmarks(case_names, sizes, args.min_time, args.max_frames)
+    finally:
+        pygame.quit()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,15 @@ from abc import ABC, abstractmethod
 import pygame
 
 from game.entities import Entity
+from game.spatial import SpatialHash
+from utils.constants import (
+    ALIGNMENT_WEIGHT,
+    CHASING_SPEED,
+    COHESION_WEIGHT,
+    FLOCKING_RADIUS,
+    FLOCKING_SPEED,
+    SEPARATION_WEIGHT,
+)
 
 
 class AIAgent(ABC):
@@ -18,6 +27,11 @@ class AIAgent(ABC):
         self.entity = entity
         self.active = True
 
+    def reset(self, entity: Entity) -> None:
+        """Reactivate the agent steering another entity, e.g. from a pool."""
+        self.entity = entity
+        self.active = True
+
     @abstractmethod
     def update(self, dt: float, game_state: dict) -> None:
         """Update the AI agent."""
@@ -27,20 +41,34 @@ class AIAgent(ABC):
 class SimpleAI(AIAgent):
     """Simple AI that moves randomly."""
 
-    def __init__(self, entity: Entity):
-        """Initialize the simple AI."""
+    def __init__(self, entity: Entity, seed: int | None = None):
+        """Initialize the simple AI.
+
+        Each agent draws from its own random generator; pass ``seed`` to make
+        its moves reproducible.
+        """
         super().__init__(entity)
+        self.rng = random.Random(seed)
         self.direction_change_timer = 0.0
         self.direction_change_interval = 2.0  # Change direction every 2 seconds
         self.speed = 50.0
 
+    def reset(self, entity: Entity) -> None:
+        """Reactivate the agent with a fresh direction change timer.
+
+        The random generator keeps its state, so a seeded agent stays
+        reproducible across reuse.
+        """
+        super().reset(entity)
+        self.direction_change_timer = 0.0
+
     def update(self, dt: float, game_state: dict) -> None:
         """Update the simple AI."""
         self.direction_change_timer += dt
 
         if self.direction_change_timer >= self.direction_change_interval:
             # Choose a new random direction
-            angle = random.uniform(0, 2 * 3.14159)  # Random angle in radians
+            angle = self.rng.uniform(0, 2 * 3.14159)  # Random angle in radians
             self.entity.velocity_x = (
                 self.speed * pygame.math.Vector2(1, 0).rotate_rad(angle).x
             )
@@ -53,57 +81,97 @@ class SimpleAI(AIAgent):
 class ChasingAI(AIAgent):
     """AI that chases a target entity."""
 
-    def __init__(self, entity: Entity, speed: float = 100.0):
+    def __init__(self, entity: Entity, speed: float = CHASING_SPEED):
         """Initialize the chasing AI."""
         super().__init__(entity)
         self.speed = speed
         self.target: Entity | None = None
 
+    def reset(self, entity: Entity) -> None:
+        """Reactivate the agent with no target."""
+        super().reset(entity)
+        self.target = None
+
     def set_target(self, target: Entity) -> None:
         """Set the target entity to chase."""
         self.target = target
 
     def update(self, dt: float, game_state: dict) -> None:
-        """Update the chasing AI."""
+        """Update the chasing AI.
+
+        With a navigation grid in the game state, the agent follows the
+        target's shared flow field around obstacles; otherwise it heads
+        straight for the target. Either way it steers from its own center
+        to the target's.
+        """
         if not self.target:
             return
 
         # Calculate direction to target
-        dx = self.target.x - self.entity.x
-        dy = self.target.y - self.entity.y
+        entity, target = self.entity, self.target
+        center_x = entity.x + entity.width / 2
+        center_y = entity.y + entity.height / 2
+        target_x = target.x + target.width / 2
+        target_y = target.y + target.height / 2
+        dx = target_x - center_x
+        dy = target_y - center_y
+
+        navigation = game_state.get("navigation")
+        if navigation is not None:
+            field = navigation.flow_field(target_x, target_y)
+            waypoint = field.waypoint(center_x, center_y)
+            if waypoint is not None:
+                dx = waypoint[0] - center_x
+                dy = waypoint[1] - center_y
         distance = (dx**2 + dy**2) ** 0.5
 
         if distance > 0:
             # Normalize and apply speed
-            self.entity.velocity_x = (dx / distance) * self.speed
-            self.entity.velocity_y = (dy / distance) * self.speed
+            entity.velocity_x = (dx / distance) * self.speed
+            entity.velocity_y = (dy / distance) * self.speed
         else:
-            self.entity.velocity_x = 0
-            self.entity.velocity_y = 0
+            entity.velocity_x = 0
+            entity.velocity_y = 0
 
 
 class FlockingAI(AIAgent):
     """AI that implements basic flocking behavior (separation, alignment, cohesion)."""
 
-    def __init__(self, entity: Entity, speed: float = 80.0):
+    def __init__(self, entity: Entity, speed: float = FLOCKING_SPEED):
         """Initialize the flocking AI."""
         super().__init__(entity)
         self.speed = speed
         self.neighbors: list[Entity] = []
-        self.neighbor_radius = 100.0
-        self.separation_weight = 1.5
-        self.alignment_weight = 1.0
-        self.cohesion_weight = 1.0
+        self.neighbor_radius = FLOCKING_RADIUS
+        self.separation_weight = SEPARATION_WEIGHT
+        self.alignment_weight = ALIGNMENT_WEIGHT
+        self.cohesion_weight = COHESION_WEIGHT
+
+    def reset(self, entity: Entity) -> None:
+        """Reactivate the agent with no neighbors."""
+        super().reset(entity)
+        self.neighbors = []
+
+    def find_neighbors(
+        self, entities: list[Entity], spatial_hash: SpatialHash | None = None
+    ) -> None:
+        """Find neighboring entities within the flocking radius.
+
+        When a spatial hash is given, only entities in nearby cells are tested
+        instead of every entity in the world.
+        """
+        x, y = self.entity.x, self.entity.y
+        radius = self.neighbor_radius
+        if spatial_hash is not None:
+            entities = spatial_hash.query(x, y, radius)
 
-    def find_neighbors(self, entities: list[Entity]) -> None:
-        """Find neighboring entities within the flocking radius."""
+        radius_sq = radius * radius
         self.neighbors = []
         for other in entities:
-            if other != self.entity:
-                dx = other.x - self.entity.x
-                dy = other.y - self.entity.y
-                distance = (dx**2 + dy**2) ** 0.5
-                if distance < self.neighbor_radius:
+            if other is not self.entity:
+                dx = other.x - x
+                dy = other.y - y
+                if dx * dx + dy * dy < radius_sq:
                     self.neighbors.append(other)
 
     def separation(self) -> tuple[float, float]:
@@ -111,14 +179,16 @@ class FlockingAI(AIAgent):
         if not self.neighbors:
             return (0.0, 0.0)
 
+        x, y = self.entity.x, self.entity.y
         force_x, force_y = 0.0, 0.0
         for neighbor in self.neighbors:
-            dx = self.entity.x - neighbor.x
-            dy = self.entity.y - neighbor.y
-            distance = (dx**2 + dy**2) ** 0.5
-            if distance > 0:
-                force_x += dx / distance
-                force_y += dy / distance
+            dx = x - neighbor.x
+            dy = y - neighbor.y
+            distance_sq = dx * dx + dy * dy
+            if distance_sq > 0:
+                inv_distance = distance_sq**-0.5
+                force_x += dx * inv_distance
+                force_y += dy * inv_distance
 
         return (force_x, force_y)
 
@@ -147,9 +217,9 @@ class FlockingAI(AIAgent):
 
     def update(self, dt: float, game_state: dict) -> None:
         """Update the flocking AI."""
-        # Get all entities from game state
+        # Get all entities from game state, narrowed by the world spatial hash
         entities = game_state.get("entities", [])
-        self.find_neighbors(entities)
+        self.find_neighbors(entities, game_state.get("spatial_hash"))
 
         # Calculate forces
         sep_x, sep_y = self.separation()
@@ -169,7 +239,8 @@ class FlockingAI(AIAgent):
         )
 
         # Normalize and apply speed
-        magnitude = (total_x**2 + total_y**2) ** 0.5
-        if magnitude > 0:
-            self.entity.velocity_x = (total_x / magnitude) * self.speed
-            self.entity.velocity_y = (total_y / magnitude) * self.speed
+        magnitude_sq = total_x * total_x + total_y * total_y
+        if magnitude_sq > 0:
+            scale = self.speed * magnitude_sq**-0.5
+            self.entity.velocity_x = total_x * scale
+            self.entity.velocity_y = total_y * scale
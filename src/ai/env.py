@@ -0,0 +1,445 @@
+"""
+Environment module - vectorized GameScene environments for batch policy training.
+
+Each environment is a GameScene where a policy steers the enemies toward a
+player that wanders at random. All environments of a batch share one
+entity store, so a step for every environment is a handful of array
+operations. ``VecGameEnv`` steps one batch in-process or splits the
+environments across worker processes over shared memory, behind the same
+gym-style ``reset``/``step`` interface. Nothing here needs a display.
+"""
+
+import multiprocessing
+from collections.abc import Sequence
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from ai.policy import ACTION_SIZE, OBSERVATION_SIZE, observe_enemies
+from game.input import ScriptedInput
+from game.scenes import GameScene
+from game.store import EntityStore
+from utils.constants import (
+    ENEMY_SPEED,
+    PLAYER_SPEED,
+    SIM_RATE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+
+DEFAULT_ENEMIES = 4
+DEFAULT_MAX_EPISODE_STEPS = 600
+
+# Steps the player keeps walking in one direction
+PLAYER_HOLD_STEPS = 30
+
+# Reward for catching the player, and penalty per step for mean distance
+CATCH_REWARD = 1.0
+DISTANCE_PENALTY = 0.01
+
+# Player walking directions: the eight compass points and standing still
+_DIRECTIONS = np.array(
+    [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.float64
+)
+_DIRECTIONS[np.abs(_DIRECTIONS).sum(axis=1) == 2] *= np.sqrt(0.5)
+
+Seeds = int | Sequence[np.random.SeedSequence] | None
+
+
+def _env_seeds(seed: Seeds, count: int) -> list[np.random.SeedSequence]:
+    """Get one seed sequence per environment."""
+    if seed is None or isinstance(seed, int):
+        return np.random.SeedSequence(seed).spawn(count)
+    if len(seed) != count:
+        raise ValueError(f"Expected {count} seeds, got {len(seed)}")
+    return list(seed)
+
+
+class GameEnvBatch:
+    """Environments stepped in-process on one shared entity store.
+
+    Observations are float32 arrays of shape (envs, enemies,
+    OBSERVATION_SIZE) and actions of shape (envs, enemies, ACTION_SIZE).
+    Environments that finish an episode are reset in the same step, and
+    their last observation before the reset is reported in the step info.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        enemies: int = DEFAULT_ENEMIES,
+        seed: Seeds = None,
+        max_episode_steps: int = DEFAULT_MAX_EPISODE_STEPS,
+        dt: float = 1.0 / SIM_RATE,
+    ):
+        """Build the scenes for a batch of environments."""
+        if num_envs < 1 or enemies < 1:
+            raise ValueError("num_envs and enemies must be at least 1")
+        self.num_envs = num_envs
+        self.enemies = enemies
+        self.max_episode_steps = max_episode_steps
+        self.dt = dt
+        self.store = EntityStore()
+        self.scenes = []
+        for _ in range(num_envs):
+            scene = GameScene(controls=ScriptedInput([]), store=self.store)
+            while len(scene.enemies) < enemies:
+                scene.spawn_enemy(0.0, 0.0)
+            scene.despawn_enemies(scene.enemies[enemies:])
+            self.scenes.append(scene)
+
+        self.player_rows = np.array([scene.player.row for scene in self.scenes])
+        self.enemy_rows = np.array(
+            [[enemy.row for enemy in scene.enemies] for scene in self.scenes]
+        )
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self._player_direction = np.zeros((num_envs, 2))
+        self._rngs = [np.random.default_rng(s) for s in _env_seeds(seed, num_envs)]
+
+    def reset(self, seed: Seeds = None) -> np.ndarray:
+        """Start a new episode in every environment; returns observations."""
+        if seed is not None:
+            self._rngs = [
+                np.random.default_rng(s) for s in _env_seeds(seed, self.num_envs)
+            ]
+        self._reset_envs(np.arange(self.num_envs))
+        return self.observe()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Apply enemy actions and advance every environment one step.
+
+        Returns observations, rewards, terminated (player caught), truncated
+        (episode too long) and an info dict. When any environment was reset,
+        the info holds the ``_final_observation`` mask of those environments
+        and ``final_observation``, their last observations before the reset
+        (zeros for the others).
+        """
+        # Actions travel to workers as float32, so every backend rounds alike
+        actions = np.asarray(actions, dtype=np.float32)
+        if actions.shape != (self.num_envs, self.enemies, ACTION_SIZE):
+            raise ValueError(f"Actions must have shape {self.action_shape}")
+        store = self.store
+        players, enemies = self.player_rows, self.enemy_rows
+
+        # The player changes direction every PLAYER_HOLD_STEPS steps
+        turning = np.flatnonzero(self.episode_steps % PLAYER_HOLD_STEPS == 0)
+        for env in turning.tolist():
+            self._player_direction[env] = _DIRECTIONS[
+                self._rngs[env].integers(len(_DIRECTIONS))
+            ]
+        velocity_x, velocity_y = store.view("velocity_x"), store.view("velocity_y")
+        velocity_x[players] = self._player_direction[:, 0] * PLAYER_SPEED
+        velocity_y[players] = self._player_direction[:, 1] * PLAYER_SPEED
+        speeds = np.clip(actions, -1.0, 1.0) * ENEMY_SPEED
+        velocity_x[enemies] = speeds[..., 0]
+        velocity_y[enemies] = speeds[..., 1]
+
+        # Move everything at once and keep it in the world
+        store.integrate(self.dt)
+        x, y = store.view("x"), store.view("y")
+        width, height = store.view("width"), store.view("height")
+        for rows in (players, enemies):
+            x[rows] = np.clip(x[rows], 0.0, WORLD_WIDTH - width[rows])
+            y[rows] = np.clip(y[rows], 0.0, WORLD_HEIGHT - height[rows])
+        self.episode_steps += 1
+
+        # Caught when any enemy's box overlaps its player's
+        px, py = x[players][:, None], y[players][:, None]
+        pw, ph = width[players][:, None], height[players][:, None]
+        ex, ey, ew, eh = x[enemies], y[enemies], width[enemies], height[enemies]
+        overlap = (ex < px + pw) & (px < ex + ew) & (ey < py + ph) & (py < ey + eh)
+        terminated = overlap.any(axis=1)
+        truncated = ~terminated & (self.episode_steps >= self.max_episode_steps)
+
+        distance = np.hypot((px - ex) / WORLD_WIDTH, (py - ey) / WORLD_HEIGHT)
+        rewards = (
+            CATCH_REWARD * terminated - DISTANCE_PENALTY * distance.mean(axis=1)
+        ).astype(np.float32)
+
+        observations = self.observe()
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            finished = np.flatnonzero(done)
+            final_observations = np.zeros_like(observations)
+            final_observations[finished] = observations[finished]
+            info["final_observation"] = final_observations
+            info["_final_observation"] = done
+            self._reset_envs(finished)
+            observations[finished] = self.observe()[finished]
+        return observations, rewards, terminated, truncated, info
+
+    def observe(self) -> np.ndarray:
+        """Get every enemy's observation."""
+        store = self.store
+        players, enemies = self.player_rows, self.enemy_rows
+        x, y = store.view("x"), store.view("y")
+        return observe_enemies(
+            x[enemies],
+            y[enemies],
+            store.view("velocity_x")[enemies],
+            store.view("velocity_y")[enemies],
+            x[players][:, None],
+            y[players][:, None],
+        )
+
+    @property
+    def observation_shape(self) -> tuple[int, int, int]:
+        """Get the shape of a batch of observations."""
+        return (self.num_envs, self.enemies, OBSERVATION_SIZE)
+
+    @property
+    def action_shape(self) -> tuple[int, int, int]:
+        """Get the shape of a batch of actions."""
+        return (self.num_envs, self.enemies, ACTION_SIZE)
+
+    def _reset_envs(self, envs: np.ndarray) -> None:
+        """Scatter the player and enemies of some environments at random."""
+        store = self.store
+        for env in envs.tolist():
+            rng = self._rngs[env]
+            rows = [self.player_rows[env], *self.enemy_rows[env].tolist()]
+            for row in rows:
+                store.x[row] = rng.uniform(0.0, WORLD_WIDTH - store.width[row])
+                store.y[row] = rng.uniform(0.0, WORLD_HEIGHT - store.height[row])
+                store.velocity_x[row] = 0.0
+                store.velocity_y[row] = 0.0
+                store.snap(row)
+        self.episode_steps[envs] = 0
+
+
+# Arrays shared between VecGameEnv and its workers: (dtype, trailing shape)
+_SHARED_ARRAYS = {
+    "observations": (np.float32, (OBSERVATION_SIZE,)),
+    "final_observations": (np.float32, (OBSERVATION_SIZE,)),
+    "actions": (np.float32, (ACTION_SIZE,)),
+    "rewards": (np.float32, None),
+    "terminated": (np.bool_, None),
+    "truncated": (np.bool_, None),
+    "done": (np.bool_, None),
+}
+
+
+class _SharedArrays:
+    """Batch inputs and outputs in named shared memory."""
+
+    def __init__(
+        self, num_envs: int, enemies: int, names: dict[str, str] | None = None
+    ):
+        self.owner = names is None
+        self.memory: dict[str, SharedMemory] = {}
+        self.arrays: dict[str, np.ndarray] = {}
+        for key, (dtype, trailing) in _SHARED_ARRAYS.items():
+            shape = (num_envs,) if trailing is None else (num_envs, enemies, *trailing)
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if self.owner:
+                memory = SharedMemory(create=True, size=max(size, 1))
+            else:
+                memory = SharedMemory(name=names[key])
+            self.memory[key] = memory
+            self.arrays[key] = np.ndarray(shape, dtype, memory.buf)
+
+    @property
+    def names(self) -> dict[str, str]:
+        """Get the shared-memory names workers attach to."""
+        return {key: memory.name for key, memory in self.memory.items()}
+
+    def close(self) -> None:
+        """Detach from the memory, and free it if this process created it."""
+        self.arrays = {}
+        for memory in self.memory.values():
+            memory.close()
+            if self.owner:
+                memory.unlink()
+        self.memory = {}
+
+
+def _worker_main(conn: Connection) -> None:
+    """Run one worker: step its slice of environments on each command."""
+    shared: _SharedArrays | None = None
+    batch: GameEnvBatch | None = None
+    envs = slice(0, 0)
+
+    def publish(observations: np.ndarray) -> None:
+        shared.arrays["observations"][envs] = observations
+
+    while True:
+        command, payload = conn.recv()
+        if command == "attach":
+            shared = _SharedArrays(
+                payload["num_envs"], payload["enemies"], payload["names"]
+            )
+            envs = slice(payload["start"], payload["end"])
+            batch = GameEnvBatch(
+                payload["end"] - payload["start"],
+                payload["enemies"],
+                payload["seeds"],
+                payload["max_episode_steps"],
+                payload["dt"],
+            )
+            conn.send("ok")
+        elif command == "reset":
+            publish(batch.reset(payload))
+            conn.send("ok")
+        elif command == "step":
+            arrays = shared.arrays
+            observations, rewards, terminated, truncated, info = batch.step(
+                arrays["actions"][envs]
+            )
+            publish(observations)
+            arrays["rewards"][envs] = rewards
+            arrays["terminated"][envs] = terminated
+            arrays["truncated"][envs] = truncated
+            arrays["done"][envs] = info.get("_final_observation", False)
+            arrays["final_observations"][envs] = info.get("final_observation", 0.0)
+            conn.send("ok")
+        elif command == "stop":
+            if shared is not None:
+                shared.close()
+            conn.send("bye")
+            return
+
+
+class VecGameEnv:
+    """Gym-style vector of GameScene environments stepped in lockstep.
+
+    With ``workers`` 0 every environment runs in one in-process
+    ``GameEnvBatch``. Otherwise the environments are split across that
+    many worker processes, which read actions from and write results to
+    shared memory; the results are identical either way for the same seed.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        enemies: int = DEFAULT_ENEMIES,
+        workers: int = 0,
+        seed: int | None = None,
+        max_episode_steps: int = DEFAULT_MAX_EPISODE_STEPS,
+        dt: float = 1.0 / SIM_RATE,
+    ):
+        """Create the environments, starting worker processes if asked to."""
+        if num_envs < 1 or enemies < 1:
+            raise ValueError("num_envs and enemies must be at least 1")
+        self.num_envs = num_envs
+        self.enemies = enemies
+        self.observation_shape = (num_envs, enemies, OBSERVATION_SIZE)
+        self.action_shape = (num_envs, enemies, ACTION_SIZE)
+        self._batch: GameEnvBatch | None = None
+        self._shared: _SharedArrays | None = None
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        # (start, end) range of environments stepped by each worker
+        self._slices: list[tuple[int, int]] = []
+
+        seeds = _env_seeds(seed, num_envs)
+        if workers <= 0:
+            self._batch = GameEnvBatch(num_envs, enemies, seeds, max_episode_steps, dt)
+            return
+
+        context = multiprocessing.get_context("spawn")
+        self._shared = _SharedArrays(num_envs, enemies)
+        bounds = np.linspace(0, num_envs, min(workers, num_envs) + 1).astype(int)
+        self._slices = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        try:
+            for start, end in self._slices:
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_worker_main, args=(child,), daemon=True
+                )
+                process.start()
+                self._processes.append(process)
+                self._connections.append(parent)
+                payload = {
+                    "names": self._shared.names,
+                    "num_envs": num_envs,
+                    "enemies": enemies,
+                    "start": start,
+                    "end": end,
+                    "seeds": seeds[start:end],
+                    "max_episode_steps": max_episode_steps,
+                    "dt": dt,
+                }
+                parent.send(("attach", payload))
+            self._gather()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "VecGameEnv":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Start a new episode in every environment.
+
+        Returns the observations and an empty info dict.
+        """
+        seeds = None if seed is None else _env_seeds(seed, self.num_envs)
+        if self._batch is not None:
+            return self._batch.reset(seeds), {}
+
+        for conn, (start, end) in zip(self._connections, self._slices):
+            conn.send(("reset", None if seeds is None else seeds[start:end]))
+        self._gather()
+        return self._shared.arrays["observations"].copy(), {}
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Advance every environment one step; see ``GameEnvBatch.step``."""
+        if self._batch is not None:
+            return self._batch.step(actions)
+
+        arrays = self._shared.arrays
+        actions = np.asarray(actions)
+        if actions.shape != self.action_shape:
+            raise ValueError(f"Actions must have shape {self.action_shape}")
+        arrays["actions"][:] = actions
+        for conn in self._connections:
+            conn.send(("step", None))
+        self._gather()
+
+        info = {}
+        done = arrays["done"].copy()
+        if done.any():
+            info["final_observation"] = arrays["final_observations"].copy()
+            info["_final_observation"] = done
+        return (
+            arrays["observations"].copy(),
+            arrays["rewards"].copy(),
+            arrays["terminated"].copy(),
+            arrays["truncated"].copy(),
+            info,
+        )
+
+    def close(self) -> None:
+        """Shut down the workers and free shared memory."""
+        for conn in self._connections:
+            try:
+                conn.send(("stop", None))
+                conn.recv()
+            except (EOFError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _gather(self) -> None:
+        """Wait until every worker has replied; this is the step barrier."""
+        for conn in self._connections:
+            reply = conn.recv()
+            if reply != "ok":
+                raise RuntimeError(f"Unexpected worker reply: {reply!r}")
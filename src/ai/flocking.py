@@ -0,0 +1,194 @@
+"""
+Flocking system module - batched NumPy implementation of FlockingAI steering.
+"""
+
+import numpy as np
+
+from ai.agents import FlockingAI
+from game.entities import Entity
+
+# Offsets of the 3x3 block of grid cells around an agent's cell
+_CELL_OFFSETS = [(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)]
+
+# Use a dense per-cell table while the grid has at most this many cells per body
+_DENSE_GRID_FACTOR = 8
+
+
+def _gather_state(entities: list[Entity]) -> tuple[np.ndarray, ...]:
+    """Get position and velocity arrays for a list of entities.
+
+    Entities that share one store are read straight from its columns.
+    """
+    count = len(entities)
+    store = entities[0].store
+    if all(entity.store is store for entity in entities):
+        rows = np.fromiter((entity.row for entity in entities), np.intp, count)
+        return tuple(
+            store.gather(field, rows)
+            for field in ("x", "y", "velocity_x", "velocity_y")
+        )
+    return (
+        np.fromiter((e.x for e in entities), np.float64, count),
+        np.fromiter((e.y for e in entities), np.float64, count),
+        np.fromiter((e.velocity_x for e in entities), np.float64, count),
+        np.fromiter((e.velocity_y for e in entities), np.float64, count),
+    )
+
+
+class FlockingSystem:
+    """Computes separation, alignment and cohesion for many agents at once.
+
+    All agents are evaluated against the same start-of-frame positions and
+    velocities, so each result matches what ``FlockingAI.update`` would give
+    for that agent against the same snapshot. ``FlockingAI.neighbors`` is not
+    populated on this path.
+    """
+
+    def __init__(self):
+        """Initialize the flocking system."""
+        self.agents: list[FlockingAI] = []
+
+    def __len__(self) -> int:
+        """Return the number of registered agents."""
+        return len(self.agents)
+
+    def add(self, agent: FlockingAI) -> None:
+        """Register a flocking agent with the system."""
+        self.agents.append(agent)
+
+    def remove(self, agent: FlockingAI) -> None:
+        """Unregister a flocking agent."""
+        self.agents.remove(agent)
+
+    def update(self, dt: float, game_state: dict) -> None:
+        """Steer every active agent in one batched pass."""
+        agents = [agent for agent in self.agents if agent.active]
+        entities = game_state.get("entities", [])
+        if not agents or not entities:
+            return
+
+        vel_x, vel_y = self.compute_velocities(agents, entities)
+        for agent, vx, vy in zip(agents, vel_x.tolist(), vel_y.tolist()):
+            agent.entity.velocity_x = vx
+            agent.entity.velocity_y = vy
+
+    def compute_velocities(
+        self, agents: list[FlockingAI], entities: list[Entity]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Compute the new velocity of each agent without applying it."""
+        n = len(agents)
+        ex, ey, evx, evy = _gather_state(entities)
+
+        bodies = [agent.entity for agent in agents]
+        ax, ay, avx, avy = _gather_state(bodies)
+        radius = np.fromiter((a.neighbor_radius for a in agents), np.float64, n)
+        w_sep = np.fromiter((a.separation_weight for a in agents), np.float64, n)
+        w_align = np.fromiter((a.alignment_weight for a in agents), np.float64, n)
+        w_coh = np.fromiter((a.cohesion_weight for a in agents), np.float64, n)
+        speed = np.fromiter((a.speed for a in agents), np.float64, n)
+
+        index_of = {id(e): i for i, e in enumerate(entities)}
+        self_index = np.fromiter((index_of.get(id(e), -1) for e in bodies), np.intp, n)
+
+        # Work on entity arrays sorted by grid cell so neighbor gathers are local
+        agent_idx, cand, order = self._candidate_pairs(ax, ay, ex, ey, radius.max())
+        ex, ey, evx, evy = ex[order], ey[order], evx[order], evy[order]
+
+        # Exact distance test against each agent's radius
+        dx = ex[cand] - ax[agent_idx]
+        dy = ey[cand] - ay[agent_idx]
+        dist_sq = dx * dx + dy * dy
+        if np.all(radius == radius[0]):
+            keep = np.flatnonzero(dist_sq < radius[0] ** 2)
+        else:
+            keep = np.flatnonzero(dist_sq < radius[agent_idx] ** 2)
+        agent_idx, cand = agent_idx[keep], cand[keep]
+        dx, dy, dist_sq = dx[keep], dy[keep], dist_sq[keep]
+
+        # Each agent's own entity passed the test at distance zero; take its
+        # contribution back out instead of masking it per pair
+        own = (self_index >= 0) & (radius > 0)
+
+        count = np.bincount(agent_idx, minlength=n) - own
+        safe_count = np.maximum(count, 1)
+
+        # Separation: unit vectors pointing away from each neighbor
+        with np.errstate(divide="ignore"):
+            inv_dist = np.where(dist_sq > 0, 1.0 / np.sqrt(dist_sq), 0.0)
+        sep_x = np.bincount(agent_idx, -dx * inv_dist, n)
+        sep_y = np.bincount(agent_idx, -dy * inv_dist, n)
+
+        # Alignment: average neighbor velocity
+        sum_vx = np.bincount(agent_idx, evx[cand], n) - np.where(own, avx, 0.0)
+        sum_vy = np.bincount(agent_idx, evy[cand], n) - np.where(own, avy, 0.0)
+        align_x = sum_vx / safe_count
+        align_y = sum_vy / safe_count
+
+        # Cohesion: offset to the neighbors' center
+        has_neighbors = count > 0
+        sum_x = np.bincount(agent_idx, ex[cand], n) - np.where(own, ax, 0.0)
+        sum_y = np.bincount(agent_idx, ey[cand], n) - np.where(own, ay, 0.0)
+        coh_x = np.where(has_neighbors, sum_x / safe_count - ax, 0.0)
+        coh_y = np.where(has_neighbors, sum_y / safe_count - ay, 0.0)
+
+        total_x = sep_x * w_sep + align_x * w_align + coh_x * w_coh
+        total_y = sep_y * w_sep + align_y * w_align + coh_y * w_coh
+
+        # Normalize and apply speed; agents with no net force keep their velocity
+        magnitude = np.hypot(total_x, total_y)
+        moving = magnitude > 0
+        scale = np.divide(speed, magnitude, out=np.zeros(n), where=moving)
+        vel_x = np.where(moving, total_x * scale, avx)
+        vel_y = np.where(moving, total_y * scale, avy)
+        return vel_x, vel_y
+
+    @staticmethod
+    def _candidate_pairs(
+        ax: np.ndarray,
+        ay: np.ndarray,
+        ex: np.ndarray,
+        ey: np.ndarray,
+        cell_size: float,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get (agent, entity) index pairs that share a 3x3 cell block.
+
+        Entity indices refer to positions in the cell-sorted order, which is
+        returned as the third element.
+        """
+        ecx = np.floor(ex / cell_size).astype(np.int64)
+        ecy = np.floor(ey / cell_size).astype(np.int64)
+        acx = np.floor(ax / cell_size).astype(np.int64)
+        acy = np.floor(ay / cell_size).astype(np.int64)
+
+        # Pad the key space by one cell so offset lookups never wrap around
+        min_cx = min(ecx.min(), acx.min()) - 1
+        min_cy = min(ecy.min(), acy.min()) - 1
+        rows = max(ecy.max(), acy.max()) - min_cy + 2
+
+        cols = max(ecx.max(), acx.max()) - min_cx + 2
+
+        keys = (ecx - min_cx) * rows + (ecy - min_cy)
+        order = np.argsort(keys, kind="stable")
+
+        agent_keys = (acx - min_cx) * rows + (acy - min_cy)
+        offsets = np.array([ox * rows + oy for ox, oy in _CELL_OFFSETS])
+        lookup = (agent_keys[None, :] + offsets[:, None]).ravel()
+
+        if cols * rows <= _DENSE_GRID_FACTOR * (len(ex) + len(ax)):
+            # Dense grid: per-cell counts give O(1) range lookups
+            cell_counts = np.bincount(keys, minlength=cols * rows)
+            cell_starts = np.cumsum(cell_counts) - cell_counts
+            starts = cell_starts[lookup]
+            counts = cell_counts[lookup]
+        else:
+            # Sparse grid: binary search the sorted keys instead
+            sorted_keys = keys[order]
+            starts = np.searchsorted(sorted_keys, lookup, side="left")
+            counts = np.searchsorted(sorted_keys, lookup, side="right") - starts
+
+        # Expand each [start, start + count) range into flat index arrays
+        total = int(counts.sum())
+        agent_idx = np.repeat(np.tile(np.arange(len(ax)), len(offsets)), counts)
+        seg_begin = np.cumsum(counts) - counts
+        positions = np.arange(total) - np.repeat(seg_begin - starts, counts)
+        return agent_idx, positions, order
@@ -0,0 +1,329 @@
+"""
+Navigation module - grid obstacles and shared flow fields for pathfinding.
+"""
+
+import math
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.constants import NAV_CELL_SIZE, NAV_FIELD_RADIUS, WORLD_HEIGHT, WORLD_WIDTH
+
+# Flow fields kept per grid before the least recently used one is dropped
+DEFAULT_MAX_FIELDS = 16
+
+# Neighbor offsets (dx, dy, cost); diagonals cost sqrt(2)
+_STEPS = [
+    (1, 0, 1.0),
+    (-1, 0, 1.0),
+    (0, 1, 1.0),
+    (0, -1, 1.0),
+    (1, 1, math.sqrt(2.0)),
+    (1, -1, math.sqrt(2.0)),
+    (-1, 1, math.sqrt(2.0)),
+    (-1, -1, math.sqrt(2.0)),
+]
+
+
+def _sweep_distances(blocked: np.ndarray, target: tuple[int, int]) -> np.ndarray:
+    """Get every cell's shortest 8-connected path length to a target cell.
+
+    Rows are relaxed in alternating top-down and bottom-up sweeps until
+    nothing improves. Each row pulls straight and diagonal steps from the
+    row before it, then runs prefix minima both ways along itself, so one
+    sweep covers any path that doesn't turn back vertically. Rows whose
+    neighbor hasn't changed since they last pulled from it are skipped.
+    The result matches Dijkstra's algorithm at a fraction of the cost.
+    """
+    rows, cols = blocked.shape
+    distances = np.full((rows, cols), math.inf)
+    tx, ty = target
+    if blocked[ty, tx]:
+        return distances
+    distances[ty, tx] = 0.0
+
+    free = ~blocked
+    # Steps between row k and k + 1: straight down at x, and either diagonal
+    # across the 2 x 2 block at x, which may not cut a blocked corner
+    straight = free[1:] & free[:-1]
+    diagonal = straight[:, 1:] & straight[:, :-1]
+    diagonal_cost = math.sqrt(2.0)
+
+    # Offsetting each run of free cells by a large multiple keeps prefix
+    # minima from reaching past a blocked cell; values pushed past
+    # ``limit`` that way are reset to infinity
+    scale = 2.0 ** math.ceil(math.log2(4 * (rows * cols + cols)))
+    limit = scale / 2
+    column = np.arange(cols, dtype=np.float64)
+    forward = np.cumsum(blocked, axis=1) * scale + column
+    backward = np.cumsum(blocked[:, ::-1], axis=1) * scale + column
+
+    def along_row(y: int) -> None:
+        row = distances[y]
+        ahead = row - forward[y]
+        np.minimum.accumulate(ahead, out=ahead)
+        ahead += forward[y]
+        np.minimum(row, ahead, out=row)
+        behind = row[::-1] - backward[y]
+        np.minimum.accumulate(behind, out=behind)
+        behind += backward[y]
+        np.minimum(row, behind[::-1], out=row)
+        row[row > limit] = math.inf
+
+    def pull(y: int, source: int) -> bool:
+        step = min(y, source)
+        previous = distances[source]
+        candidate = np.where(straight[step], previous + 1.0, math.inf)
+        corners = diagonal[step]
+        np.minimum(
+            candidate[1:],
+            np.where(corners, previous[:-1] + diagonal_cost, math.inf),
+            out=candidate[1:],
+        )
+        np.minimum(
+            candidate[:-1],
+            np.where(corners, previous[1:] + diagonal_cost, math.inf),
+            out=candidate[:-1],
+        )
+        row = distances[y]
+        if not (candidate < row).any():
+            return False
+        np.minimum(row, candidate, out=row)
+        return True
+
+    # Count changes per row, and the neighbor's count as of each row's
+    # last pull from above and from below
+    changes = [0] * rows
+    pulled_down = [-1] * rows
+    pulled_up = [-1] * rows
+    along_row(ty)
+    changes[ty] = 1
+    improved = True
+    while improved:
+        improved = False
+        for y, source, pulled in (
+            *((y, y - 1, pulled_down) for y in range(1, rows)),
+            *((y, y + 1, pulled_up) for y in range(rows - 2, -1, -1)),
+        ):
+            if pulled[y] == changes[source]:
+                continue
+            pulled[y] = changes[source]
+            if pull(y, source):
+                along_row(y)
+                changes[y] += 1
+                improved = True
+    return distances
+
+
+def _next_cells(
+    blocked: np.ndarray, distances: np.ndarray, target: tuple[int, int]
+) -> np.ndarray:
+    """Get the flat index of each cell's downhill neighbor, or -1 if none.
+
+    The target cell points at itself.
+    """
+    rows, cols = distances.shape
+    best = np.full((rows, cols), math.inf)
+    next_cell = np.full((rows, cols), -1, np.int64)
+    index = np.arange(rows * cols).reshape(rows, cols)
+    padded = np.pad(distances, 1, constant_values=math.inf)
+    free = np.pad(~blocked, 1, constant_values=False)
+    for dx, dy, cost in _STEPS:
+        neighbor = padded[1 + dy : 1 + dy + rows, 1 + dx : 1 + dx + cols] + cost
+        if dx and dy:
+            # Don't cut corners past a blocked cell
+            corners = (
+                free[1 : 1 + rows, 1 + dx : 1 + dx + cols]
+                & free[1 + dy : 1 + dy + rows, 1 : 1 + cols]
+            )
+            neighbor[~corners] = math.inf
+        better = neighbor < best
+        best[better] = neighbor[better]
+        next_cell[better] = index[better] + (dy * cols + dx)
+    next_cell[~np.isfinite(distances)] = -1
+    tx, ty = target
+    if np.isfinite(distances[ty, tx]):
+        next_cell[ty, tx] = index[ty, tx]
+    return next_cell
+
+
+class FlowField:
+    """Shortest-path distances and next steps toward one target cell.
+
+    Built once by relaxing the grid's cells within ``radius`` of the target
+    in vectorized row sweeps; afterwards any number of agents can look up
+    their next waypoint in O(1). Paths stay inside that window, and cells
+    outside it have no distance, so a field's cost and size don't grow with
+    the map.
+    """
+
+    def __init__(
+        self,
+        grid: "NavigationGrid",
+        target_cell: tuple[int, int],
+        radius: int | None = None,
+    ):
+        """Build the flow field for a target cell, over the whole grid by default."""
+        self.grid = grid
+        self.target_cell = target_cell
+        tx, ty = target_cell
+        if radius is None:
+            self.left, self.top, self.right, self.bottom = 0, 0, grid.cols, grid.rows
+        else:
+            self.left, self.top = max(tx - radius, 0), max(ty - radius, 0)
+            self.right = min(tx + radius + 1, grid.cols)
+            self.bottom = min(ty + radius + 1, grid.rows)
+        self.cols = self.right - self.left
+        blocked = grid.blocked[self.top : self.bottom, self.left : self.right]
+        target = (tx - self.left, ty - self.top)
+        distances = _sweep_distances(blocked, target)
+        next_cell = _next_cells(blocked, distances, target)
+        # Typed arrays are compact and fast to index one cell at a time
+        self.distances = array("d", distances.ravel().tobytes())
+        self.next_cell = array("q", next_cell.ravel().tobytes())
+
+    def overlaps(self, left: int, top: int, right: int, bottom: int) -> bool:
+        """Check whether the field's window overlaps a block of cells."""
+        return (
+            left < self.right
+            and self.left < right
+            and top < self.bottom
+            and self.top < bottom
+        )
+
+    def _index_of(self, x: float, y: float) -> int:
+        """Get the window index of the cell at a world position, or -1 if outside."""
+        cx, cy = self.grid.cell_of(x, y)
+        if not (self.left <= cx < self.right and self.top <= cy < self.bottom):
+            return -1
+        return (cy - self.top) * self.cols + cx - self.left
+
+    def distance_at(self, x: float, y: float) -> float:
+        """Get the path length in cells from a world position to the target."""
+        index = self._index_of(x, y)
+        return math.inf if index < 0 else self.distances[index]
+
+    def waypoint(self, x: float, y: float) -> tuple[float, float] | None:
+        """Get the world position to head for next from a given position.
+
+        Returns ``None`` inside the target cell and where the target can't be
+        reached within the window, where callers should steer straight at
+        the target instead.
+        """
+        index = self._index_of(x, y)
+        if index < 0:
+            return None
+        step = self.next_cell[index]
+        if step < 0 or step == index:
+            return None
+        cy, cx = divmod(step, self.cols)
+        size = self.grid.cell_size
+        return ((self.left + cx + 0.5) * size, (self.top + cy + 0.5) * size)
+
+
+class NavigationGrid:
+    """Obstacle grid that hands out cached flow fields per target cell.
+
+    Fields are shared by every agent chasing a target in the same cell and
+    cover the cells within ``field_radius`` of it (the whole grid if None).
+    A field is only rebuilt when the target moves to another cell or
+    obstacles inside its window change.
+    """
+
+    def __init__(
+        self,
+        width: float = WORLD_WIDTH,
+        height: float = WORLD_HEIGHT,
+        cell_size: float = NAV_CELL_SIZE,
+        max_fields: int = DEFAULT_MAX_FIELDS,
+        field_radius: int | None = NAV_FIELD_RADIUS,
+    ):
+        """Initialize an obstacle-free navigation grid."""
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        if field_radius is not None and field_radius < 0:
+            raise ValueError("field_radius must not be negative")
+        self.cell_size = cell_size
+        self.field_radius = field_radius
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        self.version = 0
+        self.max_fields = max_fields
+        self.builds = 0
+        self._fields: OrderedDict[tuple[int, int], FlowField] = OrderedDict()
+
+    def __getstate__(self) -> dict:
+        """Pickle the obstacles only; cached fields are rebuilt on demand."""
+        state = self.__dict__.copy()
+        state["_fields"] = OrderedDict()
+        return state
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        """Get the grid cell containing a world position, clamped to the grid."""
+        cx = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return (cx, cy)
+
+    def index_of(self, x: float, y: float) -> int:
+        """Get the flat index of the cell containing a world position."""
+        cx, cy = self.cell_of(x, y)
+        return cy * self.cols + cx
+
+    def center_of_index(self, index: int) -> tuple[float, float]:
+        """Get the world position of the center of a cell by flat index."""
+        cy, cx = divmod(index, self.cols)
+        return ((cx + 0.5) * self.cell_size, (cy + 0.5) * self.cell_size)
+
+    def is_blocked(self, x: float, y: float) -> bool:
+        """Check whether the cell containing a world position is blocked."""
+        cx, cy = self.cell_of(x, y)
+        return bool(self.blocked[cy, cx])
+
+    def set_blocked(
+        self, x: float, y: float, width: float, height: float, blocked: bool = True
+    ) -> None:
+        """Block or clear every cell overlapping a world rectangle."""
+        left, top = self.cell_of(x, y)
+        right, bottom = self.cell_of(x + width - 1e-9, y + height - 1e-9)
+        self._update_cells(
+            left, top, np.full((bottom - top + 1, right - left + 1), blocked)
+        )
+
+    def set_cells(self, col: int, row: int, blocked: np.ndarray) -> None:
+        """Overwrite a block of cells from a grid of flags, e.g. streamed terrain.
+
+        ``blocked`` is (rows, cols) and its top-left cell lands at ``col``,
+        ``row``; the part outside the grid is ignored.
+        """
+        rows = min(blocked.shape[0], self.rows - row)
+        cols = min(blocked.shape[1], self.cols - col)
+        self._update_cells(col, row, blocked[:rows, :cols])
+
+    def _update_cells(self, col: int, row: int, blocked: np.ndarray) -> None:
+        """Write a block of cells and drop the fields whose window it changed."""
+        rows, cols = blocked.shape
+        region = self.blocked[row : row + rows, col : col + cols]
+        if np.array_equal(region, blocked):
+            return
+        region[:] = blocked
+        self.version += 1
+        for cell, field in list(self._fields.items()):
+            if field.overlaps(col, row, col + cols, row + rows):
+                del self._fields[cell]
+
+    def flow_field(self, target_x: float, target_y: float) -> FlowField:
+        """Get the flow field toward a world position, building it if needed."""
+        cell = self.cell_of(target_x, target_y)
+        field = self._fields.get(cell)
+        if field is not None:
+            self._fields.move_to_end(cell)
+            return field
+
+        field = FlowField(self, cell, self.field_radius)
+        self.builds += 1
+        self._fields[cell] = field
+        if len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field
@@ -0,0 +1,140 @@
+"""
+Observation module - low-resolution pixel frames and occupancy grids of scenes.
+
+Frames are read through ``pygame.surfarray`` views of the observer's own
+surface, so a training step gets the pixels without copying them out of
+SDL. Occupancy grids skip rendering entirely and rasterize entity boxes
+straight from the entity store.
+"""
+
+import numpy as np
+import pygame
+
+from game.scenes import GameScene
+from game.store import EntityStore
+from utils.constants import (
+    COLORS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+
+# Default (width, height) of observations in pixels or grid cells
+DEFAULT_OBSERVATION_SIZE = (84, 84)
+
+# Occupancy grid channels of a scene
+PLAYER_CHANNEL = 0
+ENEMY_CHANNEL = 1
+OCCUPANCY_CHANNELS = 2
+
+
+def occupancy_grid(
+    store: EntityStore,
+    rows: np.ndarray | list[int],
+    size: tuple[int, int] = DEFAULT_OBSERVATION_SIZE,
+    out: np.ndarray | None = None,
+    world_size: tuple[float, float] = (WORLD_WIDTH, WORLD_HEIGHT),
+) -> np.ndarray:
+    """Rasterize the boxes of some store rows into a grid over the world.
+
+    ``rows`` may have leading dimensions, e.g. (envs, enemies), which the
+    grid keeps: the result has shape (*leading, height, width), with 1 in
+    every cell an active entity's box touches and 0 elsewhere. Pass a
+    C-contiguous uint8 ``out`` to reuse a buffer.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    width, height = size
+    world_width, world_height = world_size
+    leading = rows.shape[:-1]
+    if out is None:
+        out = np.zeros((*leading, height, width), dtype=np.uint8)
+    else:
+        out.fill(0)
+    # Assigning the shape raises instead of silently copying
+    grids = out.view()
+    grids.shape = (-1, height, width)
+
+    groups = np.broadcast_to(np.arange(grids.shape[0]).reshape(*leading, 1), rows.shape)
+    rows, groups = rows.ravel(), groups.ravel()
+    x, y = store.view("x")[rows], store.view("y")[rows]
+    w, h = store.view("width")[rows], store.view("height")[rows]
+    visible = (store.view("active")[rows] != 0) & (x + w > 0) & (y + h > 0)
+    visible &= (x < world_width) & (y < world_height)
+    if not visible.any():
+        return out
+    groups, x, y, w, h = (a[visible] for a in (groups, x, y, w, h))
+
+    # First and last cell each box covers along both axes
+    scale_x, scale_y = width / world_width, height / world_height
+    x0 = np.clip(np.floor(x * scale_x), 0, width - 1).astype(np.intp)
+    y0 = np.clip(np.floor(y * scale_y), 0, height - 1).astype(np.intp)
+    x1 = np.clip(np.ceil((x + w) * scale_x) - 1, x0, width - 1).astype(np.intp)
+    y1 = np.clip(np.ceil((y + h) * scale_y) - 1, y0, height - 1).astype(np.intp)
+
+    # Boxes span a few cells, so fill one cell offset of every box at a time
+    span_x, span_y = x1 - x0, y1 - y0
+    for dy in range(int(span_y.max()) + 1):
+        for dx in range(int(span_x.max()) + 1):
+            hit = (dx <= span_x) & (dy <= span_y)
+            grids[groups[hit], y0[hit] + dy, x0[hit] + dx] = 1
+    return out
+
+
+class SceneObserver:
+    """Renders GameScene observations at a low resolution.
+
+    ``observe`` draws the camera's view onto an off-screen canvas and
+    scales it into the observer's surface inside SDL, converting to
+    grayscale in place if asked to. The returned array is a zero-copy
+    ``pixels3d`` view of that surface (or of its red channel when
+    grayscale), shaped (height, width, 3) or (height, width); it is
+    overwritten by the next call, so copy it to keep a frame. The surface
+    stays locked by the views, so it can't be blitted.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int] = DEFAULT_OBSERVATION_SIZE,
+        grayscale: bool = False,
+        smooth: bool = True,
+        background: tuple[int, int, int] = COLORS["BLACK"],
+    ):
+        """Initialize the observer's surfaces and views."""
+        self.size = size
+        self.grayscale = grayscale
+        self.background = background
+        self._scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        self._canvas = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+        self.surface = pygame.Surface(size, 0, 32)
+        if grayscale:
+            self.pixels = pygame.surfarray.pixels_red(self.surface).T
+        else:
+            self.pixels = pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2)
+        width, height = size
+        self.grid = np.zeros((OCCUPANCY_CHANNELS, height, width), dtype=np.uint8)
+
+    def observe(self, scene: GameScene) -> np.ndarray:
+        """Render a scene and get a view of its pixels."""
+        self._canvas.fill(self.background)
+        scene.draw(self._canvas)
+        self._scale(self._canvas, self.size, self.surface)
+        if self.grayscale:
+            pygame.transform.grayscale(self.surface, self.surface)
+        return self.pixels
+
+    def occupancy(self, scene: GameScene) -> np.ndarray:
+        """Get a scene's occupancy grid, shaped (OCCUPANCY_CHANNELS, height, width).
+
+        The grid covers the scene's whole world. It is the observer's buffer
+        and is overwritten by the next call.
+        """
+        store = scene.store
+        world = (scene.world_width, scene.world_height)
+        channels = (
+            (PLAYER_CHANNEL, [scene.player.row]),
+            (ENEMY_CHANNEL, [enemy.row for enemy in scene.enemies]),
+        )
+        for channel, rows in channels:
+            occupancy_grid(store, rows, self.size, self.grid[channel], world)
+        return self.grid
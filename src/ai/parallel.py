@@ -0,0 +1,533 @@
+"""
+Parallel AI module - steps agents across worker processes over shared memory.
+
+Each frame the main process mirrors the entity store into shared memory and
+releases the workers. Every worker updates its partition of agents against
+that read-only snapshot and writes velocities to a separate output block.
+The main process waits for all workers (the barrier) and copies the output
+back into the store. No agent or entity state is pickled per frame, and the
+result doesn't depend on worker timing.
+
+Batched agents don't belong here: FlockingSystem and PolicySystem step them
+faster in one vectorized pass, and a policy shared by many agents can't be
+split across processes.
+"""
+
+import multiprocessing
+import os
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pygame
+
+from ai.agents import AIAgent, FlockingAI
+from ai.policy import PolicyAI
+from game.entities import Entity
+from game.spatial import SpatialHash
+from game.store import EntityStore
+
+# Per-row columns mirrored into shared memory, in block order
+_INPUT_COLUMNS = ("x", "y", "width", "height", "velocity_x", "velocity_y")
+_OUTPUT_COLUMNS = ("velocity_x", "velocity_y")
+
+
+class _RowRef:
+    """Picklable stand-in for an entity, identified by its store row."""
+
+    __slots__ = ("row",)
+
+    def __init__(self, row: int):
+        self.row = row
+
+    def __reduce__(self):
+        return (_RowRef, (self.row,))
+
+
+class _SharedBlock:
+    """Named shared-memory blocks laid out as float64 columns plus flags."""
+
+    def __init__(self, capacity: int, names: dict[str, str] | None = None):
+        self.capacity = capacity
+        self.owner = names is None
+        float_bytes = max(8 * capacity, 8)
+        sizes = {"input": float_bytes * len(_INPUT_COLUMNS)}
+        sizes["output"] = float_bytes * len(_OUTPUT_COLUMNS)
+        sizes["active"] = max(capacity, 1)
+        sizes["entities"] = 8 * (capacity + 2)
+
+        self.memory: dict[str, SharedMemory] = {}
+        for key, size in sizes.items():
+            if self.owner:
+                self.memory[key] = SharedMemory(create=True, size=size)
+            else:
+                self.memory[key] = SharedMemory(name=names[key])
+
+        inputs = np.ndarray(
+            (len(_INPUT_COLUMNS), capacity), np.float64, self.memory["input"].buf
+        )
+        outputs = np.ndarray(
+            (len(_OUTPUT_COLUMNS), capacity), np.float64, self.memory["output"].buf
+        )
+        self.inputs = dict(zip(_INPUT_COLUMNS, inputs))
+        self.outputs = dict(zip(_OUTPUT_COLUMNS, outputs))
+        self.active = np.ndarray((capacity,), np.uint8, self.memory["active"].buf)
+        # Header: entity count and player row, followed by entity rows
+        self.entities = np.ndarray(
+            (capacity + 2,), np.int64, self.memory["entities"].buf
+        )
+
+        # Flat memoryviews give entity views plain-float scalar access
+        self.views = {
+            f"in_{field}": memoryview(column).cast("B").cast("d")
+            for field, column in self.inputs.items()
+        }
+        self.views.update(
+            {
+                f"out_{field}": memoryview(column).cast("B").cast("d")
+                for field, column in self.outputs.items()
+            }
+        )
+
+    @property
+    def names(self) -> dict[str, str]:
+        """Get the shared-memory names workers attach to."""
+        return {key: memory.name for key, memory in self.memory.items()}
+
+    def close(self) -> None:
+        """Detach from the blocks, and free them if this process created them."""
+        # Drop views first; shared memory can't close while exported
+        for view in self.views.values():
+            view.release()
+        self.views = {}
+        self.inputs = self.outputs = {}
+        self.active = self.entities = None
+        for memory in self.memory.values():
+            memory.close()
+            if self.owner:
+                memory.unlink()
+        self.memory = {}
+
+
+class _SnapshotEntity:
+    """Worker-side entity view: reads the frame snapshot, writes velocity out.
+
+    Reads of velocity always return the start-of-frame value, so agents see
+    the same state no matter which worker updates a neighbor first.
+    """
+
+    __slots__ = (
+        "_row",
+        "_x",
+        "_y",
+        "_width",
+        "_height",
+        "_velocity_x",
+        "_velocity_y",
+        "_out_velocity_x",
+        "_out_velocity_y",
+        "_active",
+    )
+
+    def __init__(self, block: _SharedBlock, row: int):
+        self._row = row
+        self.bind(block)
+
+    def bind(self, block: _SharedBlock) -> None:
+        """Point the view at the columns of a (re)allocated shared block."""
+        self._x = block.views["in_x"]
+        self._y = block.views["in_y"]
+        self._width = block.views["in_width"]
+        self._height = block.views["in_height"]
+        self._velocity_x = block.views["in_velocity_x"]
+        self._velocity_y = block.views["in_velocity_y"]
+        self._out_velocity_x = block.views["out_velocity_x"]
+        self._out_velocity_y = block.views["out_velocity_y"]
+        self._active = block.active
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def x(self) -> float:
+        return self._x[self._row]
+
+    @property
+    def y(self) -> float:
+        return self._y[self._row]
+
+    @property
+    def width(self) -> float:
+        return self._width[self._row]
+
+    @property
+    def height(self) -> float:
+        return self._height[self._row]
+
+    @property
+    def active(self) -> bool:
+        return bool(self._active[self._row])
+
+    @property
+    def position(self) -> tuple[float, float]:
+        return (self.x, self.y)
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    @property
+    def velocity_x(self) -> float:
+        return self._velocity_x[self._row]
+
+    @velocity_x.setter
+    def velocity_x(self, value: float) -> None:
+        self._out_velocity_x[self._row] = float(value)
+
+    @property
+    def velocity_y(self) -> float:
+        return self._velocity_y[self._row]
+
+    @velocity_y.setter
+    def velocity_y(self, value: float) -> None:
+        self._out_velocity_y[self._row] = float(value)
+
+
+def _encode(value, store: EntityStore):
+    """Replace entities in an agent attribute with row references."""
+    if isinstance(value, Entity):
+        if value.store is not store:
+            raise ValueError("Parallel agents must use entities from one store")
+        return _RowRef(value.row)
+    if isinstance(value, list):
+        return [_encode(item, store) for item in value]
+    return value
+
+
+def _decode(value, view: Callable[[int], _SnapshotEntity]):
+    """Replace row references with worker-side entity views."""
+    if isinstance(value, _RowRef):
+        return view(value.row)
+    if isinstance(value, list):
+        return [_decode(item, view) for item in value]
+    return value
+
+
+def _has_entities(value) -> bool:
+    """Check whether an encoded attribute refers to any entity."""
+    if isinstance(value, _RowRef):
+        return True
+    return isinstance(value, list) and any(_has_entities(item) for item in value)
+
+
+def _worker_main(conn: Connection) -> None:
+    """Run one worker: rebuild agents, then step them on each command."""
+    block: _SharedBlock | None = None
+    agents: list[AIAgent] = []
+    views: dict[int, _SnapshotEntity] = {}
+    spatial_hash = SpatialHash()
+    navigation = None
+    # Entity views of the last step, rebuilt only when the rows change
+    entity_rows: np.ndarray | None = None
+    entities: list[_SnapshotEntity] = []
+
+    def view(row: int) -> _SnapshotEntity:
+        # One view per row, so identity checks like `other is self.entity` hold
+        entity = views.get(row)
+        if entity is None:
+            entity = views[row] = _SnapshotEntity(block, row)
+        return entity
+
+    while True:
+        command, payload = conn.recv()
+        if command == "attach":
+            new_block = _SharedBlock(payload["capacity"], payload["names"])
+            if "agents" in payload:
+                # Fresh partition: rebuild the agents around new views
+                views.clear()
+                entity_rows = None
+                block = new_block
+                agents = []
+                for cls, state in payload["agents"]:
+                    agent = cls.__new__(cls)
+                    agent.__dict__.update(
+                        {key: _decode(value, view) for key, value in state.items()}
+                    )
+                    agents.append(agent)
+            else:
+                # Grown store: keep agent state and move the views over
+                for entity in views.values():
+                    entity.bind(new_block)
+                block.close()
+                block = new_block
+            conn.send("ok")
+        elif command == "navigation":
+            # Sent only when the obstacle grid changes; no reply
+            navigation = payload
+        elif command == "step":
+            # Either one dt for every agent, or (index, dt) pairs for some
+            if isinstance(payload, list):
+                steps = [(agents[index], dt) for index, dt in payload]
+            else:
+                steps = [(agent, payload) for agent in agents]
+            count, player_row = int(block.entities[0]), int(block.entities[1])
+            rows = block.entities[2 : 2 + count]
+            if entity_rows is None or not np.array_equal(rows, entity_rows):
+                entity_rows = rows.copy()
+                entities = [view(row) for row in entity_rows.tolist()]
+            game_state = {"entities": entities}
+            if player_row >= 0:
+                game_state["player"] = view(player_row)
+            if navigation is not None:
+                game_state["navigation"] = navigation
+            if any(isinstance(agent, FlockingAI) for agent, _ in steps):
+                spatial_hash.rebuild(entities)
+                game_state["spatial_hash"] = spatial_hash
+            for agent, dt in steps:
+                if agent.active:
+                    agent.update(dt, game_state)
+            conn.send("done")
+        elif command == "sync":
+            conn.send(
+                [
+                    {k: _encode_view(v) for k, v in vars(agent).items()}
+                    for agent in agents
+                ]
+            )
+        elif command == "stop":
+            if block is not None:
+                block.close()
+            conn.send("bye")
+            return
+
+
+def _encode_view(value):
+    """Replace worker-side entity views with row references for syncing."""
+    if isinstance(value, _SnapshotEntity):
+        return _RowRef(value.row)
+    if isinstance(value, list):
+        return [_encode_view(item) for item in value]
+    return value
+
+
+class ParallelAIExecutor:
+    """Runs AI agents in persistent worker processes over shared memory.
+
+    While running, agent state (timers, targets) lives in the workers. Call
+    ``sync`` or ``stop`` to copy it back onto the main-process agents.
+    Agents the executor wasn't started with, or that were ``discard``-ed,
+    update in this process; restart the executor to spread them out.
+    """
+
+    def __init__(self, store: EntityStore, workers: int | None = None):
+        """Initialize the executor for agents whose entities live in ``store``."""
+        self.store = store
+        self.workers = workers or os.cpu_count() or 1
+        self.agents: list[AIAgent] = []
+        # Worker and index within its partition of each agent run remotely
+        self._slots: dict[AIAgent, tuple[int, int]] = {}
+        self._partitions: list[list[AIAgent]] = []
+        # Per-worker indices of agents not discarded, built when needed
+        self._live: list[list[int]] | None = None
+        self._block: _SharedBlock | None = None
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        self._connections: list[Connection] = []
+        self._navigation_key: tuple[int, int] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Check whether the worker processes are running."""
+        return bool(self._processes)
+
+    def __enter__(self) -> "ParallelAIExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self, agents: list[AIAgent]) -> None:
+        """Partition the agents across workers and launch the processes."""
+        if self.running:
+            raise RuntimeError("Executor is already running")
+        if any(isinstance(agent, PolicyAI) for agent in agents):
+            raise ValueError("Policy agents share a policy and can't run in workers")
+        self.agents = list(agents)
+        count = max(1, min(self.workers, len(self.agents)))
+        chunk = -(-len(self.agents) // count)
+        self._partitions = [
+            self.agents[i : i + chunk] for i in range(0, len(self.agents), chunk)
+        ] or [[]]
+        self._slots = {
+            agent: (worker, index)
+            for worker, partition in enumerate(self._partitions)
+            for index, agent in enumerate(partition)
+        }
+        self._live = None
+        self._navigation_key = None
+
+        context = multiprocessing.get_context("spawn")
+        self._block = _SharedBlock(max(self.store.capacity, 1))
+        try:
+            for partition in self._partitions:
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_worker_main, args=(child,), daemon=True
+                )
+                process.start()
+                self._processes.append(process)
+                self._connections.append(parent)
+                specs = [
+                    (
+                        type(agent),
+                        {k: _encode(v, self.store) for k, v in vars(agent).items()},
+                    )
+                    for agent in partition
+                ]
+                parent.send(("attach", self._attach_payload(agents=specs)))
+            self._gather("ok")
+        except BaseException:
+            self.stop()
+            raise
+
+    def _attach_payload(self, **extra) -> dict:
+        """Build the message telling a worker where the shared blocks are."""
+        return {"capacity": self._block.capacity, "names": self._block.names, **extra}
+
+    def _gather(self, expected: str) -> None:
+        """Wait until every worker has replied; this is the frame barrier."""
+        for conn in self._connections:
+            reply = conn.recv()
+            if reply != expected:
+                raise RuntimeError(f"Unexpected worker reply: {reply!r}")
+
+    def _ensure_capacity(self) -> None:
+        """Reallocate the shared blocks if the store outgrew them."""
+        if self.store.capacity <= self._block.capacity:
+            return
+        old = self._block
+        self._block = _SharedBlock(self.store.capacity * 2)
+        for conn in self._connections:
+            conn.send(("attach", self._attach_payload()))
+        self._gather("ok")
+        old.close()
+
+    def discard(self, agent: AIAgent) -> None:
+        """Stop stepping an agent in the workers, e.g. when it is removed.
+
+        Its worker-side state is dropped, so a pooled agent reused later
+        updates in this process with its own state.
+        """
+        if self._slots.pop(agent, None) is not None:
+            self._live = None
+
+    def _live_steps(self, dt: float) -> list:
+        """Build each worker's step payload for its agents not discarded."""
+        if self._live is None:
+            self._live = [[] for _ in self._partitions]
+            for worker, index in sorted(self._slots.values()):
+                self._live[worker].append(index)
+        return [
+            dt if len(live) == len(partition) else [(index, dt) for index in live]
+            for live, partition in zip(self._live, self._partitions)
+        ]
+
+    def update(
+        self,
+        dt: float,
+        game_state: dict,
+        due: list[tuple[AIAgent, float]] | None = None,
+    ) -> None:
+        """Step agents once across the workers and apply the results.
+
+        By default every agent not discarded is stepped by ``dt``. With
+        ``due``, only the given agents are, each by its own elapsed time, as
+        returned by ``AIScheduler.take_due``.
+        """
+        if not self.running:
+            raise RuntimeError("Executor is not running")
+        if due is None:
+            if not self._slots:
+                return
+            steps = self._live_steps(dt)
+        else:
+            steps = [[] for _ in self._connections]
+            for agent, elapsed in due:
+                slot = self._slots.get(agent)
+                if slot is None:
+                    if agent.active:
+                        agent.update(elapsed, game_state)
+                else:
+                    steps[slot[0]].append((slot[1], elapsed))
+            if not any(steps):
+                return
+        self._ensure_capacity()
+        block = self._block
+        rows = self.store.capacity
+
+        # Mirror the store into the snapshot; unchanged velocities pass through
+        for field in _INPUT_COLUMNS:
+            block.inputs[field][:rows] = self.store.view(field)
+        for field in _OUTPUT_COLUMNS:
+            block.outputs[field][:rows] = block.inputs[field][:rows]
+        block.active[:rows] = self.store.view("active")
+
+        entities = game_state.get("entities", [])
+        player = game_state.get("player")
+        block.entities[0] = len(entities)
+        block.entities[1] = player.row if player is not None else -1
+        block.entities[2 : 2 + len(entities)] = [entity.row for entity in entities]
+
+        # Workers build their own flow fields from a copy of the obstacle grid
+        navigation = game_state.get("navigation")
+        key = (id(navigation), navigation.version) if navigation else None
+        if key != self._navigation_key:
+            for conn in self._connections:
+                conn.send(("navigation", navigation))
+            self._navigation_key = key
+
+        for conn, payload in zip(self._connections, steps):
+            conn.send(("step", payload))
+        self._gather("done")
+
+        for field in _OUTPUT_COLUMNS:
+            self.store.view(field)[:] = block.outputs[field][:rows]
+
+    def sync(self) -> None:
+        """Copy agent state from the workers back onto the local agents."""
+        for conn, partition in zip(self._connections, self._partitions):
+            conn.send(("sync", None))
+            for agent, state in zip(partition, conn.recv()):
+                if agent not in self._slots:
+                    continue
+                for key, value in state.items():
+                    # Entity references stay bound to the main-process entities
+                    if not _has_entities(value):
+                        setattr(agent, key, value)
+
+    def stop(self) -> None:
+        """Sync agent state, shut down the workers and free shared memory."""
+        if self._connections:
+            try:
+                self.sync()
+            except (EOFError, OSError):
+                pass
+        for conn in self._connections:
+            try:
+                conn.send(("stop", None))
+                conn.recv()
+            except (EOFError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+        self._slots = {}
+        self._live = None
+        if self._block is not None:
+            self._block.close()
+            self._block = None
@@ -0,0 +1,270 @@
+"""
+Policy module - learned enemy steering from a small NumPy MLP.
+
+``PolicyAI`` agents feed the observation ``VecGameEnv`` trains on to an
+``MLPPolicy`` and steer with the resulting action. ``PolicySystem``
+evaluates every agent sharing a policy in one batched forward pass per
+frame, so hundreds of learned enemies cost a few matrix multiplies.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from ai.agents import AIAgent
+from game.entities import Entity
+from utils.constants import ENEMY_SPEED, POLICY_PATH, WORLD_HEIGHT, WORLD_WIDTH
+
+# Per-enemy observation: own position and velocity, player position and the
+# offset to the player, all scaled to about [-1, 1]
+OBSERVATION_SIZE = 8
+
+# Per-enemy action: desired velocity as a fraction of the agent's speed per axis
+ACTION_SIZE = 2
+
+DEFAULT_HIDDEN_SIZES = (32, 32)
+
+# Seed of the untrained policy used when no trained one is installed
+DEFAULT_POLICY_SEED = 0
+
+
+def observe_enemies(
+    x: np.ndarray,
+    y: np.ndarray,
+    velocity_x: np.ndarray,
+    velocity_y: np.ndarray,
+    player_x: np.ndarray | float,
+    player_y: np.ndarray | float,
+    world_size: tuple[float, float] = (WORLD_WIDTH, WORLD_HEIGHT),
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Build enemy observations from their state and their player's position.
+
+    Positions are scaled by ``world_size``. Inputs broadcast together; the
+    result has their shape plus a trailing OBSERVATION_SIZE axis, as float32.
+    """
+    world_width, world_height = world_size
+    ex, ey = x / world_width, y / world_height
+    px, py = player_x / world_width, player_y / world_height
+    shape = np.broadcast_shapes(np.shape(ex), np.shape(px))
+    if out is None:
+        out = np.empty((*shape, OBSERVATION_SIZE), dtype=np.float32)
+    out[..., 0] = ex
+    out[..., 1] = ey
+    out[..., 2] = velocity_x / ENEMY_SPEED
+    out[..., 3] = velocity_y / ENEMY_SPEED
+    out[..., 4] = px
+    out[..., 5] = py
+    out[..., 6] = px - ex
+    out[..., 7] = py - ey
+    return out
+
+
+class MLPPolicy:
+    """Fully connected network with tanh activations, including the output.
+
+    Layer ``i`` maps its input through ``weights[i]`` of shape (inputs,
+    outputs) plus ``biases[i]``. Weights are stored as float32, and saved
+    to and loaded from ``.npz`` files as ``w0, b0, w1, b1, ...``.
+    """
+
+    def __init__(self, weights: list[np.ndarray], biases: list[np.ndarray]):
+        """Initialize the policy from its layer parameters."""
+        if not weights or len(weights) != len(biases):
+            raise ValueError("A policy needs one bias per weight matrix")
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        inputs = self.weights[0].shape[0]
+        for weight, bias in zip(self.weights, self.biases):
+            if weight.ndim != 2 or weight.shape[0] != inputs:
+                raise ValueError("Layer shapes don't chain")
+            if bias.shape != (weight.shape[1],):
+                raise ValueError("Bias doesn't match its layer")
+            inputs = weight.shape[1]
+
+    @property
+    def input_size(self) -> int:
+        """Get the size of one observation."""
+        return self.weights[0].shape[0]
+
+    @property
+    def output_size(self) -> int:
+        """Get the size of one action."""
+        return self.weights[-1].shape[1]
+
+    @classmethod
+    def random(
+        cls,
+        hidden_sizes: tuple[int, ...] = DEFAULT_HIDDEN_SIZES,
+        seed: int | None = None,
+    ) -> "MLPPolicy":
+        """Create an untrained policy for enemy observations and actions."""
+        rng = np.random.default_rng(seed)
+        sizes = [OBSERVATION_SIZE, *hidden_sizes, ACTION_SIZE]
+        weights = [
+            rng.normal(0.0, 1.0 / np.sqrt(n_in), (n_in, n_out))
+            for n_in, n_out in zip(sizes, sizes[1:])
+        ]
+        biases = [np.zeros(n_out) for n_out in sizes[1:]]
+        return cls(weights, biases)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MLPPolicy":
+        """Load a policy from an ``.npz`` file."""
+        with np.load(path) as data:
+            layers = sum(1 for key in data.files if key.startswith("w"))
+            weights = [data[f"w{i}"] for i in range(layers)]
+            biases = [data[f"b{i}"] for i in range(layers)]
+        return cls(weights, biases)
+
+    def save(self, path: str | Path) -> None:
+        """Save the policy to an ``.npz`` file."""
+        arrays = {}
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"w{i}"] = weight
+            arrays[f"b{i}"] = bias
+        np.savez(path, **arrays)
+
+    def forward(self, observations: np.ndarray) -> np.ndarray:
+        """Map a batch of observations (n, inputs) to actions (n, outputs)."""
+        hidden = np.asarray(observations, dtype=np.float32)
+        for weight, bias in zip(self.weights, self.biases):
+            hidden = hidden @ weight
+            hidden += bias
+            np.tanh(hidden, out=hidden)
+        return hidden
+
+
+_default_policy: MLPPolicy | None = None
+
+
+def get_default_policy() -> MLPPolicy:
+    """Get the policy shared by agents created without an explicit one.
+
+    It is loaded from POLICY_PATH on first use, or is an untrained policy
+    if no file is installed there.
+    """
+    global _default_policy
+    if _default_policy is None:
+        if Path(POLICY_PATH).is_file():
+            _default_policy = MLPPolicy.load(POLICY_PATH)
+        else:
+            _default_policy = MLPPolicy.random(seed=DEFAULT_POLICY_SEED)
+    return _default_policy
+
+
+class PolicyAI(AIAgent):
+    """AI steered by a learned policy; batched by PolicySystem in scenes."""
+
+    def __init__(
+        self,
+        entity: Entity,
+        policy: MLPPolicy | None = None,
+        speed: float = ENEMY_SPEED,
+    ):
+        """Initialize the policy AI.
+
+        Agents share the default policy unless given one; agents sharing a
+        policy are evaluated together.
+        """
+        super().__init__(entity)
+        self.policy = policy if policy is not None else get_default_policy()
+        self.speed = speed
+
+    def observe(
+        self,
+        player: Entity,
+        world_size: tuple[float, float] = (WORLD_WIDTH, WORLD_HEIGHT),
+    ) -> np.ndarray:
+        """Get the agent's observation of a player in a world of a given size."""
+        entity = self.entity
+        return observe_enemies(
+            entity.x,
+            entity.y,
+            entity.velocity_x,
+            entity.velocity_y,
+            player.x,
+            player.y,
+            world_size,
+        )
+
+    def update(self, dt: float, game_state: dict) -> None:
+        """Steer with the policy's action for this agent alone."""
+        player = game_state.get("player")
+        if player is None:
+            return
+        world_size = game_state.get("world_size", (WORLD_WIDTH, WORLD_HEIGHT))
+        action = self.policy.forward(self.observe(player, world_size)[None])[0]
+        self.entity.velocity_x = float(action[0]) * self.speed
+        self.entity.velocity_y = float(action[1]) * self.speed
+
+
+class PolicySystem:
+    """Evaluates every PolicyAI agent in one forward pass per policy.
+
+    Observations of all active agents are stacked into one matrix and the
+    resulting velocities are scattered back to the entities, matching what
+    ``PolicyAI.update`` gives each agent.
+    """
+
+    def __init__(self):
+        """Initialize the policy system."""
+        self.agents: list[PolicyAI] = []
+
+    def __len__(self) -> int:
+        """Return the number of registered agents."""
+        return len(self.agents)
+
+    def add(self, agent: PolicyAI) -> None:
+        """Register a policy agent with the system."""
+        self.agents.append(agent)
+
+    def remove(self, agent: PolicyAI) -> None:
+        """Unregister a policy agent."""
+        self.agents.remove(agent)
+
+    def update(self, dt: float, game_state: dict) -> None:
+        """Steer every active agent, one batch per policy."""
+        player = game_state.get("player")
+        if player is None:
+            return
+        world_size = game_state.get("world_size", (WORLD_WIDTH, WORLD_HEIGHT))
+        groups: dict[int, list[PolicyAI]] = {}
+        for agent in self.agents:
+            if agent.active:
+                groups.setdefault(id(agent.policy), []).append(agent)
+        for agents in groups.values():
+            self._steer(agents, player, world_size)
+
+    @staticmethod
+    def _steer(
+        agents: list[PolicyAI], player: Entity, world_size: tuple[float, float]
+    ) -> None:
+        """Run one policy over its agents and set their velocities."""
+        count = len(agents)
+        bodies = [agent.entity for agent in agents]
+        speed = np.fromiter((agent.speed for agent in agents), np.float64, count)
+        store = bodies[0].store
+        shared = all(body.store is store for body in bodies)
+        if shared:
+            rows = np.fromiter((body.row for body in bodies), np.intp, count)
+            x, y = store.gather("x", rows), store.gather("y", rows)
+            vx, vy = store.gather("velocity_x", rows), store.gather("velocity_y", rows)
+        else:
+            x, y, vx, vy = (
+                np.fromiter((getattr(b, name) for b in bodies), np.float64, count)
+                for name in ("x", "y", "velocity_x", "velocity_y")
+            )
+
+        observations = observe_enemies(x, y, vx, vy, player.x, player.y, world_size)
+        actions = agents[0].policy.forward(observations)
+        new_vx = actions[:, 0] * speed
+        new_vy = actions[:, 1] * speed
+
+        if shared:
+            store.view("velocity_x")[rows] = new_vx
+            store.view("velocity_y")[rows] = new_vy
+        else:
+            for body, bvx, bvy in zip(bodies, new_vx.tolist(), new_vy.tolist()):
+                body.velocity_x = bvx
+                body.velocity_y = bvy
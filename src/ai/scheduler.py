@@ -0,0 +1,228 @@
+"""
+AI scheduler module - time-sliced agent updates under optional per-frame budgets.
+"""
+
+from collections.abc import Callable
+from time import perf_counter
+
+from ai.agents import AIAgent
+from utils.constants import AI_UPDATE_FREQUENCY
+
+# Default time one agent update may take before it counts as an overrun
+DEFAULT_AGENT_BUDGET_MS = 0.5
+
+# Consecutive overruns after which an agent is reported
+DEFAULT_OVERRUN_LIMIT = 3
+
+# Slack when comparing game times, so float error can't skip an update
+_TIME_EPSILON = 1e-9
+
+# Golden-ratio step used to spread agents' first updates across an interval
+_PHASE_STEP = 0.6180339887
+
+
+class _ScheduledAgent:
+    """Scheduling state for one registered agent."""
+
+    __slots__ = (
+        "agent",
+        "interval",
+        "last_update",
+        "next_due",
+        "overrun_streak",
+        "overruns",
+    )
+
+    def __init__(self, agent: AIAgent, interval: float, now: float, phase: float):
+        self.agent = agent
+        self.interval = interval
+        self.last_update = now
+        self.next_due = now + phase * interval
+        self.overrun_streak = 0
+        self.overruns = 0
+
+    def is_due(self, now: float) -> bool:
+        """Check whether the agent should be updated at game time ``now``."""
+        return self.agent.active and now + _TIME_EPSILON >= self.next_due
+
+
+class AIScheduler:
+    """Round-robins agent updates across frames within optional budgets.
+
+    Each agent is updated at most at its target rate and receives the game
+    time since its previous update, so a deferred agent makes up the time it
+    waited in its next step. First updates are
+    staggered so agents with the same rate don't all think on the same
+    frame. When a frame budget runs out, remaining due agents wait for the
+    next frame, and the round-robin cursor makes sure they are first in line.
+
+    ``max_updates`` caps agent updates per frame and keeps results
+    reproducible. ``budget_ms`` caps the CPU time per frame instead, so which
+    agents are deferred depends on how busy the machine is. ``max_catchup``
+    caps the time one update may cover, in seconds, for agents that behave
+    badly on large steps; the time beyond it is dropped. All are off by
+    default.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float | None = None,
+        agent_budget_ms: float = DEFAULT_AGENT_BUDGET_MS,
+        overrun_limit: int = DEFAULT_OVERRUN_LIMIT,
+        timer: Callable[[], float] = perf_counter,
+        max_updates: int | None = None,
+        max_catchup: float | None = None,
+    ):
+        """Initialize the AI scheduler."""
+        if max_updates is not None and max_updates < 1:
+            raise ValueError("max_updates must be at least 1")
+        if max_catchup is not None and max_catchup <= 0:
+            raise ValueError("max_catchup must be positive")
+        self.budget_ms = budget_ms
+        self.max_updates = max_updates
+        self.max_catchup = max_catchup
+        self.agent_budget_ms = agent_budget_ms
+        self.overrun_limit = overrun_limit
+        self.timer = timer
+        self.time = 0.0
+        self.updates_last_frame = 0
+        self.deferred_last_frame = 0
+        self._entries: list[_ScheduledAgent] = []
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        """Return the number of registered agents."""
+        return len(self._entries)
+
+    @property
+    def cursor(self) -> int:
+        """Get the position of the agent first in line next frame."""
+        return self._cursor
+
+    def register(self, agent: AIAgent, rate: float = AI_UPDATE_FREQUENCY) -> None:
+        """Register an agent to be updated ``rate`` times per second."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        phase = (len(self._entries) * _PHASE_STEP) % 1.0
+        self._entries.append(_ScheduledAgent(agent, 1.0 / rate, self.time, phase))
+
+    def unregister(self, agent: AIAgent) -> None:
+        """Stop scheduling an agent."""
+        for index, entry in enumerate(self._entries):
+            if entry.agent is agent:
+                del self._entries[index]
+                if index < self._cursor:
+                    self._cursor -= 1
+                return
+
+    def update(self, dt: float, game_state: dict) -> None:
+        """Advance game time and update due agents until a budget is spent."""
+        self._advance(dt, lambda agent, elapsed: agent.update(elapsed, game_state))
+
+    def take_due(self, dt: float) -> list[tuple[AIAgent, float]]:
+        """Advance game time and claim due agents without updating them.
+
+        Returns (agent, elapsed time) pairs for the caller to update
+        elsewhere, e.g. in worker processes. ``max_updates`` still applies;
+        ``budget_ms`` and overrun tracking don't, since no agent runs here.
+        """
+        due: list[tuple[AIAgent, float]] = []
+        self._advance(dt, lambda agent, elapsed: due.append((agent, elapsed)), False)
+        return due
+
+    def _advance(
+        self, dt: float, run: Callable[[AIAgent, float], None], timed: bool = True
+    ) -> None:
+        """Advance game time and pass due agents to ``run`` in round-robin order."""
+        self.time += dt
+        self.updates_last_frame = 0
+        self.deferred_last_frame = 0
+        entries = self._entries
+        if not entries:
+            return
+
+        now = self.time
+        timer = self.timer
+        budget = None
+        if timed and self.budget_ms is not None:
+            budget = self.budget_ms / 1000.0
+        max_updates = self.max_updates
+        max_catchup = self.max_catchup
+        agent_budget = self.agent_budget_ms / 1000.0
+        frame_start = timer()
+        count = len(entries)
+        cursor = self._cursor % count
+
+        for step in range(count):
+            entry = entries[(cursor + step) % count]
+            if not entry.is_due(now):
+                continue
+
+            # Always update at least one agent so a slow one can't stall all
+            updates = self.updates_last_frame
+            if updates and (
+                (max_updates is not None and updates >= max_updates)
+                or (budget is not None and timer() - frame_start >= budget)
+            ):
+                self.deferred_last_frame = sum(1 for e in entries if e.is_due(now))
+                self._cursor = (cursor + step) % count
+                return
+
+            start = timer()
+            elapsed = now - entry.last_update
+            if max_catchup is not None and elapsed > max_catchup:
+                elapsed = max_catchup
+            run(entry.agent, elapsed)
+            entry.last_update = now
+            # Keep a steady cadence, but don't queue up missed updates
+            next_due = entry.next_due + entry.interval
+            entry.next_due = next_due if next_due > now else now + entry.interval
+            self.updates_last_frame += 1
+
+            if not timed:
+                continue
+            if timer() - start > agent_budget:
+                entry.overrun_streak += 1
+                entry.overruns += 1
+            else:
+                entry.overrun_streak = 0
+
+    def timings(self) -> dict[AIAgent, tuple[float, float, float]]:
+        """Get each agent's update interval, last update and next due times."""
+        return {
+            entry.agent: (entry.interval, entry.last_update, entry.next_due)
+            for entry in self._entries
+        }
+
+    def restore(
+        self,
+        time: float,
+        cursor: int,
+        timings: list[tuple[AIAgent, float, float, float]],
+    ) -> None:
+        """Replace every registration and the clock, e.g. on a rollback.
+
+        ``timings`` holds (agent, interval, last update, next due) tuples in
+        scheduling order. Overrun statistics start over.
+        """
+        self.time = time
+        self._cursor = cursor
+        self._entries = []
+        for agent, interval, last_update, next_due in timings:
+            entry = _ScheduledAgent(agent, interval, last_update, 0.0)
+            entry.next_due = next_due
+            self._entries.append(entry)
+
+    def overrunning_agents(self) -> list[AIAgent]:
+        """Get agents whose recent updates keep exceeding the agent budget."""
+        return [
+            entry.agent
+            for entry in self._entries
+            if entry.overrun_streak >= self.overrun_limit
+        ]
+
+    def overrun_counts(self) -> dict[AIAgent, int]:
+        """Get the total number of overruns per agent that has had any."""
+        return {
+            entry.agent: entry.overruns for entry in self._entries if entry.overruns
+        }
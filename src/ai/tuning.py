@@ -0,0 +1,256 @@
+"""
+Tuning module - parallel parameter sweeps of AI weights over headless scenes.
+
+Each configuration sets the flocking weights and agent speeds of a
+``GameScene`` full of flocking and chasing enemies, runs it headless for a
+fixed number of steps and measures flock cohesion, collisions and update
+cost. ``run_sweep`` spreads configurations over a process pool and appends
+every result to a JSON Lines file as it arrives, so an interrupted sweep
+resumes where it stopped.
+"""
+
+import itertools
+import json
+import os
+import random
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from ai.agents import ChasingAI, FlockingAI
+from game.collision import ENTER
+from game.input import ScriptedInput
+from game.scenes import GameScene
+from utils.constants import (
+    ALIGNMENT_WEIGHT,
+    CHASING_SPEED,
+    COHESION_WEIGHT,
+    FLOCKING_RADIUS,
+    FLOCKING_SPEED,
+    SEPARATION_WEIGHT,
+    SIM_RATE,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+
+# Tunable parameters and their defaults
+PARAMETERS = {
+    "separation_weight": SEPARATION_WEIGHT,
+    "alignment_weight": ALIGNMENT_WEIGHT,
+    "cohesion_weight": COHESION_WEIGHT,
+    "neighbor_radius": FLOCKING_RADIUS,
+    "flocking_speed": FLOCKING_SPEED,
+    "chasing_speed": CHASING_SPEED,
+}
+
+# Metrics measured by each simulation, any of which can rank a sweep
+METRICS = ("cohesion", "collisions", "frame_ms", "frame_p95_ms")
+
+DEFAULT_FLOCKERS = 60
+DEFAULT_CHASERS = 10
+DEFAULT_STEPS = 600
+
+Config = dict[str, float]
+
+
+def grid_configs(space: Mapping[str, Iterable[float]]) -> list[Config]:
+    """Get every combination of the listed values of each parameter."""
+    _check_names(space)
+    names = list(space)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(list(space[name]) for name in names))
+    ]
+
+
+def random_configs(
+    space: Mapping[str, tuple[float, float]], samples: int, seed: int | None = None
+) -> list[Config]:
+    """Draw configurations uniformly from each parameter's (low, high) range."""
+    _check_names(space)
+    rng = random.Random(seed)
+    return [
+        {name: rng.uniform(low, high) for name, (low, high) in space.items()}
+        for _ in range(samples)
+    ]
+
+
+def _check_names(space: Mapping[str, object]) -> None:
+    """Refuse parameters that can't be tuned."""
+    unknown = sorted(set(space).difference(PARAMETERS))
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+
+
+def simulate(
+    config: Mapping[str, float],
+    flockers: int = DEFAULT_FLOCKERS,
+    chasers: int = DEFAULT_CHASERS,
+    steps: int = DEFAULT_STEPS,
+    seed: int = 0,
+) -> dict[str, float]:
+    """Run one configuration headless and measure it.
+
+    Enemies start at the same seeded positions for every configuration,
+    and every agent updates on schedule, so a seed always replays the same.
+    Metrics: ``cohesion`` is the mean distance of flocking enemies from
+    their center in pixels (lower is tighter), ``collisions`` the number of
+    contacts that began, and ``frame_ms``/``frame_p95_ms`` the update cost.
+    """
+    if steps < 1:
+        raise ValueError("steps must be at least 1")
+    params = {**PARAMETERS, **config}
+    rng = random.Random(seed)
+    scene = GameScene(controls=ScriptedInput([]))
+    scene.despawn_enemies(list(scene.enemies))
+    flock = []
+    for _ in range(flockers):
+        enemy = scene.spawn_enemy(
+            rng.uniform(0, WORLD_WIDTH), rng.uniform(0, WORLD_HEIGHT), FlockingAI
+        )
+        flock.append(enemy)
+    for _ in range(chasers):
+        scene.spawn_enemy(
+            rng.uniform(0, WORLD_WIDTH), rng.uniform(0, WORLD_HEIGHT), ChasingAI
+        )
+    for agent in scene.agents:
+        if isinstance(agent, FlockingAI):
+            agent.separation_weight = params["separation_weight"]
+            agent.alignment_weight = params["alignment_weight"]
+            agent.cohesion_weight = params["cohesion_weight"]
+            agent.neighbor_radius = params["neighbor_radius"]
+            agent.speed = params["flocking_speed"]
+        elif isinstance(agent, ChasingAI):
+            agent.speed = params["chasing_speed"]
+
+    dt = 1.0 / SIM_RATE
+    rows = np.array([enemy.row for enemy in flock], dtype=np.intp)
+    frame_times = np.empty(steps)
+    spread = np.zeros(steps)
+    collisions = 0
+    for step in range(steps):
+        start = time.perf_counter()
+        scene.update(dt)
+        frame_times[step] = time.perf_counter() - start
+        collisions += sum(
+            1 for contact in scene.collisions.contacts() if contact.event == ENTER
+        )
+        if len(rows):
+            x, y = scene.store.gather("x", rows), scene.store.gather("y", rows)
+            spread[step] = np.hypot(x - x.mean(), y - y.mean()).mean()
+
+    return {
+        "cohesion": float(spread.mean()),
+        "collisions": collisions,
+        "frame_ms": 1000.0 * float(np.median(frame_times)),
+        "frame_p95_ms": 1000.0 * float(np.percentile(frame_times, 95)),
+    }
+
+
+def _run_job(job: dict) -> dict:
+    """Simulate one job in a worker process and build its result record."""
+    metrics = simulate(job["config"], seed=job["seed"], **job["settings"])
+    return {**job, "metrics": metrics}
+
+
+def _job_key(job: Mapping) -> str:
+    """Get the identity of a job, shared by its result record."""
+    return json.dumps([job["config"], job["seed"], job["settings"]], sort_keys=True)
+
+
+def load_results(path: str | Path) -> list[dict]:
+    """Read the result records of a sweep, skipping a truncated last line."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    results = []
+    for line in path.read_text().splitlines():
+        try:
+            results.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return results
+
+
+def run_sweep(
+    configs: list[Config],
+    results_path: str | Path,
+    workers: int | None = None,
+    repeats: int = 1,
+    seed: int = 0,
+    flockers: int = DEFAULT_FLOCKERS,
+    chasers: int = DEFAULT_CHASERS,
+    steps: int = DEFAULT_STEPS,
+    on_result: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Simulate every configuration ``repeats`` times across a process pool.
+
+    Each result is appended to ``results_path`` as one JSON line the moment
+    it finishes. Jobs already recorded there with the same configuration,
+    seed and settings are skipped, so rerunning an interrupted sweep only
+    runs what is missing. ``workers`` defaults to every core; 0 runs the
+    jobs in this process. Returns the records of every job in the sweep.
+    """
+    path = Path(results_path)
+    settings = {"flockers": flockers, "chasers": chasers, "steps": steps}
+    jobs = [
+        {"config": dict(config), "seed": seed + repeat, "settings": settings}
+        for config in configs
+        for repeat in range(repeats)
+    ]
+    done = {_job_key(record): record for record in load_results(path)}
+    todo = [job for job in jobs if _job_key(job) not in done]
+
+    # Finish a line cut off by an interruption so new records start clean
+    if path.exists() and path.stat().st_size:
+        with path.open("rb") as existing:
+            existing.seek(-1, os.SEEK_END)
+            needs_newline = existing.read(1) != b"\n"
+        if needs_newline:
+            with path.open("a") as results:
+                results.write("\n")
+
+    with path.open("a") as results:
+
+        def record(result: dict) -> None:
+            results.write(json.dumps(result) + "\n")
+            results.flush()
+            done[_job_key(result)] = result
+            if on_result is not None:
+                on_result(result)
+
+        if workers == 0:
+            for job in todo:
+                record(_run_job(job))
+        elif todo:
+            with ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(), mp_context=get_context("spawn")
+            ) as pool:
+                futures = [pool.submit(_run_job, job) for job in todo]
+                for future in as_completed(futures):
+                    record(future.result())
+
+    return [done[_job_key(job)] for job in jobs]
+
+
+def summarize(results: list[dict]) -> list[dict]:
+    """Average each configuration's metrics over its repeats."""
+    groups: dict[str, list[dict]] = {}
+    for result in results:
+        key = json.dumps([result["config"], result["settings"]], sort_keys=True)
+        groups.setdefault(key, []).append(result)
+    summary = []
+    for members in groups.values():
+        names = members[0]["metrics"]
+        metrics = {
+            name: float(np.mean([m["metrics"][name] for m in members]))
+            for name in names
+        }
+        summary.append(
+            {"config": members[0]["config"], "runs": len(members), "metrics": metrics}
+        )
+    return summary
@@ -0,0 +1,189 @@
+"""
+Assets module - background decoding of images and sounds into a bounded cache.
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pygame
+
+from utils.constants import (
+    ASSET_CACHE_BYTES,
+    ASSET_LOADER_THREADS,
+    IMAGES_DIR,
+    SOUNDS_DIR,
+)
+
+# Asset kinds, also the keys of a prefetch manifest
+IMAGES = "images"
+SOUNDS = "sounds"
+
+# Asset names to load per kind, e.g. {"images": ["ship.png"]}
+AssetManifest = Mapping[str, Iterable[str]]
+
+Asset = pygame.Surface | pygame.mixer.Sound
+_Key = tuple[str, str]
+
+
+def _decode(kind: str, path: Path) -> Asset:
+    """Read and decode one asset file; runs on a loader thread."""
+    if kind == IMAGES:
+        return pygame.image.load(path)
+    if pygame.mixer.get_init() is None:
+        raise pygame.error("Sounds need pygame.mixer to be initialized")
+    return pygame.mixer.Sound(path)
+
+
+def _size_of(asset: Asset) -> int:
+    """Estimate the memory an asset holds in bytes."""
+    if isinstance(asset, pygame.Surface):
+        return asset.get_pitch() * asset.get_height()
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    sample_bytes = abs(sample_format) // 8
+    return int(asset.get_length() * frequency * channels * sample_bytes)
+
+
+class AssetManager:
+    """Loads images and sounds on a thread pool into a memory-bounded LRU.
+
+    Files are read and decoded on loader threads; images are converted to
+    the display format on the main thread when ``process_loaded`` picks up
+    finished loads, since SDL surfaces can't be converted off it. Assets
+    that are asked for before their background load finishes are waited for,
+    and uncached ones are loaded on the spot.
+    """
+
+    def __init__(
+        self,
+        images_dir: str | Path = IMAGES_DIR,
+        sounds_dir: str | Path = SOUNDS_DIR,
+        max_bytes: int = ASSET_CACHE_BYTES,
+        workers: int = ASSET_LOADER_THREADS,
+    ):
+        """Initialize the asset manager."""
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.directories = {IMAGES: Path(images_dir), SOUNDS: Path(sounds_dir)}
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: OrderedDict[_Key, tuple[Asset, int]] = OrderedDict()
+        self._pending: dict[_Key, Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __len__(self) -> int:
+        """Return the number of cached assets."""
+        return len(self._cache)
+
+    def __contains__(self, key: _Key) -> bool:
+        """Check whether a (kind, name) asset is cached."""
+        return key in self._cache
+
+    @property
+    def pending(self) -> int:
+        """Get the number of background loads not yet processed."""
+        return len(self._pending)
+
+    def image(self, name: str) -> pygame.Surface:
+        """Get an image by file name, relative to the images directory."""
+        return self.get(IMAGES, name)
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """Get a sound by file name, relative to the sounds directory."""
+        return self.get(SOUNDS, name)
+
+    def get(self, kind: str, name: str) -> Asset:
+        """Get an asset, waiting for or performing its load if needed."""
+        key = (kind, name)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        future = self._pending.pop(key, None)
+        asset = future.result() if future is not None else _decode(*self._locate(key))
+        return self._store(key, asset)
+
+    def request(self, kind: str, name: str) -> None:
+        """Start loading an asset in the background if it isn't cached."""
+        key = (kind, name)
+        if key in self._cache or key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="assets"
+            )
+        self._pending[key] = self._executor.submit(_decode, *self._locate(key))
+
+    def prefetch(self, manifest: AssetManifest) -> None:
+        """Start loading every asset in a manifest in the background."""
+        for kind, names in manifest.items():
+            for name in names:
+                self.request(kind, name)
+
+    def is_ready(self, manifest: AssetManifest) -> bool:
+        """Check whether every asset in a manifest is cached."""
+        return all(
+            (kind, name) in self._cache
+            for kind, names in manifest.items()
+            for name in names
+        )
+
+    def process_loaded(self) -> int:
+        """Move finished background loads into the cache; call once per frame.
+
+        A load that failed stays pending so ``get`` raises its error.
+        Returns the number of assets added.
+        """
+        done = [
+            key
+            for key, future in self._pending.items()
+            if future.done() and future.exception() is None
+        ]
+        for key in done:
+            self._store(key, self._pending.pop(key).result())
+        return len(done)
+
+    def clear(self) -> None:
+        """Drop every cached asset."""
+        self._cache.clear()
+        self.bytes_used = 0
+
+    def shutdown(self) -> None:
+        """Stop the loader threads, abandoning loads that haven't started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def _locate(self, key: _Key) -> tuple[str, Path]:
+        """Get the kind and file path of an asset."""
+        kind, name = key
+        if kind not in self.directories:
+            raise ValueError(f"Unknown asset kind: {kind}")
+        return kind, self.directories[kind] / name
+
+    def _store(self, key: _Key, asset: Asset) -> Asset:
+        """Finish an asset on the main thread and cache it."""
+        if isinstance(asset, pygame.Surface) and pygame.display.get_surface():
+            if asset.get_flags() & pygame.SRCALPHA:
+                asset = asset.convert_alpha()
+            else:
+                asset = asset.convert()
+        size = _size_of(asset)
+        self._cache[key] = (asset, size)
+        self.bytes_used += size
+
+        # Evict least recently used assets, but always keep the newest one
+        while self.bytes_used > self.max_bytes and len(self._cache) > 1:
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self.bytes_used -= evicted_size
+            self.evictions += 1
+        return asset
@@ -0,0 +1,93 @@
+"""
+Camera module - the screen's view onto a world that may be larger than it.
+"""
+
+from game.entities import Entity
+from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH, WORLD_HEIGHT, WORLD_WIDTH
+
+
+class Camera:
+    """A screen-sized view scrolled over the world.
+
+    ``x`` and ``y`` are the world position of the screen's top-left corner,
+    kept so the view never leaves the world (a world smaller than the
+    screen sits at the top-left). Like entity positions, the previous
+    update's position is kept so rendering can interpolate between them.
+    """
+
+    def __init__(
+        self,
+        width: float = SCREEN_WIDTH,
+        height: float = SCREEN_HEIGHT,
+        world_width: float = WORLD_WIDTH,
+        world_height: float = WORLD_HEIGHT,
+    ):
+        """Initialize a camera at the world's top-left corner."""
+        if width <= 0 or height <= 0 or world_width <= 0 or world_height <= 0:
+            raise ValueError("Camera and world sizes must be positive")
+        self.width = width
+        self.height = height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0.0
+        self.y = 0.0
+        self.previous_x = 0.0
+        self.previous_y = 0.0
+
+    @property
+    def sees_world(self) -> bool:
+        """Check whether the view always covers the whole world."""
+        return self.width >= self.world_width and self.height >= self.world_height
+
+    def move_to(self, x: float, y: float) -> None:
+        """Put the view's top-left corner at a world position, within the world."""
+        self.x = float(min(max(x, 0.0), max(self.world_width - self.width, 0.0)))
+        self.y = float(min(max(y, 0.0), max(self.world_height - self.height, 0.0)))
+
+    def center_on(self, x: float, y: float) -> None:
+        """Center the view on a world position, within the world."""
+        self.move_to(x - self.width / 2, y - self.height / 2)
+
+    def follow(self, entity: Entity) -> None:
+        """Center the view on an entity."""
+        self.center_on(entity.x + entity.width / 2, entity.y + entity.height / 2)
+
+    def save_position(self) -> None:
+        """Remember the current position as the previous one; once per update."""
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+    def offset(self, alpha: float = 1.0) -> tuple[float, float]:
+        """Get the view's top-left between its previous and current position."""
+        if alpha >= 1.0:
+            return (self.x, self.y)
+        return (
+            self.previous_x + (self.x - self.previous_x) * alpha,
+            self.previous_y + (self.y - self.previous_y) * alpha,
+        )
+
+    def world_to_screen(
+        self, x: float, y: float, alpha: float = 1.0
+    ) -> tuple[float, float]:
+        """Convert a world position to a screen position."""
+        left, top = self.offset(alpha)
+        return (x - left, y - top)
+
+    def screen_to_world(
+        self, x: float, y: float, alpha: float = 1.0
+    ) -> tuple[float, float]:
+        """Convert a screen position, e.g. the mouse's, to a world position."""
+        left, top = self.offset(alpha)
+        return (x + left, y + top)
+
+    def is_visible(
+        self, x: float, y: float, width: float, height: float, alpha: float = 1.0
+    ) -> bool:
+        """Check whether a world-space box overlaps the view."""
+        left, top = self.offset(alpha)
+        return (
+            x < left + self.width
+            and x + width > left
+            and y < top + self.height
+            and y + height > top
+        )
@@ -0,0 +1,216 @@
+"""
+Collision module - sweep-and-prune broadphase with enter/stay/exit contacts.
+"""
+
+from collections.abc import Callable, Iterator
+from typing import NamedTuple
+
+import numpy as np
+
+from game.entities import Entity
+
+# Contact events, in the order they are reported each frame
+ENTER = "enter"
+STAY = "stay"
+EXIT = "exit"
+
+# Narrowphase test run on every broadphase pair; returning False rejects it
+Narrowphase = Callable[[Entity, Entity], bool]
+
+
+class Contact(NamedTuple):
+    """A pair of touching entities and what happened to the pair this frame."""
+
+    a: Entity
+    b: Entity
+    event: str
+
+
+def _gather_bounds(entities: list[Entity]) -> tuple[np.ndarray, ...]:
+    """Get left, top, right and bottom arrays for a list of entities.
+
+    Entities that share one store are read straight from its columns. The
+    last array ranks the entities by store row, ties broken by identity, so
+    it doesn't change when the list is reordered.
+    """
+    count = len(entities)
+    store = entities[0].store
+    rows = np.fromiter((entity.row for entity in entities), np.intp, count)
+    if all(entity.store is store for entity in entities):
+        x, y, width, height, active = (
+            store.gather(field, rows)
+            for field in ("x", "y", "width", "height", "active")
+        )
+        active = active == 1
+        rank = rows
+    else:
+        x = np.fromiter((e.x for e in entities), np.float64, count)
+        y = np.fromiter((e.y for e in entities), np.float64, count)
+        width = np.fromiter((e.width for e in entities), np.float64, count)
+        height = np.fromiter((e.height for e in entities), np.float64, count)
+        active = np.fromiter((e.active for e in entities), np.bool_, count)
+        # Rows repeat across stores
+        ids = np.fromiter(map(id, entities), np.intp, count)
+        rank = np.empty(count, np.intp)
+        rank[np.lexsort((ids, rows))] = np.arange(count)
+
+    # Like pygame.Rect, inactive and empty boxes never touch anything
+    solid = active & (width > 0) & (height > 0)
+    return x, y, x + width, y + height, solid, rank
+
+
+def _expand_ranges(starts: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Expand ranges [start, start + count) into (range index, value) arrays."""
+    owner = np.repeat(np.arange(len(counts)), counts)
+    seg_begin = np.cumsum(counts) - counts
+    values = np.arange(int(counts.sum())) - np.repeat(seg_begin - starts, counts)
+    return owner, values
+
+
+def overlapping_pairs(
+    left: np.ndarray, top: np.ndarray, right: np.ndarray, bottom: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get index pairs (i, j), i < j, of boxes whose interiors overlap.
+
+    Boxes are binned into strips across the axis where they are most spread
+    out, then swept along it: within a strip, each box only meets the boxes
+    whose start falls before its end. Strips keep the sweep from degrading
+    to O(n^2) when many boxes share an interval on the sweep axis.
+    """
+    count = len(left)
+    empty = np.empty(0, np.intp)
+    if count < 2:
+        return empty, empty
+
+    # Sweep along the axis with more spread; strips run across the other one
+    if np.ptp(left) >= np.ptp(top):
+        lo, hi, cross_lo, cross_hi = left, right, top, bottom
+    else:
+        lo, hi, cross_lo, cross_hi = top, bottom, left, right
+
+    # Strips twice the typical box size hold most boxes in one or two strips;
+    # when most boxes have no size, fall back to the largest one or 1.0
+    extents = cross_hi - cross_lo
+    strip_size = 2.0 * float(np.median(extents))
+    if not strip_size > 0.0:
+        strip_size = max(float(extents.max()), 1.0)
+    cross_min = cross_lo.min()
+    first_strip = np.floor((cross_lo - cross_min) / strip_size).astype(np.int64)
+    last_strip = np.floor((cross_hi - cross_min) / strip_size).astype(np.int64)
+    box, strip = _expand_ranges(first_strip, last_strip - first_strip + 1)
+
+    # Lay the strips end to end on one line so a single sort sweeps them all
+    lo_min = lo.min()
+    stride = hi.max() - lo_min + 1.0
+    start_keys = strip * stride + (lo[box] - lo_min)
+    end_keys = strip * stride + (hi[box] - lo_min)
+    order = np.argsort(start_keys, kind="stable")
+    sorted_starts = start_keys[order]
+
+    # Sorted entry k overlaps entries k+1 .. end-1 on the sweep axis
+    ends = np.searchsorted(sorted_starts, end_keys[order], side="left")
+    following = np.arange(1, len(order) + 1)
+    first, second = _expand_ranges(following, np.maximum(ends - following, 0))
+    pair_strip = strip[order[first]]
+    i, j = box[order[first]], box[order[second]]
+
+    # Test the cross axis exactly, and report each pair only from the strip
+    # holding the start of its overlap so boxes sharing two strips count once
+    overlap_start = np.maximum(cross_lo[i], cross_lo[j])
+    keep = (
+        (cross_lo[i] < cross_hi[j])
+        & (cross_lo[j] < cross_hi[i])
+        & (np.floor((overlap_start - cross_min) / strip_size) == pair_strip)
+    )
+    i, j = i[keep], j[keep]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+class CollisionSystem:
+    """Finds touching entity pairs each frame and tracks how they change.
+
+    Bounds are axis-aligned boxes from each entity's position and size, so
+    for rectangular entities the box test is exact. An optional narrowphase
+    callable can refine pairs for other shapes. Pairs are tracked across
+    frames and reported as ``ENTER``, ``STAY`` or ``EXIT`` contacts.
+    """
+
+    def __init__(self, narrowphase: Narrowphase | None = None):
+        """Initialize the collision system."""
+        self.narrowphase = narrowphase
+        self._pairs: set[tuple[Entity, Entity]] = set()
+        self._entered: list[tuple[Entity, Entity]] = []
+        self._stayed: list[tuple[Entity, Entity]] = []
+        self._exited: list[tuple[Entity, Entity]] = []
+
+    def __len__(self) -> int:
+        """Return the number of pairs touching this frame."""
+        return len(self._pairs)
+
+    def update(self, entities: list[Entity]) -> None:
+        """Detect this frame's contacts among a list of entities."""
+        pairs = self.find_pairs(entities)
+        previous = self._pairs
+        current = set(pairs)
+
+        self._entered = [pair for pair in pairs if pair not in previous]
+        self._stayed = [pair for pair in pairs if pair in previous]
+        # Removed entities still get their exit events
+        self._exited = [pair for pair in previous if pair not in current]
+        self._pairs = current
+
+    def find_pairs(self, entities: list[Entity]) -> list[tuple[Entity, Entity]]:
+        """Get every pair of touching entities, without tracking events.
+
+        Each pair, and the list, is ordered by the entities' store rows, so
+        a pair keeps its order from frame to frame however the list is
+        shuffled by despawns or pool reuse.
+        """
+        if len(entities) < 2:
+            return []
+
+        left, top, right, bottom, solid, rank = _gather_bounds(entities)
+        index = np.flatnonzero(solid)
+        first, second = overlapping_pairs(
+            left[index], top[index], right[index], bottom[index]
+        )
+        first, second = index[first], index[second]
+        swap = rank[first] > rank[second]
+        first, second = np.where(swap, second, first), np.where(swap, first, second)
+
+        # Report pairs in row order so results don't depend on the sort
+        order = np.lexsort((rank[second], rank[first]))
+        pairs = [
+            (entities[i], entities[j])
+            for i, j in zip(first[order].tolist(), second[order].tolist())
+        ]
+        if self.narrowphase is not None:
+            narrowphase = self.narrowphase
+            pairs = [pair for pair in pairs if narrowphase(*pair)]
+        return pairs
+
+    def contacts(self) -> Iterator[Contact]:
+        """Yield this frame's contacts: entered, then stayed, then exited."""
+        for a, b in self._entered:
+            yield Contact(a, b, ENTER)
+        for a, b in self._stayed:
+            yield Contact(a, b, STAY)
+        for a, b in self._exited:
+            yield Contact(a, b, EXIT)
+
+    def touching(self, entity: Entity) -> list[Entity]:
+        """Get the entities touching a given entity this frame."""
+        others = []
+        for a, b in self._pairs:
+            if a is entity:
+                others.append(b)
+            elif b is entity:
+                others.append(a)
+        return others
+
+    def clear(self) -> None:
+        """Forget all tracked pairs without reporting exits."""
+        self._pairs = set()
+        self._entered = []
+        self._stayed = []
+        self._exited = []
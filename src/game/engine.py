@@ -2,21 +2,93 @@
 Game engine module - handles the main game loop and core functionality.
 """
 
+import math
+
 import pygame
 
-from utils.constants import COLORS, FPS, SCREEN_HEIGHT, SCREEN_WIDTH
+from game.assets import AssetManager
+from game.input import ScriptedInput
+from game.replay import InputLog, ReplayMismatchError, SessionRecorder
+from game.scenes import GameScene, Scene, SceneManager
+from utils.constants import (
+    COLORS,
+    FPS,
+    MAX_SIM_STEPS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SIM_RATE,
+)
+from utils.profiler import FrameProfiler, get_profiler
 
 
 class GameEngine:
     """Main game engine that handles the game loop and core systems."""
 
-    def __init__(self):
-        """Initialize the game engine."""
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Python AI Pygame Game")
+    def __init__(
+        self,
+        headless: bool = False,
+        scene: Scene | None = None,
+        profiler: FrameProfiler | None = None,
+        dirty_rects: bool = False,
+        assets: AssetManager | None = None,
+        sim_rate: float = SIM_RATE,
+        max_steps: int = MAX_SIM_STEPS,
+    ):
+        """Initialize the game engine.
+
+        In headless mode no window is opened and rendering goes to an
+        off-screen surface, so simulations can run without a display.
+        With ``dirty_rects`` the engine only clears and presents the screen
+        regions the scene reports as changed. The scene's asset manifest is
+        prefetched on ``assets`` straight away.
+
+        The simulation steps at a fixed ``sim_rate`` per second, at most
+        ``max_steps`` times per rendered frame, independently of ``FPS``.
+        """
+        if sim_rate <= 0:
+            raise ValueError("sim_rate must be positive")
+        if max_steps < 1:
+            raise ValueError("max_steps must be at least 1")
+        self.headless = headless
+        if headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Python AI Pygame Game")
         self.clock = pygame.time.Clock()
         self.running = True
         self.dt = 0.0
+        self.sim_dt = 1.0 / sim_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.dropped_time = 0.0
+        self.frame = 0
+        self.sim_time = 0.0
+        self.profiler = profiler if profiler is not None else get_profiler()
+        self.dirty_rects = dirty_rects
+        self.changed_regions: list[pygame.Rect] | None = None
+        self._full_redraw = True
+        self.recorder: SessionRecorder | None = None
+        self.assets = assets if assets is not None else AssetManager()
+        self.scenes = SceneManager(self.assets)
+        self._rendered_scene: Scene | None = None
+        if scene is not None:
+            self.assets.prefetch(scene.asset_manifest())
+            self.scenes.push(scene)
+
+    @property
+    def scene(self) -> Scene | None:
+        """Get the scene currently driven by the engine."""
+        return self.scenes.current
+
+    @scene.setter
+    def scene(self, scene: Scene | None) -> None:
+        """Swap the current scene for another, or remove every scene."""
+        if scene is None:
+            self.scenes.clear()
+        else:
+            self.scenes.replace(scene)
 
     def handle_events(self) -> None:
         """Handle pygame events."""
@@ -26,40 +98,191 @@ class GameEngine:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                    self._full_redraw = True
+                else:
+                    self.scenes.handle_event(event)
+            else:
+                self.scenes.handle_event(event)
 
     def update(self, dt: float) -> None:
         """Update game state."""
-        # TODO: Update game entities and AI systems
-        pass
+        # Pick up assets decoded in the background since the last frame
+        self.assets.process_loaded()
+        stepped = self.scenes.update(dt)
+        # Only frames where the recorded scene ran (and so read input) count
+        if self.recorder is not None and stepped is self.recorder.scene:
+            self.recorder.record_frame()
+        self.frame += 1
+        self.sim_time += dt
 
     def render(self) -> None:
         """Render the game."""
-        # Clear screen with background color
-        self.screen.fill(COLORS["BLACK"])
+        # A scene switch leaves nothing of the old frame worth keeping
+        if self.scene is not self._rendered_scene:
+            self._rendered_scene = self.scene
+            self._full_redraw = True
+        self.scenes.interpolate(self.alpha)
+        partial = self.dirty_rects and self.scene is not None and not self._full_redraw
 
-        # Draw a simple placeholder
-        center_x = SCREEN_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        pygame.draw.circle(self.screen, COLORS["WHITE"], (center_x, center_y), 50)
+        # Clear the previous frame: only the scene's old regions when partial
+        if partial:
+            self.scene.clear(self.screen, COLORS["BLACK"])
+        else:
+            self.screen.fill(COLORS["BLACK"])
+
+        changed = None
+        if self.scene is not None:
+            changed = self.scenes.render(self.screen)
+        else:
+            # Draw a simple placeholder
+            center_x = SCREEN_WIDTH // 2
+            center_y = SCREEN_HEIGHT // 2
+            pygame.draw.circle(self.screen, COLORS["WHITE"], (center_x, center_y), 50)
+
+        self.profiler.render_overlay(self.screen)
+
+        # Scenes that can't report regions, and the overlay, need full redraws
+        self._full_redraw = changed is None or self.profiler.overlay_visible
+        self.changed_regions = changed if partial else None
 
         # Update display
-        pygame.display.flip()
+        if not self.headless:
+            if self.changed_regions is not None:
+                pygame.display.update(self.changed_regions)
+            else:
+                pygame.display.flip()
+
+    def advance(self, frame_time: float) -> int:
+        """Run the fixed simulation steps that a frame's wall-clock time covers.
+
+        Leftover time carries over to the next frame, and ``alpha`` is set
+        to the fraction of a step it represents so rendering can interpolate.
+        When more than ``max_steps`` steps are due, the surplus time is
+        dropped instead of making the next frame even slower. Recordings step
+        at their own fixed ``dt``. Returns the number of steps taken.
+        """
+        step = self.recorder.log.dt if self.recorder is not None else self.sim_dt
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= step and steps < self.max_steps:
+            with self.profiler.span("update"):
+                self.update(step)
+            self.accumulator -= step
+            steps += 1
+        if self.accumulator >= step:
+            # Spiral-of-death guard: keep only the fraction of a step
+            dropped = self.accumulator - self.accumulator % step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+        self.alpha = self.accumulator / step
+        return steps
+
+    def run_steps(
+        self, steps: int, dt: float | None = None, render: bool = False
+    ) -> None:
+        """Advance the simulation a fixed number of steps as fast as possible.
+
+        Each step uses the same fixed ``dt``, the engine's simulation step by
+        default, and ignores wall-clock time.
+        """
+        dt = self.sim_dt if dt is None else dt
+        if dt <= 0:
+            raise ValueError("dt must be positive")
+        profiler = self.profiler
+        for _ in range(steps):
+            profiler.begin_frame()
+            with profiler.span("update"):
+                self.update(dt)
+            if render:
+                with profiler.span("render"):
+                    self.render()
+            profiler.end_frame()
+
+    def run_for(
+        self, sim_seconds: float, dt: float | None = None, render: bool = False
+    ) -> int:
+        """Advance the simulation by ``sim_seconds`` of game time.
+
+        Returns the number of fixed steps taken.
+        """
+        dt = self.sim_dt if dt is None else dt
+        if dt <= 0:
+            raise ValueError("dt must be positive")
+        # Tolerate float error so 1.0 s at 1/60 s is exactly 60 steps
+        steps = max(0, math.ceil(sim_seconds / dt - 1e-9))
+        self.run_steps(steps, dt, render)
+        return steps
+
+    def start_recording(self, dt: float | None = None) -> None:
+        """Record the game scene's input and state checksums from now on.
+
+        While recording, ``run`` steps with the fixed ``dt``, the engine's
+        simulation step by default, so the session can be replayed exactly.
+        """
+        if not isinstance(self.scene, GameScene):
+            raise RuntimeError("Recording needs a GameScene")
+        self.stop_recording()
+        self.recorder = SessionRecorder(self.scene, self.sim_dt if dt is None else dt)
+
+    def stop_recording(self) -> InputLog | None:
+        """Stop recording and return the recorded log, if any."""
+        if self.recorder is None:
+            return None
+        log = self.recorder.stop()
+        self.recorder = None
+        return log
+
+    def replay(self, log: InputLog, verify: bool = True, render: bool = False) -> int:
+        """Re-run a recorded session as fast as possible.
+
+        The scene must be set up the same way as when recording, including
+        agent seeds. A scheduler ``budget_ms`` depends on wall-clock time, so
+        sessions recorded with one only replay exactly if no agent was
+        deferred. With ``verify``, raises ``ReplayMismatchError`` at the
+        first frame whose state checksum differs from the log. Returns the
+        frames replayed.
+        """
+        if not isinstance(self.scene, GameScene):
+            raise RuntimeError("Replaying needs a GameScene")
+        player = self.scene.player
+        source = player.controls
+        player.controls = ScriptedInput(log.inputs)
+        try:
+            for frame in range(len(log)):
+                self.run_steps(1, log.dt, render)
+                if verify and frame < len(log.checksums):
+                    actual = self.scene.checksum()
+                    if actual != log.checksums[frame]:
+                        raise ReplayMismatchError(frame, log.checksums[frame], actual)
+        finally:
+            player.controls = source
+        return len(log)
 
     def run(self) -> None:
         """Main game loop."""
         print("Starting game engine...")
 
         while self.running:
-            # Calculate delta time
+            # Measure the frame; the simulation catches up in fixed steps
             self.dt = self.clock.tick(FPS) / 1000.0
+            self.profiler.begin_frame()
 
             # Handle events
-            self.handle_events()
+            with self.profiler.span("events"):
+                self.handle_events()
 
             # Update game state
-            self.update(self.dt)
+            self.advance(self.dt)
 
             # Render
-            self.render()
+            with self.profiler.span("render"):
+                self.render()
+
+            self.profiler.end_frame()
 
+        self.scenes.clear()
+        self.scenes.shutdown()
+        self.assets.shutdown()
         print("Game engine stopped.")
@@ -6,21 +6,109 @@ from abc import ABC, abstractmethod
 
 import pygame
 
-from utils.constants import COLORS
+from game.input import InputSource, KeyboardInput
+from game.render_cache import SpriteKey
+from game.store import EntityStore, get_default_store
+from utils.constants import COLORS, ENEMY_SPEED, WORLD_HEIGHT, WORLD_WIDTH
+
+
+def _store_field(name: str) -> property:
+    """Create a property that reads and writes one column of the entity store."""
+
+    def getter(self: "Entity") -> float:
+        return getattr(self._store, name)[self._row]
+
+    def setter(self: "Entity", value: float) -> None:
+        getattr(self._store, name)[self._row] = value
+
+    return property(getter, setter, doc=f"The entity's {name}.")
 
 
 class Entity(ABC):
-    """Base class for all game entities."""
+    """Base class for all game entities.
+
+    Entity state lives in a row of an ``EntityStore``; the entity itself is a
+    lightweight view onto that row.
+    """
+
+    __slots__ = ("_store", "_row", "_epoch")
+
+    x = _store_field("x")
+    y = _store_field("y")
+    width = _store_field("width")
+    height = _store_field("height")
+    velocity_x = _store_field("velocity_x")
+    velocity_y = _store_field("velocity_y")
+
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        store: EntityStore | None = None,
+        row: int | None = None,
+    ):
+        """Initialize the entity.
+
+        Passing ``row`` binds the entity to an existing row of ``store``,
+        keeping that row's values, instead of allocating a new one.
+        """
+        self._store = store if store is not None else get_default_store()
+        if row is None:
+            row = self._store.allocate(x, y, width, height)
+        self._row = row
+        self._epoch = self._store.epoch
 
-    def __init__(self, x: float, y: float, width: float, height: float):
-        """Initialize the entity."""
+    def __del__(self):
+        """Release the entity's row back to its store."""
+        store = getattr(self, "_store", None)
+        row = getattr(self, "_row", None)
+        # Entities made stale by a store restore no longer own their row
+        epoch = getattr(self, "_epoch", None)
+        if store is not None and row is not None and epoch == store.epoch:
+            store.release(row)
+
+    @classmethod
+    def from_row(cls, store: EntityStore, row: int) -> "Entity":
+        """Create an entity of this type viewing an existing store row."""
+        entity = cls.__new__(cls)
+        Entity.__init__(entity, 0.0, 0.0, 0.0, 0.0, store, row)
+        return entity
+
+    def reset(self, x: float, y: float) -> None:
+        """Reactivate the entity at a new position, e.g. when reused by a pool."""
         self.x = x
         self.y = y
-        self.width = width
-        self.height = height
         self.velocity_x = 0.0
         self.velocity_y = 0.0
         self.active = True
+        self._store.snap(self._row)
+
+    def rebind(self, row: int) -> None:
+        """Take ownership of a row of the entity's store, e.g. after a restore."""
+        self._row = row
+        self._epoch = self._store.epoch
+
+    @property
+    def store(self) -> EntityStore:
+        """Get the store holding this entity's state."""
+        return self._store
+
+    @property
+    def row(self) -> int:
+        """Get the entity's row in its store."""
+        return self._row
+
+    @property
+    def active(self) -> bool:
+        """Get whether the entity is active."""
+        return self._store.active[self._row] == 1
+
+    @active.setter
+    def active(self, value: bool) -> None:
+        """Set whether the entity is active."""
+        self._store.active[self._row] = 1 if value else 0
 
     @property
     def position(self) -> tuple[float, float]:
@@ -38,66 +126,147 @@ class Entity(ABC):
         pass
 
     @abstractmethod
-    def render(self, screen: pygame.Surface) -> None:
-        """Render the entity."""
+    def render(self, screen: pygame.Surface) -> pygame.Rect | None:
+        """Render the entity and return the area it drew to.
+
+        Entities that can be drawn under a scrolled camera also accept an
+        ``offset`` argument: the world position of the screen's top-left.
+        """
         pass
 
+    def sprite_key(self) -> SpriteKey | None:
+        """Get the cached sprite that draws this entity, if it has one.
+
+        Entities without a sprite are drawn through ``render`` instead.
+        """
+        return None
+
     def move(self, dt: float) -> None:
-        """Move the entity based on its velocity."""
+        """Move the entity based on its velocity.
+
+        To move every entity in a store at once, use ``EntityStore.integrate``.
+        """
         self.x += self.velocity_x * dt
         self.y += self.velocity_y * dt
 
+    def steer(self, dt: float) -> None:
+        """Choose a new velocity without moving; used before bulk integration."""
+
 
 class Player(Entity):
     """Player entity."""
 
-    def __init__(self, x: float, y: float):
-        """Initialize the player."""
-        super().__init__(x, y, 32, 32)
+    __slots__ = ("speed", "color", "controls")
+
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        store: EntityStore | None = None,
+        controls: InputSource | None = None,
+        row: int | None = None,
+    ):
+        """Initialize the player.
+
+        The player reads its actions from ``controls``, the keyboard by
+        default; swap in another source to script or replay a session.
+        """
+        super().__init__(x, y, 32, 32, store, row)
         self.speed = 200.0  # pixels per second
         self.color = COLORS["BLUE"]
+        self.controls = controls if controls is not None else KeyboardInput()
+
+    @classmethod
+    def from_row(cls, store: EntityStore, row: int) -> "Player":
+        """Create a player viewing an existing store row."""
+        return cls(0.0, 0.0, store, row=row)
 
     def update(self, dt: float) -> None:
         """Update the player."""
-        # Handle input
-        keys = pygame.key.get_pressed()
+        self.steer(dt)
+
+        # Move the player and keep it in the world
+        self.move(dt)
+        self.clamp_to_world()
+
+    def steer(self, dt: float) -> None:
+        """Set the player's velocity from this frame's input."""
+        controls = self.controls
+        controls.poll()
         self.velocity_x = 0.0
         self.velocity_y = 0.0
 
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if controls.pressed("LEFT"):
             self.velocity_x = -self.speed
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if controls.pressed("RIGHT"):
             self.velocity_x = self.speed
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
+        if controls.pressed("UP"):
             self.velocity_y = -self.speed
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        if controls.pressed("DOWN"):
             self.velocity_y = self.speed
 
-        # Move the player
-        self.move(dt)
+    def clamp_to_world(
+        self, width: float = WORLD_WIDTH, height: float = WORLD_HEIGHT
+    ) -> None:
+        """Keep the player inside a world of the given size."""
+        self.x = max(0, min(self.x, width - self.width))
+        self.y = max(0, min(self.y, height - self.height))
+
+    def clamp_to_screen(self) -> None:
+        """Keep the player inside the default world; see ``clamp_to_world``."""
+        self.clamp_to_world()
 
-        # Keep player on screen
-        self.x = max(0, min(self.x, 800 - self.width))  # TODO: Use screen constants
-        self.y = max(0, min(self.y, 600 - self.height))
+    def sprite_key(self) -> SpriteKey:
+        """Get the sprite that draws the player."""
+        return ("rect", int(self.width), int(self.height), self.color)
 
-    def render(self, screen: pygame.Surface) -> None:
+    def render(
+        self, screen: pygame.Surface, offset: tuple[float, float] = (0.0, 0.0)
+    ) -> pygame.Rect:
         """Render the player."""
-        pygame.draw.rect(screen, self.color, self.rect)
+        return pygame.draw.rect(
+            screen, self.color, self.rect.move(-offset[0], -offset[1])
+        )
 
 
 class Enemy(Entity):
     """Basic enemy entity."""
 
-    def __init__(self, x: float, y: float):
+    __slots__ = ("speed", "color")
+
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        store: EntityStore | None = None,
+        row: int | None = None,
+    ):
         """Initialize the enemy."""
-        super().__init__(x, y, 24, 24)
-        self.speed = 100.0
+        super().__init__(x, y, 24, 24, store, row)
+        self.speed = ENEMY_SPEED
+        self.color = COLORS["RED"]
+
+    @classmethod
+    def from_row(cls, store: EntityStore, row: int) -> "Enemy":
+        """Create an enemy viewing an existing store row."""
+        return cls(0.0, 0.0, store, row)
+
+    def reset(self, x: float, y: float) -> None:
+        """Reactivate the enemy at a new position with its default look."""
+        super().reset(x, y)
+        self.speed = ENEMY_SPEED
         self.color = COLORS["RED"]
 
     def update(self, dt: float) -> None:
         """Update the enemy."""
-        # Simple AI: move towards center of screen
-        center_x, center_y = 400, 300  # TODO: Use screen constants
+        self.steer(dt)
+        self.move(dt)
+
+    def steer(
+        self, dt: float, width: float = WORLD_WIDTH, height: float = WORLD_HEIGHT
+    ) -> None:
+        """Steer the enemy towards the center of a world of the given size."""
+        center_x, center_y = width / 2, height / 2
 
         dx = center_x - self.x
         dy = center_y - self.y
@@ -107,8 +276,14 @@ class Enemy(Entity):
             self.velocity_x = (dx / distance) * self.speed
             self.velocity_y = (dy / distance) * self.speed
 
-        self.move(dt)
+    def sprite_key(self) -> SpriteKey:
+        """Get the sprite that draws the enemy."""
+        return ("rect", int(self.width), int(self.height), self.color)
 
-    def render(self, screen: pygame.Surface) -> None:
+    def render(
+        self, screen: pygame.Surface, offset: tuple[float, float] = (0.0, 0.0)
+    ) -> pygame.Rect:
         """Render the enemy."""
-        pygame.draw.rect(screen, self.color, self.rect)
+        return pygame.draw.rect(
+            screen, self.color, self.rect.move(-offset[0], -offset[1])
+        )
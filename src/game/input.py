@@ -0,0 +1,95 @@
+"""
+Input module - player actions as per-frame bitmasks from swappable sources.
+"""
+
+from collections.abc import Iterable, MutableSequence
+
+import pygame
+
+from utils.constants import MOVEMENT_KEYS
+
+# One bit per action, in MOVEMENT_KEYS order
+ACTION_BITS = {action: 1 << index for index, action in enumerate(MOVEMENT_KEYS)}
+
+
+def actions_to_bits(actions: Iterable[str]) -> int:
+    """Pack action names into a bitmask."""
+    bits = 0
+    for action in actions:
+        bits |= ACTION_BITS[action]
+    return bits
+
+
+class InputSource:
+    """Supplies the player's actions, one bitmask per frame.
+
+    ``poll`` advances to the next frame; ``pressed`` reads the current one.
+    The base class never presses anything.
+    """
+
+    def __init__(self):
+        """Initialize the input source."""
+        self.bits = 0
+
+    def poll(self) -> int:
+        """Advance to the next frame and return its action bits."""
+        self.bits = self.read()
+        return self.bits
+
+    def read(self) -> int:
+        """Read the action bits for a new frame."""
+        return 0
+
+    def pressed(self, action: str) -> bool:
+        """Check whether an action is held in the current frame."""
+        return bool(self.bits & ACTION_BITS[action])
+
+
+class KeyboardInput(InputSource):
+    """Reads actions from the keyboard using MOVEMENT_KEYS."""
+
+    def __init__(self):
+        """Initialize the keyboard input."""
+        super().__init__()
+        self._keys = {
+            ACTION_BITS[action]: [getattr(pygame, name) for name in names]
+            for action, names in MOVEMENT_KEYS.items()
+        }
+
+    def read(self) -> int:
+        """Read the currently held keys."""
+        keys = pygame.key.get_pressed()
+        bits = 0
+        for bit, codes in self._keys.items():
+            if any(keys[code] for code in codes):
+                bits |= bit
+        return bits
+
+
+class ScriptedInput(InputSource):
+    """Plays back a fixed sequence of action bits, then releases everything."""
+
+    def __init__(self, frames: Iterable[int]):
+        """Initialize the scripted input."""
+        super().__init__()
+        self._frames = iter(frames)
+
+    def read(self) -> int:
+        """Take the next scripted frame."""
+        return next(self._frames, 0)
+
+
+class RecordingInput(InputSource):
+    """Passes another source through while appending each frame's bits."""
+
+    def __init__(self, source: InputSource, frames: MutableSequence[int] | None = None):
+        """Initialize the recording input."""
+        super().__init__()
+        self.source = source
+        self.frames = frames if frames is not None else []
+
+    def read(self) -> int:
+        """Read from the wrapped source and record the result."""
+        bits = self.source.poll()
+        self.frames.append(bits)
+        return bits
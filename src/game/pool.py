@@ -0,0 +1,168 @@
+"""
+Pool module - recycles entities and AI agents instead of reallocating them.
+"""
+
+from collections.abc import Callable
+from typing import Generic, NamedTuple, TypeVar
+
+from ai.agents import AIAgent
+from game.entities import Entity
+from game.store import EntityStore, get_default_store
+
+T = TypeVar("T")
+E = TypeVar("E", bound=Entity)
+A = TypeVar("A", bound=AIAgent)
+
+
+class PoolStats(NamedTuple):
+    """Counters describing how well a pool is absorbing allocations."""
+
+    acquired: int
+    released: int
+    misses: int
+    in_use: int
+    free: int
+    high_water: int
+
+
+class Pool(Generic[T]):
+    """Free list of objects of one type with acquire/release hooks.
+
+    ``acquire`` hands out a released object after passing it and the
+    acquire arguments to ``reset``; only when the free list is empty is
+    ``factory`` called with the same arguments, which counts as a miss.
+    ``release`` runs ``on_release`` and keeps the object for reuse, up to
+    ``max_free`` objects; releasing an object that is already free raises
+    ``ValueError``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., T],
+        reset: Callable[..., None],
+        on_release: Callable[[T], None] | None = None,
+        max_free: int | None = None,
+    ):
+        """Initialize an empty pool."""
+        self.factory = factory
+        self.reset = reset
+        self.on_release = on_release
+        self.max_free = max_free
+        self._free: list[T] = []
+        # Identities of the free objects, to catch double releases
+        self._free_ids: set[int] = set()
+        self._acquired = 0
+        self._released = 0
+        self._misses = 0
+        self._in_use = 0
+        self._high_water = 0
+
+    def __len__(self) -> int:
+        """Return the number of objects waiting to be reused."""
+        return len(self._free)
+
+    def acquire(self, *args, **kwargs) -> T:
+        """Take an object from the pool, creating one if none is free."""
+        if self._free:
+            obj = self._free.pop()
+            self._free_ids.discard(id(obj))
+            self.reset(obj, *args, **kwargs)
+        else:
+            obj = self.factory(*args, **kwargs)
+            self._misses += 1
+        self._acquired += 1
+        self._in_use += 1
+        if self._in_use > self._high_water:
+            self._high_water = self._in_use
+        return obj
+
+    def release(self, obj: T) -> None:
+        """Give an object back to the pool."""
+        if id(obj) in self._free_ids:
+            raise ValueError("Object was already released to the pool")
+        if self.on_release is not None:
+            self.on_release(obj)
+        self._released += 1
+        self._in_use = max(self._in_use - 1, 0)
+        if self.max_free is None or len(self._free) < self.max_free:
+            self._free.append(obj)
+            self._free_ids.add(id(obj))
+
+    def prewarm(self, count: int, *args, **kwargs) -> None:
+        """Create objects up front until ``count`` are free.
+
+        Warming a pool before a wave spawns moves the allocations (and the
+        garbage collections they trigger) out of the frame that needs them.
+        """
+        while len(self._free) < count:
+            obj = self.factory(*args, **kwargs)
+            if self.on_release is not None:
+                self.on_release(obj)
+            self._free.append(obj)
+            self._free_ids.add(id(obj))
+
+    def idle(self) -> list[T]:
+        """Get the free objects, the next one to be reused last."""
+        return list(self._free)
+
+    def refill(self, objects: list[T]) -> None:
+        """Replace the free objects, e.g. after restoring a snapshot."""
+        self._free = list(objects)
+        self._free_ids = set(map(id, self._free))
+
+    def clear(self) -> None:
+        """Drop every free object."""
+        self._free.clear()
+        self._free_ids.clear()
+
+    def stats(self) -> PoolStats:
+        """Get the pool's counters."""
+        return PoolStats(
+            self._acquired,
+            self._released,
+            self._misses,
+            self._in_use,
+            len(self._free),
+            self._high_water,
+        )
+
+
+class EntityPool(Pool[E]):
+    """Pool of one entity type on one store.
+
+    Released entities keep their store row but are deactivated, so bulk
+    systems skip them until they are acquired at a new position.
+    """
+
+    def __init__(
+        self,
+        kind: type[E],
+        store: EntityStore | None = None,
+        max_free: int | None = None,
+    ):
+        """Initialize a pool of ``kind`` entities."""
+        self.kind = kind
+        self.store = store if store is not None else get_default_store()
+        super().__init__(self._create, kind.reset, self._retire, max_free)
+
+    def _create(self, x: float = 0.0, y: float = 0.0) -> E:
+        return self.kind(x, y, self.store)
+
+    @staticmethod
+    def _retire(entity: Entity) -> None:
+        entity.velocity_x = 0.0
+        entity.velocity_y = 0.0
+        entity.active = False
+
+
+class AgentPool(Pool[A]):
+    """Pool of one AI agent type; agents are re-pointed at new entities."""
+
+    def __init__(self, kind: type[A], max_free: int | None = None):
+        """Initialize a pool of ``kind`` agents."""
+        self.kind = kind
+        super().__init__(kind, kind.reset, self._retire, max_free)
+
+    @staticmethod
+    def _retire(agent: AIAgent) -> None:
+        agent.active = False
@@ -0,0 +1,55 @@
+"""
+Render cache module - pre-rasterized entity surfaces for batched blitting.
+"""
+
+import pygame
+
+# Key describing one rasterized sprite: (shape, width, height, color)
+SpriteKey = tuple[str, int, int, tuple[int, int, int]]
+
+SHAPES = ("rect", "circle")
+
+
+class RenderCache:
+    """Rasterizes each (shape, size, color) once and reuses the surface."""
+
+    def __init__(self):
+        """Initialize the render cache."""
+        self._surfaces: dict[SpriteKey, pygame.Surface] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached surfaces."""
+        return len(self._surfaces)
+
+    def __contains__(self, key: SpriteKey) -> bool:
+        """Check whether a sprite is already cached."""
+        return key in self._surfaces
+
+    def get(self, key: SpriteKey) -> pygame.Surface:
+        """Get the surface for a sprite, rasterizing it on first use."""
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = self._rasterize(*key)
+        return surface
+
+    def clear(self) -> None:
+        """Drop every cached surface, e.g. after the display format changes."""
+        self._surfaces.clear()
+
+    @staticmethod
+    def _rasterize(
+        shape: str, width: int, height: int, color: tuple[int, int, int]
+    ) -> pygame.Surface:
+        """Draw one sprite into a new surface in the display's pixel format."""
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown sprite shape: {shape}")
+        has_display = pygame.display.get_surface() is not None
+
+        if shape == "rect":
+            surface = pygame.Surface((width, height))
+            surface.fill(color)
+            return surface.convert() if has_display else surface
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.ellipse(surface, color, surface.get_rect())
+        return surface.convert_alpha() if has_display else surface
@@ -0,0 +1,135 @@
+"""
+Replay module - compact binary input logs with per-frame state checksums.
+"""
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+from game.input import RecordingInput
+from game.scenes import GameScene
+from utils.constants import FPS
+
+# Little-endian file header: magic, version, dt, frames, input runs, checksums
+_HEADER = struct.Struct("<4sHdIII")
+_MAGIC = b"PGIL"
+_VERSION = 1
+
+# One run of identical input frames: length, action bits
+_RUN = struct.Struct("<HB")
+_MAX_RUN = 0xFFFF
+
+
+class ReplayMismatchError(RuntimeError):
+    """Raised when a replayed frame's state differs from the recording."""
+
+    def __init__(self, frame: int, expected: int, actual: int):
+        """Initialize the error for the first diverging frame."""
+        super().__init__(
+            f"State diverged at frame {frame}: "
+            f"expected checksum {expected:08x}, got {actual:08x}"
+        )
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+class InputLog:
+    """Per-frame input bits and state checksums of one recorded session.
+
+    Inputs are stored run-length encoded on disk, so a session costs about
+    4 bytes per frame, almost all of it checksums.
+    """
+
+    def __init__(self, dt: float = 1.0 / FPS):
+        """Initialize an empty log for a session stepped at a fixed ``dt``."""
+        if dt <= 0:
+            raise ValueError("dt must be positive")
+        self.dt = dt
+        self.inputs = array("B")
+        self.checksums = array("I")
+
+    def __len__(self) -> int:
+        """Return the number of recorded frames."""
+        return len(self.inputs)
+
+    def to_bytes(self) -> bytes:
+        """Encode the log in its binary file format."""
+        runs = []
+        inputs = self.inputs
+        start = 0
+        while start < len(inputs):
+            bits = inputs[start]
+            end = start + 1
+            while end < len(inputs) and inputs[end] == bits and end - start < _MAX_RUN:
+                end += 1
+            runs.append(_RUN.pack(end - start, bits))
+            start = end
+
+        checksums = array("I", self.checksums)
+        if sys.byteorder == "big":
+            checksums.byteswap()
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, self.dt, len(inputs), len(runs), len(checksums)
+        )
+        return header + b"".join(runs) + checksums.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputLog":
+        """Decode a log from its binary file format."""
+        if len(data) < _HEADER.size:
+            raise ValueError("Input log is truncated")
+        magic, version, dt, frames, run_count, checksum_count = _HEADER.unpack_from(
+            data
+        )
+        if magic != _MAGIC:
+            raise ValueError("Not an input log")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported input log version: {version}")
+        runs_end = _HEADER.size + run_count * _RUN.size
+        if len(data) != runs_end + 4 * checksum_count:
+            raise ValueError("Input log is truncated")
+
+        log = cls(dt)
+        for length, bits in _RUN.iter_unpack(data[_HEADER.size : runs_end]):
+            log.inputs.extend([bits] * length)
+        if len(log.inputs) != frames:
+            raise ValueError("Input log frame count doesn't match its inputs")
+        log.checksums.frombytes(data[runs_end:])
+        if sys.byteorder == "big":
+            log.checksums.byteswap()
+        return log
+
+    def save(self, path: str | Path) -> None:
+        """Write the log to a file."""
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "InputLog":
+        """Read a log from a file."""
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+class SessionRecorder:
+    """Records a game scene's player input and state checksum every frame.
+
+    Only frames where the scene itself updates count, so time spent with
+    another scene (e.g. the pause screen) on top is left out.
+    """
+
+    def __init__(self, scene: GameScene, dt: float = 1.0 / FPS):
+        """Start recording by wrapping the player's input source."""
+        self.scene = scene
+        self.log = InputLog(dt)
+        self._source = scene.player.controls
+        scene.player.controls = RecordingInput(self._source, self.log.inputs)
+
+    def record_frame(self) -> None:
+        """Record the state checksum after the scene's update."""
+        self.log.checksums.append(self.scene.checksum())
+
+    def stop(self) -> InputLog:
+        """Restore the player's input source and return the log."""
+        self.scene.player.controls = self._source
+        return self.log
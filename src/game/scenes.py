@@ -2,19 +2,60 @@
 Game scenes module - contains different game states and scenes.
 """
 
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import pygame
 
-from game.entities import Enemy, Player
+from ai.agents import AIAgent, ChasingAI, FlockingAI
+from ai.flocking import FlockingSystem
+from ai.navigation import NavigationGrid
+from ai.parallel import ParallelAIExecutor
+from ai.policy import PolicyAI, PolicySystem
+from ai.scheduler import AIScheduler
+from game.assets import AssetManager, AssetManifest
+from game.camera import Camera
+from game.collision import CollisionSystem
+from game.entities import Enemy, Entity, Player
+from game.input import InputSource
+from game.pool import AgentPool, EntityPool, PoolStats
+from game.render_cache import RenderCache
+from game.spatial import SpatialHash
+from game.store import EntityStore
+from game.streaming import ChunkFile, WorldStreamer
+from utils.constants import (
+    AI_UPDATE_FREQUENCY,
+    COLORS,
+    GAME_STATES,
+    STREAM_RADIUS,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+from utils.profiler import get_profiler
+from utils.text import get_text_renderer
+
+# Live game scenes on each entity store, to tell which scenes share one
+_scenes_by_store: "weakref.WeakKeyDictionary[EntityStore, weakref.WeakSet]" = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class Scene(ABC):
-    """Base class for all game scenes."""
+    """Base class for all game scenes.
+
+    ``state`` is the scene's entry in ``GAME_STATES``. While a scene is on
+    a ``SceneManager`` stack, ``manager`` points at it so the scene can
+    switch to others.
+    """
+
+    state: int | None = None
 
     def __init__(self):
         """Initialize the scene."""
         self.active = True
+        self.manager: SceneManager | None = None
 
     @abstractmethod
     def handle_event(self, event: pygame.event.Event) -> None:
@@ -27,62 +68,444 @@ class Scene(ABC):
         pass
 
     @abstractmethod
-    def render(self, screen: pygame.Surface) -> None:
-        """Render the scene."""
+    def render(self, screen: pygame.Surface) -> list[pygame.Rect] | None:
+        """Render the scene.
+
+        Scenes that support dirty-rect rendering return the screen regions
+        changed since the previous frame; ``None`` means the whole screen.
+        """
         pass
 
+    def clear(self, screen: pygame.Surface, color: tuple[int, int, int]) -> None:
+        """Erase what the previous frame drew before rendering a new one."""
+        screen.fill(color)
+
+    def interpolate(self, alpha: float) -> None:
+        """Set how far the next render is from the previous update to the last.
+
+        ``alpha`` 0 draws the state before the last update and 1 the state
+        after it. Scenes that don't interpolate ignore it.
+        """
+
+    def on_exit(self) -> None:
+        """Release what the scene holds once it leaves the scene stack.
+
+        Called when a ``SceneManager`` pops, replaces or clears the scene,
+        which includes the engine shutting down. Covering a scene with
+        another doesn't count.
+        """
+
+    def checksum(self) -> int:
+        """Get a checksum of the scene's simulation state, for replay checks."""
+        return 0
+
+    def asset_manifest(self) -> AssetManifest:
+        """Get the assets to load in the background before the scene shows."""
+        return {}
+
 
 class GameScene(Scene):
     """Main gameplay scene."""
 
-    def __init__(self):
-        """Initialize the game scene."""
+    state = GAME_STATES["PLAYING"]
+
+    def __init__(
+        self,
+        controls: InputSource | None = None,
+        store: EntityStore | None = None,
+        world_size: tuple[float, float] = (WORLD_WIDTH, WORLD_HEIGHT),
+    ):
+        """Initialize the game scene.
+
+        The player reads ``controls``, the keyboard by default. Scenes get
+        their own entity store unless given one to share; ``update``
+        integrates the whole store, so scenes sharing one are stepped
+        together from outside, as ``VecGameEnv`` does. The camera follows
+        the player around a world of ``world_size``.
+        """
         super().__init__()
-        self.player = Player(100, 100)
+        self.store = store if store is not None else EntityStore()
+        _scenes_by_store.setdefault(self.store, weakref.WeakSet()).add(self)
+        self.player = Player(100, 100, self.store, controls)
         self.enemies = [
-            Enemy(500, 200),
-            Enemy(300, 400),
+            Enemy(500, 200, self.store),
+            Enemy(300, 400, self.store),
         ]
+        self.agents: list[AIAgent] = []
+        self.world_width, self.world_height = world_size
+        self.camera = Camera(
+            world_width=self.world_width, world_height=self.world_height
+        )
+        self.spatial_hash = SpatialHash()
+        self.navigation = NavigationGrid(self.world_width, self.world_height)
+        self.flocking = FlockingSystem()
+        self.policies = PolicySystem()
+        self.scheduler = AIScheduler()
+        self.parallel: ParallelAIExecutor | None = None
+        self.streamer: WorldStreamer | None = None
+        self.collisions = CollisionSystem()
+        self.enemy_pool = EntityPool(Enemy, self.store)
+        self.agent_pools: dict[type[AIAgent], AgentPool] = {}
+        self.profiler = get_profiler()
+        self.render_cache = RenderCache()
+        self.render_alpha = 1.0
+        self._drawn_rects: dict[Entity, pygame.Rect] = {}
+        self._drawn_offset = (0.0, 0.0)
+        self._spatial_hash_stale = False
+        self.refresh_spatial_hash()
+        self.camera.follow(self.player)
+        self.camera.save_position()
+
+    @property
+    def entities(self) -> list[Entity]:
+        """Get every entity in the scene."""
+        return [self.player, *self.enemies]
+
+    @property
+    def shares_store(self) -> bool:
+        """Check whether other live scenes use this scene's entity store."""
+        return len(_scenes_by_store.get(self.store, ())) > 1
+
+    @property
+    def game_state(self) -> dict:
+        """Get the shared state passed to AI agents each frame."""
+        return {
+            "player": self.player,
+            "entities": self.entities,
+            "spatial_hash": self.spatial_hash,
+            "navigation": self.navigation,
+            "world_size": (self.world_width, self.world_height),
+        }
+
+    def add_agent(self, agent: AIAgent, rate: float = AI_UPDATE_FREQUENCY) -> None:
+        """Attach an AI agent that steers one of the scene's entities.
+
+        Flocking and policy agents are stepped every frame in batches; other
+        agents are time-sliced by the scheduler at ``rate`` updates per second.
+        """
+        self.agents.append(agent)
+        if isinstance(agent, FlockingAI):
+            self.flocking.add(agent)
+        elif isinstance(agent, PolicyAI):
+            self.policies.add(agent)
+        else:
+            self.scheduler.register(agent, rate)
+
+    def remove_agent(self, agent: AIAgent) -> None:
+        """Detach an AI agent from the scene."""
+        self.agents.remove(agent)
+        if self.parallel is not None:
+            self.parallel.discard(agent)
+        if isinstance(agent, FlockingAI):
+            self.flocking.remove(agent)
+        elif isinstance(agent, PolicyAI):
+            self.policies.remove(agent)
+        else:
+            self.scheduler.unregister(agent)
+
+    def refresh_spatial_hash(self) -> None:
+        """Bring the spatial hash up to date with the entities' positions."""
+        self.spatial_hash.rebuild(self.entities, self.store)
+        self._spatial_hash_stale = False
+
+    def invalidate_spatial_hash(self) -> None:
+        """Mark the spatial hash out of date, e.g. after a snapshot restore.
+
+        It is refreshed by the next ``update``, or by ``draw`` if that comes
+        first, so restores that are re-simulated straight away don't pay
+        for a refresh of their own.
+        """
+        self._spatial_hash_stale = True
+
+    def spawn_enemy(
+        self,
+        x: float,
+        y: float,
+        agent_type: type[AIAgent] | None = None,
+        rate: float = AI_UPDATE_FREQUENCY,
+    ) -> Enemy:
+        """Add an enemy from the scene's pool, optionally steered by a pooled agent.
+
+        Chasing agents are aimed at the player.
+        """
+        return self.spawn_enemy_and_agent(x, y, agent_type, rate)[0]
+
+    def spawn_enemy_and_agent(
+        self,
+        x: float,
+        y: float,
+        agent_type: type[AIAgent] | None = None,
+        rate: float = AI_UPDATE_FREQUENCY,
+    ) -> tuple[Enemy, AIAgent | None]:
+        """Spawn an enemy like ``spawn_enemy`` and also return its agent, if any."""
+        enemy = self.enemy_pool.acquire(x, y)
+        self.enemies.append(enemy)
+        self.spatial_hash.insert(enemy)
+        agent = None
+        if agent_type is not None:
+            agent = self.agent_pool(agent_type).acquire(enemy)
+            if isinstance(agent, ChasingAI):
+                agent.set_target(self.player)
+            self.add_agent(agent, rate)
+        return enemy, agent
+
+    def despawn_enemies(self, enemies: list[Enemy]) -> None:
+        """Remove enemies and their agents, returning them to the pools."""
+        removed = set(enemies)
+        self.enemies = [enemy for enemy in self.enemies if enemy not in removed]
+        for agent in [a for a in self.agents if a.entity in removed]:
+            self.remove_agent(agent)
+            self.agent_pool(type(agent)).release(agent)
+        for enemy in enemies:
+            self.spatial_hash.remove(enemy)
+            self.enemy_pool.release(enemy)
+
+    def prewarm(self, count: int, agent_type: type[AIAgent] | None = None) -> None:
+        """Fill the pools with ``count`` free enemies (and agents) before a wave."""
+        self.enemy_pool.prewarm(count)
+        if agent_type is not None:
+            # Idle agents point at the player until they are acquired
+            self.agent_pool(agent_type).prewarm(count, self.player)
+
+    def agent_pool(self, kind: type[AIAgent]) -> AgentPool:
+        """Get the scene's pool of one agent type."""
+        pool = self.agent_pools.get(kind)
+        if pool is None:
+            pool = self.agent_pools[kind] = AgentPool(kind)
+        return pool
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        """Get the counters of every pool, keyed by pooled type name."""
+        stats = {"Enemy": self.enemy_pool.stats()}
+        for kind, pool in self.agent_pools.items():
+            stats[kind.__name__] = pool.stats()
+        return stats
+
+    def start_parallel_ai(self, workers: int | None = None) -> None:
+        """Step the scheduler's agents in worker processes.
+
+        They still update at their scheduled rates. Flocking and policy
+        agents keep running batched in this process.
+        """
+        self.stop_parallel_ai()
+        self.parallel = ParallelAIExecutor(self.store, workers)
+        self.parallel.start(
+            [a for a in self.agents if not isinstance(a, (FlockingAI, PolicyAI))]
+        )
+
+    def stop_parallel_ai(self) -> None:
+        """Bring agent updates back into this process."""
+        if self.parallel is not None:
+            self.parallel.stop()
+            self.parallel = None
+
+    def start_streaming(self, chunks: ChunkFile, radius: int = STREAM_RADIUS) -> None:
+        """Page enemies and terrain in and out of a chunk file around the player.
+
+        The scene's world must be the size of the chunk file's. Enemies
+        already in the scene are streamed like the file's own.
+        """
+        self.stop_streaming()
+        self.streamer = WorldStreamer(chunks, radius)
+        self.streamer.start(self)
+
+    def stop_streaming(self) -> None:
+        """Write every streamed enemy and tile back to the chunk file."""
+        if self.streamer is not None:
+            self.streamer.stop(self)
+            self.streamer = None
+
+    def on_exit(self) -> None:
+        """Write streamed chunks back and stop the AI worker processes."""
+        self.stop_streaming()
+        self.stop_parallel_ai()
+
+    def checksum(self) -> int:
+        """Get a checksum of every entity's position and velocity."""
+        return self.store.checksum()
 
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle pygame events for the game scene."""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 print("Space pressed in game scene!")
+            elif event.key == pygame.K_p and self.manager is not None:
+                self.manager.push(PauseScene(self))
 
     def update(self, dt: float) -> None:
         """Update the game scene."""
-        # Update player
-        self.player.update(dt)
+        # Keep the last step's positions for render interpolation
+        self.store.save_positions()
+        self.camera.save_position()
 
-        # Update enemies
-        for enemy in self.enemies:
-            enemy.update(dt)
+        # Read player input
+        self.player.steer(dt)
 
-    def render(self, screen: pygame.Surface) -> None:
-        """Render the game scene."""
-        # Render player
-        self.player.render(screen)
+        # Refresh the world spatial hash once per frame for AI neighbor queries
+        # and render culling; only entities that changed cell are moved
+        with self.profiler.span("scene.spatial_hash"):
+            self.refresh_spatial_hash()
 
-        # Render enemies
+        # Update AI agents; flocking and policy agents are stepped in batches
+        game_state = self.game_state
+        with self.profiler.span("ai.flocking"):
+            self.flocking.update(dt, game_state)
+        with self.profiler.span("ai.policy"):
+            self.policies.update(dt, game_state)
+        if self.parallel is not None:
+            with self.profiler.span("ai.parallel"):
+                due = self.scheduler.take_due(dt)
+                self.parallel.update(dt, game_state, due)
+        else:
+            with self.profiler.span("ai.agents"):
+                self.scheduler.update(dt, game_state)
+
+        # Steer enemies that no agent controls
+        controlled = {agent.entity for agent in self.agents if agent.active}
         for enemy in self.enemies:
-            enemy.render(screen)
+            if enemy not in controlled:
+                enemy.steer(dt, self.world_width, self.world_height)
+
+        # Move every active entity in one vectorized step
+        with self.profiler.span("scene.integrate"):
+            self.store.integrate(dt)
+        self.player.clamp_to_world(self.world_width, self.world_height)
+        self.camera.follow(self.player)
+
+        # Find contacts at the new positions; read them via collisions.contacts()
+        with self.profiler.span("scene.collisions"):
+            self.collisions.update(self.entities)
+
+        # Page chunks in around the player and chase targets, and far ones out
+        if self.streamer is not None:
+            with self.profiler.span("scene.streaming"):
+                self.streamer.update(self)
+
+    def clear(self, screen: pygame.Surface, color: tuple[int, int, int]) -> None:
+        """Erase only the areas entities were drawn at last frame.
+
+        The whole screen is erased once the camera has scrolled.
+        """
+        if self.camera.offset(self.render_alpha) != self._drawn_offset:
+            screen.fill(color)
+            return
+        for rect in self._drawn_rects.values():
+            screen.fill(color, rect)
+
+    def interpolate(self, alpha: float) -> None:
+        """Draw sprites between their previous and current positions."""
+        self.render_alpha = alpha
+
+    def render(self, screen: pygame.Surface) -> list[pygame.Rect] | None:
+        """Render the game scene and return the regions that changed.
+
+        Returns None, a full redraw, when the camera scrolled.
+        """
+        previous = self._drawn_rects
+        drawn = self.draw(screen)
+        offset = self.camera.offset(self.render_alpha)
+        if offset != self._drawn_offset:
+            self._drawn_offset = offset
+            self._drawn_rects = drawn
+            return None
+
+        # Each entity dirties its old and new area; removed entities their old one
+        changed = []
+        for entity, rect in drawn.items():
+            old = previous.pop(entity, None)
+            if old is None or old == rect:
+                changed.append(rect)
+            else:
+                changed.append(rect.union(old))
+        changed.extend(previous.values())
+
+        self._drawn_rects = drawn
+        return changed
+
+    def draw(self, surface: pygame.Surface) -> dict[Entity, pygame.Rect]:
+        """Draw every active entity in the camera's view.
+
+        No dirty regions are tracked, so off-screen renders (e.g.
+        observations) use this without disturbing the next on-screen
+        ``render``. Returns the screen area each entity was drawn to.
+        """
+        drawn: dict[Entity, pygame.Rect] = {}
+
+        camera = self.camera
+        left, top = camera.offset(self.render_alpha)
+        right, bottom = left + camera.width, top + camera.height
+        widths, heights = self.store.width, self.store.height
+
+        # Look up candidates in the spatial hash, widened by the largest
+        # entity and a cell for movement since the hash was rebuilt
+        with self.profiler.span("scene.cull"):
+            if camera.sees_world:
+                candidates = self.entities
+            else:
+                if self._spatial_hash_stale:
+                    self.refresh_spatial_hash()
+                margin = self.spatial_hash.cell_size + max(
+                    self.store.view("width").max(), self.store.view("height").max()
+                )
+                candidates = self.spatial_hash.query_rect(
+                    left - margin, top - margin, right + margin, bottom + margin
+                )
+
+        # Only the candidates' positions are interpolated
+        rows = [entity.row for entity in candidates]
+        xs, ys = self.store.interpolated_positions(self.render_alpha, rows)
+
+        # Entities with cached sprites are submitted as one blit batch; the
+        # rest draw themselves at their current position
+        get_surface = self.render_cache.get
+        batch = []
+        batched = []
+        for entity, row, x, y in zip(candidates, rows, xs, ys):
+            if not entity.active:
+                continue
+            if x >= right or y >= bottom:
+                continue
+            if x + widths[row] <= left or y + heights[row] <= top:
+                continue
+            key = entity.sprite_key()
+            if key is None:
+                if left or top:
+                    rect = entity.render(surface, (left, top))
+                else:
+                    rect = entity.render(surface)
+                drawn[entity] = rect or entity.rect.move(-left, -top)
+            else:
+                batch.append((get_surface(key), (x - left, y - top)))
+                batched.append(entity)
+
+        for entity, rect in zip(batched, surface.blits(batch)):
+            drawn[entity] = rect
+        return drawn
 
 
 class MenuScene(Scene):
     """Main menu scene."""
 
+    state = GAME_STATES["MENU"]
+
     def __init__(self):
         """Initialize the menu scene."""
         super().__init__()
-        self.font = pygame.font.Font(None, 74)
-        self.title_text = self.font.render("Python AI Game", True, (255, 255, 255))
+        self.text_renderer = get_text_renderer()
+        self.title_text = self.text_renderer.render(
+            "Python AI Game", (255, 255, 255), 74
+        )
 
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle pygame events for the menu scene."""
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_RETURN:
-                print("Enter pressed - start game!")
+        # The menu keeps rendering while the game scene is built
+        if (
+            event.type == pygame.KEYDOWN
+            and event.key == pygame.K_RETURN
+            and self.manager is not None
+            and not self.manager.loading
+        ):
+            self.manager.replace_async(GameScene)
 
     def update(self, dt: float) -> None:
         """Update the menu scene."""
@@ -94,3 +517,200 @@ class MenuScene(Scene):
         screen_rect = screen.get_rect()
         title_rect = self.title_text.get_rect(center=screen_rect.center)
         screen.blit(self.title_text, title_rect)
+        if self.manager is not None and self.manager.loading:
+            loading = self.text_renderer.render("Loading...", COLORS["GRAY"], 36)
+            below_title = (title_rect.centerx, title_rect.bottom)
+            screen.blit(loading, loading.get_rect(midtop=below_title))
+
+
+class PauseScene(Scene):
+    """Pause screen drawn over a frozen scene; press P to resume."""
+
+    state = GAME_STATES["PAUSED"]
+
+    def __init__(self, paused: Scene):
+        """Initialize the pause scene over the scene it pauses."""
+        super().__init__()
+        self.paused = paused
+        self.text_renderer = get_text_renderer()
+        self._label_rect: pygame.Rect | None = None
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """Resume on P."""
+        if (
+            event.type == pygame.KEYDOWN
+            and event.key == pygame.K_p
+            and self.manager is not None
+        ):
+            self.manager.pop()
+
+    def update(self, dt: float) -> None:
+        """Keep the paused scene frozen."""
+        pass
+
+    def interpolate(self, alpha: float) -> None:
+        """Keep the paused scene where it was last drawn."""
+
+    def clear(self, screen: pygame.Surface, color: tuple[int, int, int]) -> None:
+        """Erase the paused scene's last frame and the label."""
+        self.paused.clear(screen, color)
+        if self._label_rect is not None:
+            screen.fill(color, self._label_rect)
+
+    def render(self, screen: pygame.Surface) -> list[pygame.Rect] | None:
+        """Render the paused scene with a label over it.
+
+        Returns the paused scene's changed regions plus the label's, or None
+        when the paused scene needs a full redraw.
+        """
+        changed = self.paused.render(screen)
+        label = self.text_renderer.render("Paused", COLORS["WHITE"], 74)
+        self._label_rect = screen.blit(
+            label, label.get_rect(center=screen.get_rect().center)
+        )
+        if changed is None:
+            return None
+        return [*changed, self._label_rect]
+
+
+class SceneManager:
+    """Stack of scenes driven by the engine, with background scene loading.
+
+    The top scene gets every event, update and render. ``push_async`` and
+    ``replace_async`` build the next scene on a worker thread and prefetch
+    its asset manifest while the current scene keeps running; the switch
+    happens on the first frame where both are done, so a slow constructor
+    never stalls the loop. Construction still shares the GIL with the main
+    thread, so it slows frames down a little instead of blocking them.
+    """
+
+    def __init__(self, assets: AssetManager | None = None):
+        """Initialize an empty scene stack."""
+        self.assets = assets
+        self.stack: list[Scene] = []
+        self._loading: Future | None = None
+        self._loaded: Scene | None = None
+        self._replace_loaded = False
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __len__(self) -> int:
+        """Return the number of scenes on the stack."""
+        return len(self.stack)
+
+    @property
+    def current(self) -> Scene | None:
+        """Get the scene on top of the stack."""
+        return self.stack[-1] if self.stack else None
+
+    @property
+    def state(self) -> int | None:
+        """Get the ``GAME_STATES`` entry of the current scene."""
+        current = self.current
+        return current.state if current is not None else None
+
+    @property
+    def loading(self) -> bool:
+        """Check whether a scene is being built or waiting for its assets."""
+        return self._loading is not None or self._loaded is not None
+
+    def push(self, scene: Scene) -> None:
+        """Put a scene on top of the stack, pausing the one below."""
+        scene.manager = self
+        self.stack.append(scene)
+
+    def pop(self) -> Scene:
+        """Remove the top scene and resume the one below."""
+        scene = self.stack.pop()
+        scene.manager = None
+        scene.on_exit()
+        return scene
+
+    def replace(self, scene: Scene) -> None:
+        """Swap the top scene for another."""
+        if self.stack:
+            self.pop()
+        self.push(scene)
+
+    def clear(self) -> None:
+        """Remove every scene."""
+        while self.stack:
+            self.pop()
+
+    def push_async(self, factory: Callable[[], Scene]) -> None:
+        """Build a scene in the background, then push it."""
+        self._load(factory, replace=False)
+
+    def replace_async(self, factory: Callable[[], Scene]) -> None:
+        """Build a scene in the background, then swap it for the top scene."""
+        self._load(factory, replace=True)
+
+    def poll(self) -> bool:
+        """Switch to a background-built scene once it's ready.
+
+        Raises the scene constructor's error if building it failed.
+        Returns whether the scene switched.
+        """
+        if self._loading is not None and self._loading.done():
+            future, self._loading = self._loading, None
+            self._loaded = future.result()
+            if self.assets is not None:
+                self.assets.prefetch(self._loaded.asset_manifest())
+
+        scene = self._loaded
+        if scene is None:
+            return False
+        if self.assets is not None and not self.assets.is_ready(scene.asset_manifest()):
+            return False
+        self._loaded = None
+        if self._replace_loaded:
+            self.replace(scene)
+        else:
+            self.push(scene)
+        return True
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """Pass an event to the current scene."""
+        if self.stack:
+            self.stack[-1].handle_event(event)
+
+    def update(self, dt: float) -> Scene | None:
+        """Switch scenes if a loaded one is ready, then update the current one.
+
+        Returns the scene that was updated, if any.
+        """
+        self.poll()
+        if not self.stack:
+            return None
+        scene = self.stack[-1]
+        scene.update(dt)
+        return scene
+
+    def interpolate(self, alpha: float) -> None:
+        """Pass the render interpolation factor to the current scene."""
+        if self.stack:
+            self.stack[-1].interpolate(alpha)
+
+    def render(self, screen: pygame.Surface) -> list[pygame.Rect] | None:
+        """Render the current scene and return the regions it changed."""
+        if self.stack:
+            return self.stack[-1].render(screen)
+        return None
+
+    def shutdown(self) -> None:
+        """Stop the loader thread, waiting for a scene being built."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._loading = None
+        self._loaded = None
+
+    def _load(self, factory: Callable[[], Scene], replace: bool) -> None:
+        """Start building a scene on the loader thread."""
+        if self.loading:
+            raise RuntimeError("A scene is already loading")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="scene-loader"
+            )
+        self._replace_loaded = replace
+        self._loading = self._executor.submit(factory)
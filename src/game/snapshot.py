@@ -0,0 +1,678 @@
+"""
+Snapshot module - compact binary world snapshots for save, load and rollback.
+
+A snapshot is a small header and JSON table of contents, followed by raw
+8-byte-aligned arrays: the entity store columns, the scene's entity rows,
+types, speeds and colors, and one column per AI agent field. Loading maps
+those arrays straight out of the buffer (or an mmap of the file) with no
+per-value parsing.
+"""
+
+import json
+import math
+import mmap
+import operator
+import random
+import struct
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable
+from itertools import compress, repeat
+from pathlib import Path
+
+import numpy as np
+
+from ai.agents import AIAgent, FlockingAI
+from ai.policy import MLPPolicy, PolicyAI, get_default_policy
+from game.entities import Entity
+from game.scenes import GameScene
+from game.store import EntityStore
+from utils.typenames import resolve_type, type_name
+
+# File header: magic, format version, table-of-contents length
+_HEADER = struct.Struct("<4sHxxI")
+_MAGIC = b"PGWS"
+_VERSION = 2
+_ALIGN = 8
+
+# Default number of snapshots a rollback ring keeps
+DEFAULT_RING_CAPACITY = 16
+
+# Words in a Mersenne Twister state, as returned by random.Random.getstate()
+_RNG_WORDS = 625
+
+
+# Read an entity's row, speed and color through its attributes
+_row_of = operator.attrgetter("row")
+_speed_of = operator.attrgetter("speed")
+_color_of = operator.attrgetter("color")
+
+# Palette index of entities without a color
+_NO_COLOR = 0xFFFF
+
+# Scalar field codes and the dtypes their columns are written as
+_SCALAR_DTYPES = {"?": np.uint8, "q": np.int64, "d": np.float64}
+
+
+def _field_code(values: list) -> str | None:
+    """Choose the column encoding for one agent field, or None if there is none.
+
+    ``?`` bool, ``q`` int, ``d`` float (ints mixed with floats are widened),
+    each prefixed with ``n`` when some values are None; ``e`` entity or None,
+    ``l`` list of entities, ``r`` random generator, ``m`` MLP policy.
+    """
+    kinds = {type(value) for value in values}
+    if kinds == {bool}:
+        return "?"
+    if kinds == {int}:
+        return "q"
+    if kinds and kinds <= {int, float}:
+        return "d"
+    if all(value is None or isinstance(value, Entity) for value in values):
+        return "e"
+    if all(
+        isinstance(value, list) and all(isinstance(v, Entity) for v in value)
+        for value in values
+    ):
+        return "l"
+    if kinds == {random.Random}:
+        return "r"
+    if kinds == {MLPPolicy}:
+        return "m"
+    if type(None) in kinds:
+        code = _field_code([value for value in values if value is not None])
+        if code in _SCALAR_DTYPES:
+            return "n" + code
+    return None
+
+
+def _entity_attributes(
+    entities: list[Entity],
+) -> tuple[np.ndarray, list, np.ndarray]:
+    """Get the entities' speeds (NaN if none), color palette and color indices."""
+    count = len(entities)
+    try:
+        speeds = np.fromiter(map(_speed_of, entities), np.float64, count)
+        colors = list(map(_color_of, entities))
+    except AttributeError:
+        speeds = np.array([getattr(e, "speed", math.nan) for e in entities])
+        colors = [getattr(e, "color", None) for e in entities]
+    palette = [color for color in dict.fromkeys(colors) if color is not None]
+    index = {color: number for number, color in enumerate(palette)}
+    index[None] = _NO_COLOR
+    return (
+        speeds,
+        palette,
+        np.fromiter(map(index.__getitem__, colors), np.uint16, count),
+    )
+
+
+def _set_all(objects: Iterable, name: str, values: Iterable) -> None:
+    """Set one attribute on each object, without a Python-level loop."""
+    deque(map(setattr, objects, repeat(name), values), maxlen=0)
+
+
+def _check_own_store(scene: GameScene) -> None:
+    """Refuse scenes whose store also holds other scenes' rows."""
+    if scene.shares_store:
+        raise ValueError(
+            "Snapshots cover a whole entity store; this scene shares its store "
+            "with other scenes"
+        )
+
+
+def _scene_entities(scene: GameScene) -> list[Entity]:
+    """Get the entities a snapshot records: the scene's, then pooled ones."""
+    return [*scene.entities, *scene.enemy_pool.idle()]
+
+
+class _RandomState(tuple):
+    """A saved random generator state, applied when agents are restored."""
+
+
+class _PolicyTable:
+    """Policies read back from a snapshot, numbered in the order written."""
+
+    def __init__(self, captured: list[MLPPolicy] | None, shared: list[MLPPolicy]):
+        """Initialize from the captured policies, or ones to match weights to."""
+        self._captured = captured
+        self._shared = shared
+        self._policies: list[MLPPolicy] = []
+
+    def __getitem__(self, number: int) -> MLPPolicy:
+        return self._policies[number]
+
+    def add(self, weights: list[np.ndarray], biases: list[np.ndarray]) -> None:
+        """Number the next policy, reusing an existing object where possible."""
+        if self._captured is not None:
+            self._policies.append(self._captured[len(self._policies)])
+            return
+        # Copied, so the policy outlives a closed file mapping
+        policy = MLPPolicy([w.copy() for w in weights], [b.copy() for b in biases])
+        layers = [*policy.weights, *policy.biases]
+        for shared in self._shared:
+            shared_layers = [*shared.weights, *shared.biases]
+            if len(shared_layers) == len(layers) and all(
+                np.array_equal(a, b) for a, b in zip(shared_layers, layers)
+            ):
+                policy = shared
+                break
+        self._policies.append(policy)
+
+
+class _Writer:
+    """Collects 8-byte-aligned array chunks."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def add(self, data: bytes) -> None:
+        self.chunks.append(data)
+        padding = -len(data) % _ALIGN
+        if padding:
+            self.chunks.append(bytes(padding))
+
+
+class _Reader:
+    """Reads the arrays of a snapshot in the order they were written."""
+
+    def __init__(self, buffer: memoryview, offset: int):
+        self.buffer = buffer
+        self.offset = offset
+
+    def take(self, size: int) -> memoryview:
+        data = self.buffer[self.offset : self.offset + size]
+        if len(data) != size:
+            raise ValueError("Snapshot is truncated")
+        self.offset += size + (-size % _ALIGN)
+        return data
+
+    def array(self, dtype: type, count: int) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.take(dtype.itemsize * count), dtype)
+
+
+class WorldSnapshot:
+    """Saved state of a GameScene: its store, entities and AI agents.
+
+    Only entities in the scene (the player, enemies and the enemy pool's
+    idle entities) are recorded, and agent fields that reference entities
+    must point at those. Scheduler timings are saved so time-sliced agents
+    resume on the same frames; the agent pools are emptied on restore.
+    A snapshot covers the scene's whole store, so scenes sharing a store
+    with others (as in ``GameEnvBatch``) can't be captured or restored.
+    """
+
+    def __init__(
+        self,
+        data: bytes | memoryview | mmap.mmap,
+        entities: list[Entity] | None = None,
+        agents: list[AIAgent] | None = None,
+    ):
+        """Wrap snapshot data, optionally with the objects it was taken from.
+
+        Keeping the objects lets ``restore`` reuse them, so references held
+        elsewhere stay valid across a rollback.
+        """
+        self.data = data
+        self._entities = entities
+        self._agents = agents
+        self._table: tuple | None = None
+        self._policies: list[MLPPolicy] | None = None
+
+    def __len__(self) -> int:
+        """Return the size of the snapshot in bytes."""
+        return len(self.data)
+
+    def __enter__(self) -> "WorldSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file of a loaded snapshot; in-memory data is left alone."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    @classmethod
+    def capture(
+        cls, scene: GameScene, previous: "WorldSnapshot | None" = None
+    ) -> "WorldSnapshot":
+        """Take a snapshot of a scene.
+
+        When the scene still has exactly the entities of a ``previous``
+        snapshot, that snapshot's entity table is reused instead of walking
+        every entity again.
+        """
+        _check_own_store(scene)
+        store = scene.store
+        entities = _scene_entities(scene)
+        agents = list(scene.agents)
+
+        if previous is not None and previous._entities == entities:
+            table = previous._table
+        else:
+            kinds = list(dict.fromkeys(map(type, entities)))
+            kind_index = {kind: index for index, kind in enumerate(kinds)}
+            count = len(entities)
+            rows = np.fromiter(map(_row_of, entities), np.int64, count)
+            entity_types = np.fromiter(
+                map(kind_index.__getitem__, map(type, entities)), np.uint16, count
+            )
+            table = (kinds, rows.tobytes(), entity_types.tobytes(), None)
+        kinds, rows_bytes, types_bytes, known_rows = table
+
+        types = [type_name(kind) for kind in kinds]
+        type_index = {kind: index for index, kind in enumerate(kinds)}
+
+        def index_of(kind: type) -> int:
+            if kind not in type_index:
+                type_index[kind] = len(types)
+                types.append(type_name(kind))
+            return type_index[kind]
+
+        # Agents are grouped by class and field names; each group is columnar
+        groups: dict[tuple[type, tuple[str, ...]], list[int]] = {}
+        for position, agent in enumerate(agents):
+            key = (type(agent), tuple(vars(agent)))
+            groups.setdefault(key, []).append(position)
+        timings = np.full((3, len(agents)), np.nan)
+        scheduled = scene.scheduler.timings()
+        for position, agent in enumerate(agents):
+            timing = scheduled.get(agent)
+            if timing is not None:
+                timings[:, position] = timing
+        if agents and known_rows is None:
+            known_rows = set(np.frombuffer(rows_bytes, np.int64).tolist())
+            table = (kinds, rows_bytes, types_bytes, known_rows)
+
+        writer = _Writer()
+        for field in EntityStore.FLOAT_FIELDS:
+            writer.add(store.view(field).tobytes())
+        writer.add(store.view("active").tobytes())
+        writer.add(np.array(store.free_rows, np.int64).tobytes())
+        writer.add(rows_bytes)
+        writer.add(types_bytes)
+        speeds, palette, colors = _entity_attributes(entities)
+        writer.add(speeds.tobytes())
+        writer.add(colors.tobytes())
+
+        group_meta = []
+        group_chunks = _Writer()
+        policies: list[MLPPolicy] = []
+        for (kind, names), positions in groups.items():
+            members = [agents[position] for position in positions]
+            fields = []
+            for name in names:
+                values = [vars(agent)[name] for agent in members]
+                code = _field_code(values)
+                if code is None:
+                    kinds = ", ".join(sorted({type(v).__name__ for v in values}))
+                    raise ValueError(
+                        f"Can't snapshot {kind.__name__}.{name} holding {kinds}"
+                    )
+                extra = cls._write_field(
+                    group_chunks, code, values, known_rows, policies
+                )
+                fields.append([name, code, extra])
+            group_meta.append(
+                {"type": index_of(kind), "positions": len(positions), "fields": fields}
+            )
+            group_chunks.add(np.array(positions, np.int64).tobytes())
+        writer.add(timings.tobytes())
+        writer.chunks.extend(group_chunks.chunks)
+
+        contents = {
+            "capacity": store.capacity,
+            "free": len(store.free_rows),
+            "entities": len(entities),
+            "pooled": len(scene.enemy_pool),
+            "agents": len(agents),
+            "types": types,
+            "palette": [list(color) for color in palette],
+            "groups": group_meta,
+            "scheduler": [scene.scheduler.time, scene.scheduler.cursor],
+        }
+        toc = json.dumps(contents, separators=(",", ":")).encode()
+        toc += b" " * (-(_HEADER.size + len(toc)) % _ALIGN)
+        header = _HEADER.pack(_MAGIC, _VERSION, len(toc))
+        data = b"".join([header, toc, *writer.chunks])
+        snapshot = cls(data, entities, agents)
+        snapshot._table = table
+        snapshot._policies = policies
+        return snapshot
+
+    @staticmethod
+    def _write_field(
+        writer: _Writer,
+        code: str,
+        values: list,
+        known_rows: set[int],
+        policies: list[MLPPolicy],
+    ) -> int | list:
+        """Write one agent field column; returns its extra length or layout.
+
+        Policies are written once per snapshot; ``policies`` collects the
+        ones written so far.
+        """
+
+        def row_of(entity: Entity | None) -> int:
+            if entity is None:
+                return -1
+            if entity.row not in known_rows:
+                raise ValueError("Agent refers to an entity outside the scene")
+            return entity.row
+
+        if code[0] == "n":
+            # Nullable scalars: a None mask, then the values with None as 0
+            writer.add(np.array([v is None for v in values], np.uint8).tobytes())
+            code = code[1:]
+            values = [0 if value is None else value for value in values]
+        if code in _SCALAR_DTYPES:
+            writer.add(np.array(values, _SCALAR_DTYPES[code]).tobytes())
+        elif code == "e":
+            writer.add(np.array([row_of(v) for v in values], np.int64).tobytes())
+        elif code == "l":
+            lengths = [len(value) for value in values]
+            flat = [row_of(entity) for value in values for entity in value]
+            writer.add(np.array(lengths, np.int64).tobytes())
+            writer.add(np.array(flat, np.int64).tobytes())
+            return len(flat)
+        elif code == "r":
+            states = [rng.getstate() for rng in values]
+            words = array("I")
+            for state in states:
+                words.extend(state[1])
+            gauss = [np.nan if state[2] is None else state[2] for state in states]
+            writer.add(words.tobytes())
+            writer.add(np.array(gauss, np.float64).tobytes())
+        elif code == "m":
+            # Policy numbers, then the layers of policies not written before
+            numbers = {id(policy): number for number, policy in enumerate(policies)}
+            first = len(policies)
+            for policy in values:
+                if id(policy) not in numbers:
+                    numbers[id(policy)] = len(policies)
+                    policies.append(policy)
+            writer.add(np.array([numbers[id(p)] for p in values], np.int64).tobytes())
+            for policy in policies[first:]:
+                for weight, bias in zip(policy.weights, policy.biases):
+                    writer.add(weight.tobytes())
+                    writer.add(bias.tobytes())
+            return [
+                [policy.input_size, *(weight.shape[1] for weight in policy.weights)]
+                for policy in policies[first:]
+            ]
+        return 0
+
+    def restore(self, scene: GameScene) -> None:
+        """Put a scene back into the snapshot's state.
+
+        The scene's store is overwritten in place. Entities and agents from
+        the scene (or the capture) are reused where they match, and any
+        other entity objects on the store become stale. The spatial hash is
+        left for the scene's next update or draw to refresh.
+        """
+        if scene.parallel is not None:
+            raise RuntimeError("Stop parallel AI before restoring a snapshot")
+        _check_own_store(scene)
+        buffer = memoryview(self.data)
+        magic, version, toc_length = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError("Not a world snapshot")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        contents = json.loads(bytes(buffer[_HEADER.size : _HEADER.size + toc_length]))
+        reader = _Reader(buffer, _HEADER.size + toc_length)
+        capacity = contents["capacity"]
+        types = [resolve_type(name, (Entity, AIAgent)) for name in contents["types"]]
+
+        columns = {
+            field: reader.take(8 * capacity) for field in EntityStore.FLOAT_FIELDS
+        }
+        columns["active"] = reader.take(capacity)
+        free_rows = reader.array(np.int64, contents["free"]).tolist()
+        rows = reader.array(np.int64, contents["entities"])
+        entity_types = reader.array(np.uint16, contents["entities"])
+        speeds = reader.array(np.float64, contents["entities"])
+        colors = reader.array(np.uint16, contents["entities"])
+        if not all(
+            issubclass(types[number], Entity)
+            for number in np.unique(entity_types).tolist()
+        ) or not all(
+            issubclass(types[group["type"]], AIAgent) for group in contents["groups"]
+        ):
+            raise ValueError("Snapshot uses a type in the wrong place")
+
+        store = scene.store
+        store.restore(columns, free_rows)
+        entities = self._restore_entities(scene, rows, entity_types, types)
+        has_speed = ~np.isnan(speeds)
+        _set_all(compress(entities, has_speed), "speed", speeds[has_speed].tolist())
+        palette = [tuple(color) for color in contents["palette"]]
+        has_color = colors != _NO_COLOR
+        _set_all(
+            compress(entities, has_color),
+            "color",
+            map(palette.__getitem__, colors[has_color].tolist()),
+        )
+        in_scene = len(entities) - contents["pooled"]
+        scene.player, scene.enemies = entities[0], entities[1:in_scene]
+        scene.enemy_pool.refill(entities[in_scene:])
+        for pool in scene.agent_pools.values():
+            pool.clear()
+
+        # Agent fields hold rows; map them back to entities without a dict
+        entity_index = np.full(capacity + 1, -1, np.int64)
+        entity_index[rows] = np.arange(len(rows))
+
+        def entity_at(saved_rows: np.ndarray) -> list[Entity | None]:
+            # Row -1 (None) lands on the extra last slot, which stays -1
+            return [
+                entities[index] if index >= 0 else None
+                for index in entity_index[saved_rows].tolist()
+            ]
+
+        policies = self._known_policies(scene)
+        agent_count = contents["agents"]
+        timings = reader.array(np.float64, 3 * agent_count).reshape(3, agent_count)
+        agents: list[AIAgent | None] = [None] * agent_count
+        for group in contents["groups"]:
+            kind = types[group["type"]]
+            field_values = {
+                name: self._read_field(
+                    reader, code, extra, group["positions"], entity_at, policies
+                )
+                for name, code, extra in group["fields"]
+            }
+            positions = reader.array(np.int64, group["positions"]).tolist()
+            for index, position in enumerate(positions):
+                agent = self._reusable_agent(scene, position, kind)
+                state = vars(agent)
+                for name, values in field_values.items():
+                    value = values[index]
+                    if isinstance(value, _RandomState):
+                        # Rewind the agent's own generator when it has one
+                        rng = state.get(name)
+                        if not isinstance(rng, random.Random):
+                            rng = random.Random()
+                        rng.setstate(value)
+                        value = rng
+                    state[name] = value
+                agents[position] = agent
+
+        scene.agents = agents
+        scene.flocking.agents = [a for a in agents if isinstance(a, FlockingAI)]
+        scene.policies.agents = [a for a in agents if isinstance(a, PolicyAI)]
+        time, cursor = contents["scheduler"]
+        scheduled = np.flatnonzero(~np.isnan(timings[0])).tolist()
+        scene.scheduler.restore(
+            time,
+            cursor,
+            [
+                (agents[position], *timing)
+                for position, timing in zip(scheduled, timings.T[scheduled].tolist())
+            ],
+        )
+        scene.collisions.clear()
+        scene.invalidate_spatial_hash()
+        scene.camera.follow(scene.player)
+        scene.camera.save_position()
+
+    def _restore_entities(
+        self,
+        scene: GameScene,
+        rows: np.ndarray,
+        entity_types: np.ndarray,
+        types: list[type],
+    ) -> list[Entity]:
+        """Get entity objects for the saved rows, reusing existing ones."""
+        current = _scene_entities(scene)
+        if self._entities is not None and current == self._entities:
+            # Same objects as at capture time: nothing was added or removed
+            return list(current)
+
+        # Rows may have changed hands, so every existing entity goes stale
+        # and the ones that are reused take their rows back
+        store = scene.store
+        store.invalidate_entities()
+        candidates = self._entities if self._entities is not None else current
+        by_row = {entity.row: entity for entity in candidates if entity.store is store}
+        entities = []
+        for row, type_number in zip(rows.tolist(), entity_types.tolist()):
+            kind = types[type_number]
+            entity = by_row.get(row)
+            if entity is not None and type(entity) is kind:
+                entity.rebind(row)
+            else:
+                entity = kind.from_row(store, row)
+            entities.append(entity)
+        return entities
+
+    def _known_policies(self, scene: GameScene) -> _PolicyTable:
+        """Get the table restored agents take their policy objects from.
+
+        A snapshot still holding its captured policies hands back exactly
+        those; one loaded from a file rebuilds them, reusing the default
+        policy and the scene's own where the weights match.
+        """
+        if self._policies is not None:
+            return _PolicyTable(self._policies, [])
+        shared = [get_default_policy()]
+        shared.extend(agent.policy for agent in scene.policies.agents)
+        return _PolicyTable(None, list(dict.fromkeys(shared)))
+
+    def _reusable_agent(self, scene: GameScene, position: int, kind: type) -> AIAgent:
+        """Get the agent object to restore at a position in the agent list."""
+        pool = self._agents if self._agents is not None else scene.agents
+        if position < len(pool) and type(pool[position]) is kind:
+            return pool[position]
+        return kind.__new__(kind)
+
+    @staticmethod
+    def _read_field(
+        reader: _Reader,
+        code: str,
+        extra: int,
+        count: int,
+        entity_at: Callable[[np.ndarray], list[Entity | None]],
+        policies: _PolicyTable,
+    ) -> list:
+        """Read one agent field column back into Python values.
+
+        Policies read here are added to ``policies``, which the policy
+        numbers of later columns index.
+        """
+        if code[0] == "n":
+            missing = reader.array(np.uint8, count).tolist()
+            values = WorldSnapshot._read_field(
+                reader, code[1:], extra, count, entity_at, policies
+            )
+            return [None if none else v for none, v in zip(missing, values)]
+        if code == "?":
+            return reader.array(np.uint8, count).astype(bool).tolist()
+        if code == "q":
+            return reader.array(np.int64, count).tolist()
+        if code == "d":
+            return reader.array(np.float64, count).tolist()
+        if code == "e":
+            return entity_at(reader.array(np.int64, count))
+        if code == "l":
+            lengths = reader.array(np.int64, count).tolist()
+            flat = entity_at(reader.array(np.int64, extra))
+            values, start = [], 0
+            for length in lengths:
+                values.append(flat[start : start + length])
+                start += length
+            return values
+        if code == "r":
+            words = array("I")
+            words.frombytes(reader.take(4 * count * _RNG_WORDS))
+            gauss = reader.array(np.float64, count).tolist()
+            values = []
+            for index, next_gauss in enumerate(gauss):
+                state = tuple(words[index * _RNG_WORDS : (index + 1) * _RNG_WORDS])
+                next_gauss = None if math.isnan(next_gauss) else next_gauss
+                values.append(_RandomState((3, state, next_gauss)))
+            return values
+        if code == "m":
+            numbers = reader.array(np.int64, count).tolist()
+            for sizes in extra:
+                weights, biases = [], []
+                for inputs, outputs in zip(sizes, sizes[1:]):
+                    weight = reader.array(np.float32, inputs * outputs)
+                    weights.append(weight.reshape(inputs, outputs))
+                    biases.append(reader.array(np.float32, outputs))
+                policies.add(weights, biases)
+            return [policies[number] for number in numbers]
+        raise ValueError(f"Unknown snapshot field code: {code}")
+
+    def save(self, path: str | Path) -> None:
+        """Write the snapshot to a file."""
+        Path(path).write_bytes(self.data)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "WorldSnapshot":
+        """Map a snapshot file into memory without reading it up front."""
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class SnapshotRing:
+    """Keeps the most recent in-memory snapshots for rolling back."""
+
+    def __init__(self, capacity: int = DEFAULT_RING_CAPACITY):
+        """Initialize an empty ring."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._snapshots: deque[tuple[int, WorldSnapshot]] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        """Return the number of snapshots held."""
+        return len(self._snapshots)
+
+    def frames(self) -> list[int]:
+        """Get the frames snapshots were taken at, oldest first."""
+        return [frame for frame, _ in self._snapshots]
+
+    def capture(self, scene: GameScene, frame: int) -> WorldSnapshot:
+        """Snapshot a scene at a frame, dropping the oldest if full."""
+        previous = self._snapshots[-1][1] if self._snapshots else None
+        snapshot = WorldSnapshot.capture(scene, previous)
+        self._snapshots.append((frame, snapshot))
+        return snapshot
+
+    def rollback(self, scene: GameScene, frame: int) -> int:
+        """Restore the latest snapshot taken at or before a frame.
+
+        Newer snapshots are discarded. Returns the frame restored to.
+        """
+        while self._snapshots and self._snapshots[-1][0] > frame:
+            self._snapshots.pop()
+        if not self._snapshots:
+            raise KeyError(f"No snapshot at or before frame {frame}")
+        saved_frame, snapshot = self._snapshots[-1]
+        snapshot.restore(scene)
+        return saved_frame
@@ -0,0 +1,248 @@
+"""
+Spatial partitioning module - uniform-grid spatial hash for entity queries.
+"""
+
+import operator
+from collections import defaultdict
+
+import numpy as np
+
+from game.entities import Entity
+from game.store import EntityStore
+from utils.constants import FLOCKING_RADIUS
+
+_row_of = operator.attrgetter("row")
+_store_of = operator.attrgetter("store")
+
+
+class SpatialHash:
+    """Uniform grid that buckets entities by cell for fast radius queries."""
+
+    def __init__(self, cell_size: float = FLOCKING_RADIUS):
+        """Initialize the spatial hash."""
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.cells: defaultdict[tuple[int, int], list[Entity]] = defaultdict(list)
+        self._entity_cells: dict[Entity, tuple[int, int]] = {}
+        # Per-row mirror of the hash for entities on one store, so a rebuild
+        # only has to move the entities whose cell changed
+        self._store: EntityStore | None = None
+        self._members = np.empty(0, dtype=object)
+        self._member_ids = np.empty(0, dtype=np.intp)
+        self._row_cells = np.empty((0, 2), dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Return the number of entities in the hash."""
+        return len(self._entity_cells)
+
+    def cell_of(self, x: float, y: float) -> tuple[int, int]:
+        """Get the grid cell containing a world position."""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self) -> None:
+        """Remove all entities from the hash."""
+        self.cells.clear()
+        self._entity_cells.clear()
+        self._store = None
+        self._members = np.empty(0, dtype=object)
+        self._member_ids = np.empty(0, dtype=np.intp)
+        self._row_cells = np.empty((0, 2), dtype=np.int64)
+
+    def _grow(self, rows: int) -> None:
+        """Make the per-row mirror cover at least ``rows`` rows."""
+        old = len(self._members)
+        if rows <= old:
+            return
+        rows = max(rows, old * 2)
+        members = np.empty(rows, dtype=object)
+        members[:old] = self._members
+        member_ids = np.zeros(rows, dtype=np.intp)
+        member_ids[:old] = self._member_ids
+        row_cells = np.zeros((rows, 2), dtype=np.int64)
+        row_cells[:old] = self._row_cells
+        self._members, self._member_ids = members, member_ids
+        self._row_cells = row_cells
+
+    def _track(self, entity: Entity, cell: tuple[int, int] | None) -> None:
+        """Record an insert (or a removal, for no ``cell``) in the mirror."""
+        if self._store is None:
+            return
+        if getattr(entity, "store", None) is not self._store:
+            # The mirror can no longer describe the hash; start over next time
+            self._store = None
+            return
+        row = entity.row
+        if cell is None:
+            if row < len(self._members) and self._members[row] is entity:
+                self._members[row] = None
+                self._member_ids[row] = 0
+        else:
+            self._grow(row + 1)
+            if self._members[row] is not None:
+                self._store = None
+            else:
+                self._members[row] = entity
+                self._member_ids[row] = id(entity)
+                self._row_cells[row] = cell
+
+    def insert(self, entity: Entity) -> None:
+        """Insert an entity into the cell containing its position."""
+        cell = self.cell_of(entity.x, entity.y)
+        self.cells[cell].append(entity)
+        self._entity_cells[entity] = cell
+        self._track(entity, cell)
+
+    def remove(self, entity: Entity) -> None:
+        """Remove an entity from the hash."""
+        cell = self._entity_cells.pop(entity, None)
+        if cell is None:
+            return
+        self._track(entity, None)
+        bucket = self.cells[cell]
+        bucket.remove(entity)
+        if not bucket:
+            del self.cells[cell]
+
+    def update(self, entity: Entity) -> None:
+        """Move an entity to a new cell if it crossed a cell boundary."""
+        old_cell = self._entity_cells.get(entity)
+        if old_cell is None:
+            self.insert(entity)
+        elif old_cell != self.cell_of(entity.x, entity.y):
+            self.remove(entity)
+            self.insert(entity)
+
+    def rebuild(self, entities: list[Entity], store: EntityStore | None = None) -> None:
+        """Rebuild the hash with the given active entities.
+
+        When every entity lives on one store (``store``, if given) the cells
+        come from its position columns in one pass and only entities whose
+        cell, row or activity changed since the last rebuild are moved, so a
+        mostly static world costs little more than the column reads.
+        Entities spread over several stores are bucketed one by one.
+        """
+        if store is None and entities:
+            try:
+                stores = set(map(_store_of, entities))
+            except AttributeError:  # Entity-like views without a store
+                stores = set()
+            if len(stores) == 1:
+                store = stores.pop()
+        if store is None:
+            self.clear()
+            self._rebuild_each(entities)
+            return
+        if store is not self._store:
+            self.clear()
+            self._store = store
+
+        count = len(entities)
+        rows = np.fromiter(map(_row_of, entities), np.intp, count)
+        ids = np.fromiter(map(id, entities), np.intp, count)
+        live = np.flatnonzero(store.gather("active", rows))
+        live_rows = rows[live]
+
+        # Lay the wanted state out by row, then diff it against the mirror
+        self._grow(store.capacity)
+        member_ids = np.zeros_like(self._member_ids)
+        member_ids[live_rows] = ids[live]
+        positions = np.zeros_like(member_ids)
+        positions[live_rows] = live
+        row_cells = self._row_cells.copy()
+        size = self.cell_size
+        row_cells[live_rows, 0] = store.gather("x", live_rows) // size
+        row_cells[live_rows, 1] = store.gather("y", live_rows) // size
+        changed = np.flatnonzero(
+            (member_ids != self._member_ids)
+            | (row_cells != self._row_cells).any(axis=1)
+        )
+
+        cells = self.cells
+        entity_cells = self._entity_cells
+        members = self._members
+        for entity in members[changed].tolist():
+            if entity is None:
+                continue
+            cell = entity_cells.pop(entity)
+            bucket = cells[cell]
+            bucket.remove(entity)
+            if not bucket:
+                del cells[cell]
+        for row, member_id, position, (cx, cy) in zip(
+            changed.tolist(),
+            member_ids[changed].tolist(),
+            positions[changed].tolist(),
+            row_cells[changed].tolist(),
+        ):
+            if not member_id:
+                members[row] = None
+                continue
+            entity = entities[position]
+            members[row] = entity
+            cell = (cx, cy)
+            cells[cell].append(entity)
+            entity_cells[entity] = cell
+        self._member_ids, self._row_cells = member_ids, row_cells
+
+    def _rebuild_each(self, entities: list[Entity]) -> None:
+        """Bucket the active entities one at a time."""
+        size = self.cell_size
+        cells = self.cells
+        entity_cells = self._entity_cells
+        for entity in entities:
+            if not entity.active:
+                continue
+            cell = (int(entity.x // size), int(entity.y // size))
+            cells[cell].append(entity)
+            entity_cells[entity] = cell
+
+    def query(self, x: float, y: float, radius: float) -> list[Entity]:
+        """Get candidate entities in all cells overlapping a circle.
+
+        The result is a broadphase superset; callers still need an exact
+        distance test against ``radius``.
+        """
+        size = self.cell_size
+        min_cx, min_cy = int((x - radius) // size), int((y - radius) // size)
+        max_cx, max_cy = int((x + radius) // size), int((y + radius) // size)
+
+        cells = self.cells
+        candidates: list[Entity] = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
+
+    def query_rect(
+        self, left: float, top: float, right: float, bottom: float
+    ) -> list[Entity]:
+        """Get the entities bucketed in every cell overlapping a rectangle.
+
+        Entities are bucketed by their top-left corner, so callers looking
+        for boxes that overlap the rectangle widen it up and left by the
+        largest entity size, then test the candidates exactly.
+        """
+        size = self.cell_size
+        min_cx, min_cy = int(left // size), int(top // size)
+        max_cx, max_cy = int(right // size), int(bottom // size)
+
+        # Walk the occupied cells instead when the rectangle spans more cells
+        cells = self.cells
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            return [
+                entity
+                for (cx, cy), bucket in cells.items()
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+                for entity in bucket
+            ]
+
+        candidates: list[Entity] = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
@@ -0,0 +1,253 @@
+"""
+Entity store module - structure-of-arrays storage for entity state.
+"""
+
+import zlib
+from array import array
+
+import numpy as np
+
+# Rows reserved by the first allocation
+_MIN_RESERVED = 64
+
+
+class EntityStore:
+    """Packed typed arrays holding the state of many entities.
+
+    Each entity owns one row. Rows of released entities are recycled, and
+    bulk operations run over NumPy views of the arrays without copying.
+    Columns are reserved ahead of the rows in use and grow by doubling into
+    new arrays, so a view that is still alive never blocks an allocation.
+    """
+
+    FLOAT_FIELDS = ("x", "y", "width", "height", "velocity_x", "velocity_y")
+
+    def __init__(self):
+        """Initialize an empty entity store."""
+        self.x = array("d")
+        self.y = array("d")
+        self.width = array("d")
+        self.height = array("d")
+        self.velocity_x = array("d")
+        self.velocity_y = array("d")
+        self.active = array("B")
+        # Positions as of the previous simulation step, for interpolation
+        self.previous_x = array("d")
+        self.previous_y = array("d")
+        self._rows = 0
+        self._free_rows: list[int] = []
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        """Return the number of rows in use."""
+        return self._rows - len(self._free_rows)
+
+    @property
+    def capacity(self) -> int:
+        """Get the number of allocated rows, including free ones."""
+        return self._rows
+
+    @property
+    def free_rows(self) -> list[int]:
+        """Get the released rows waiting for reuse, next to be reused last."""
+        return list(self._free_rows)
+
+    def _columns(self) -> tuple[str, ...]:
+        """Get the names of every column, including the previous positions."""
+        return (*self.FLOAT_FIELDS, "active", "previous_x", "previous_y")
+
+    def _reserve(self, rows: int) -> None:
+        """Make every column hold at least ``rows`` rows.
+
+        Each column is copied into a new, larger array rather than resized,
+        since arrays exported to NumPy views can't be resized in place.
+        """
+        reserved = len(self.active)
+        if rows <= reserved:
+            return
+        reserved = max(reserved * 2, rows, _MIN_RESERVED)
+        for name in self._columns():
+            column = getattr(self, name)
+            grown = array(column.typecode, column)
+            grown.frombytes(bytes((reserved - len(column)) * column.itemsize))
+            setattr(self, name, grown)
+
+    def allocate(self, x: float, y: float, width: float, height: float) -> int:
+        """Claim a row for a new entity and return its index."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self._rows
+            self._reserve(row + 1)
+            self._rows += 1
+        self.x[row] = x
+        self.y[row] = y
+        self.width[row] = width
+        self.height[row] = height
+        self.velocity_x[row] = 0.0
+        self.velocity_y[row] = 0.0
+        self.active[row] = 1
+        self.snap(row)
+        return row
+
+    def allocate_many(
+        self,
+        x: np.ndarray | float,
+        y: np.ndarray | float,
+        width: np.ndarray | float,
+        height: np.ndarray | float,
+    ) -> np.ndarray:
+        """Claim rows for many entities at once and return their indices.
+
+        The arguments broadcast to one length. No ``Entity`` views are made,
+        so each row costs only its columns. Free the rows with
+        ``release_many``, except any bound to a view with ``from_row``: the
+        view owns its row from then on.
+        """
+        x, y, width, height = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, np.float64)) for v in (x, y, width, height))
+        )
+        count = len(x)
+        reused = min(count, len(self._free_rows))
+        rows = np.empty(count, np.intp)
+        if reused:
+            # Free rows are reused from the end, as allocate does
+            rows[:reused] = self._free_rows[: -reused - 1 : -1]
+            del self._free_rows[-reused:]
+        start = self._rows
+        self._reserve(start + count - reused)
+        rows[reused:] = np.arange(start, start + count - reused)
+        self._rows = start + count - reused
+
+        for field, values in (("x", x), ("y", y), ("width", width), ("height", height)):
+            self.view(field)[rows] = values
+        self.view("velocity_x")[rows] = 0.0
+        self.view("velocity_y")[rows] = 0.0
+        self.view("active")[rows] = 1
+        np.frombuffer(self.previous_x, np.float64)[rows] = x
+        np.frombuffer(self.previous_y, np.float64)[rows] = y
+        return rows
+
+    def release(self, row: int) -> None:
+        """Return a row to the store so it can be reused."""
+        self.active[row] = 0
+        self._free_rows.append(row)
+
+    def release_many(self, rows: np.ndarray) -> None:
+        """Return rows made by ``allocate_many`` to the store."""
+        rows = np.asarray(rows, np.intp)
+        self.view("active")[rows] = 0
+        self._free_rows.extend(rows.tolist())
+
+    def view(self, field: str) -> np.ndarray:
+        """Get a zero-copy NumPy view of one field's rows.
+
+        A view doesn't follow the store when it grows, so take a new one
+        after allocating rather than keeping it across frames.
+        """
+        if field == "active":
+            column, dtype = self.active, np.uint8
+        elif field in self.FLOAT_FIELDS:
+            column, dtype = getattr(self, field), np.float64
+        else:
+            raise KeyError(f"Unknown entity field: {field}")
+        if not column:
+            return np.empty(0, dtype)
+        return np.frombuffer(column, dtype=dtype)[: self._rows]
+
+    def gather(self, field: str, rows: np.ndarray) -> np.ndarray:
+        """Copy one field for the given rows into a new array."""
+        return self.view(field)[rows]
+
+    def restore(self, columns: dict[str, bytes], free_rows: list[int]) -> None:
+        """Overwrite every row with raw column data, e.g. from a snapshot.
+
+        ``columns`` maps each float field and ``active`` to its bytes in
+        native layout, which are copied into the store's own columns.
+        Existing entities keep their rows; call ``invalidate_entities`` if
+        the rows now belong to someone else.
+        """
+        rows = len(columns["active"])
+        self._reserve(rows)
+        for field in (*self.FLOAT_FIELDS, "active"):
+            memoryview(getattr(self, field)).cast("B")[: len(columns[field])] = columns[
+                field
+            ]
+        self._rows = rows
+        self._free_rows = list(free_rows)
+        self.save_positions()
+
+    def save_positions(self) -> None:
+        """Remember every row's position as the previous step's."""
+        rows = self._rows
+        if rows:
+            previous_x = np.frombuffer(self.previous_x, dtype=np.float64)
+            previous_y = np.frombuffer(self.previous_y, dtype=np.float64)
+            previous_x[:rows] = self.view("x")
+            previous_y[:rows] = self.view("y")
+
+    def snap(self, row: int) -> None:
+        """Make a row's previous position its current one, e.g. on a teleport."""
+        self.previous_x[row] = self.x[row]
+        self.previous_y[row] = self.y[row]
+
+    def interpolated_positions(
+        self, alpha: float, rows: np.ndarray | list[int] | None = None
+    ) -> tuple[list[float], list[float]]:
+        """Get row positions blended between the last two steps.
+
+        ``alpha`` 0 is the previous step and 1 the current one. Rows added
+        since the previous step are at their current position. ``rows``
+        picks the rows to blend, in order; by default every row is.
+        """
+        count = self._rows
+        if not count:
+            return [], []
+        x, y = self.view("x"), self.view("y")
+        previous_x = np.frombuffer(self.previous_x, dtype=np.float64)[:count]
+        previous_y = np.frombuffer(self.previous_y, dtype=np.float64)[:count]
+        if rows is None:
+            x, y = x.copy(), y.copy()
+        else:
+            rows = np.asarray(rows, np.intp)
+            x, y = x[rows], y[rows]
+            previous_x, previous_y = previous_x[rows], previous_y[rows]
+        if alpha < 1.0:
+            x -= (x - previous_x) * (1.0 - alpha)
+            y -= (y - previous_y) * (1.0 - alpha)
+        return x.tolist(), y.tolist()
+
+    def invalidate_entities(self) -> None:
+        """Make every entity bound to the store stale.
+
+        Stale entities no longer release their row when collected, so rows
+        handed to new owners can't be freed by old ones.
+        """
+        self.epoch += 1
+
+    def checksum(self) -> int:
+        """Get a CRC-32 of every row's position, velocity and active flag.
+
+        Two stores only match if their values are bit-for-bit identical.
+        """
+        crc = 0
+        for field in ("x", "y", "velocity_x", "velocity_y", "active"):
+            crc = zlib.crc32(self.view(field), crc)
+        return crc
+
+    def integrate(self, dt: float) -> None:
+        """Move every active row by its velocity in one vectorized step."""
+        if not self._rows:
+            return
+        active = self.view("active")
+        x, y = self.view("x"), self.view("y")
+        x += self.view("velocity_x") * dt * active
+        y += self.view("velocity_y") * dt * active
+
+
+_default_store = EntityStore()
+
+
+def get_default_store() -> EntityStore:
+    """Get the store used by entities created without an explicit one."""
+    return _default_store
@@ -0,0 +1,508 @@
+"""
+Streaming module - chunked worlds paged between a memory-mapped file and a scene.
+
+A chunk file splits the world into square chunks and gives each one a
+fixed-size slot: a count, up to ``capacity`` packed enemy records and a grid
+of terrain tiles. Slots are found by offset through an mmap, so the file of
+an enormous map is created sparse and only the pages of chunks in use are
+ever touched. ``WorldStreamer`` keeps the chunks around the player and every
+chase target loaded into a ``GameScene``, reading and writing their slots on
+a background thread.
+"""
+
+import json
+import math
+import mmap
+import struct
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ai.agents import AIAgent, ChasingAI
+from utils.constants import CHUNK_CAPACITY, CHUNK_SIZE, NAV_CELL_SIZE, STREAM_RADIUS
+from utils.typenames import resolve_type, type_name
+
+if TYPE_CHECKING:
+    from game.scenes import GameScene
+
+# File header: magic, format version, table-of-contents length
+_HEADER = struct.Struct("<4sHxxI")
+_MAGIC = b"PGWC"
+_VERSION = 1
+# Space for the header and table of contents, so agent types can be added
+_HEADER_BYTES = 4096
+_ALIGN = 8
+
+# One stored enemy. ``agent`` indexes the file's agent types (-1 for none)
+# and a NaN ``speed`` keeps the agent type's default
+ENEMY_RECORD = np.dtype(
+    [
+        ("x", "<f8"),
+        ("y", "<f8"),
+        ("velocity_x", "<f8"),
+        ("velocity_y", "<f8"),
+        ("speed", "<f8"),
+        ("agent", "<i8"),
+    ]
+)
+
+# A chunk's (column, row) in the world's chunk grid
+Chunk = tuple[int, int]
+
+
+class ChunkFile:
+    """A world's enemies and terrain, chunk by chunk, in a memory-mapped file.
+
+    Each chunk's slot holds its enemy count, ``capacity`` ``ENEMY_RECORD``
+    entries and a ``tiles`` x ``tiles`` grid of terrain bytes, nonzero where
+    blocked. Records are NumPy structured arrays and agent types are stored
+    by importable name, so nothing is pickled. Slot methods may run on a
+    loader thread while the main thread looks up agent types; they touch
+    separate parts of the file.
+    """
+
+    def __init__(self, path: str | Path):
+        """Map an existing chunk file."""
+        self.path = Path(path)
+        with open(self.path, "r+b") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0)
+        magic, version, toc_length = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError("Not a chunk file")
+        if version != _VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported chunk file version: {version}")
+        contents = json.loads(self._mmap[_HEADER.size : _HEADER.size + toc_length])
+        self.columns: int = contents["columns"]
+        self.rows: int = contents["rows"]
+        self.chunk_size: float = contents["chunk_size"]
+        self.tiles: int = contents["tiles"]
+        self.capacity: int = contents["capacity"]
+        try:
+            self._types = [resolve_type(name, AIAgent) for name in contents["types"]]
+        except ValueError:
+            self._mmap.close()
+            raise
+        self._codes = {kind: code for code, kind in enumerate(self._types)}
+        self._tiles_offset, self._slot_bytes = self._layout(self.capacity, self.tiles)
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        columns: int,
+        rows: int,
+        chunk_size: float = CHUNK_SIZE,
+        capacity: int = CHUNK_CAPACITY,
+        tile_size: float = NAV_CELL_SIZE,
+    ) -> "ChunkFile":
+        """Create an empty chunk file for a world of ``columns`` x ``rows`` chunks.
+
+        Terrain tiles are ``tile_size`` pixels, which must divide
+        ``chunk_size``; match the navigation grid's cell size to stream
+        terrain into it.
+        """
+        if columns <= 0 or rows <= 0 or chunk_size <= 0 or tile_size <= 0:
+            raise ValueError("Chunk grid and sizes must be positive")
+        if capacity < 0:
+            raise ValueError("capacity must not be negative")
+        tiles = chunk_size / tile_size
+        if tiles != int(tiles):
+            raise ValueError("tile_size must divide chunk_size")
+        contents = {
+            "columns": columns,
+            "rows": rows,
+            "chunk_size": chunk_size,
+            "tiles": int(tiles),
+            "capacity": capacity,
+            "types": [],
+        }
+        slot_bytes = cls._layout(capacity, int(tiles))[1]
+        with open(path, "wb") as file:
+            file.write(cls._pack_header(contents))
+            # Extending the file leaves a hole, so empty chunks take no disk
+            file.truncate(_HEADER_BYTES + columns * rows * slot_bytes)
+        return cls(path)
+
+    @staticmethod
+    def _layout(capacity: int, tiles: int) -> tuple[int, int]:
+        """Get the offset of a slot's tiles and the size of a whole slot.
+
+        A slot is its enemy count, then its records, then its tiles.
+        """
+        tiles_offset = _ALIGN + capacity * ENEMY_RECORD.itemsize
+        tile_bytes = tiles * tiles
+        return tiles_offset, tiles_offset + tile_bytes + (-tile_bytes % _ALIGN)
+
+    @staticmethod
+    def _pack_header(contents: dict) -> bytes:
+        """Encode the header and table of contents into their reserved space."""
+        toc = json.dumps(contents, separators=(",", ":")).encode()
+        if _HEADER.size + len(toc) > _HEADER_BYTES:
+            raise ValueError("Chunk file header is full")
+        header = _HEADER.pack(_MAGIC, _VERSION, len(toc)) + toc
+        return header + bytes(_HEADER_BYTES - len(header))
+
+    def __enter__(self) -> "ChunkFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of chunks in the world."""
+        return self.columns * self.rows
+
+    @property
+    def world_width(self) -> float:
+        """Get the width of the world the chunks cover."""
+        return self.columns * self.chunk_size
+
+    @property
+    def world_height(self) -> float:
+        """Get the height of the world the chunks cover."""
+        return self.rows * self.chunk_size
+
+    @property
+    def tile_size(self) -> float:
+        """Get the side of a terrain tile in pixels."""
+        return self.chunk_size / self.tiles
+
+    def chunk_of(self, x: float, y: float) -> Chunk:
+        """Get the chunk containing a world position, clamped to the world."""
+        col = min(max(int(x // self.chunk_size), 0), self.columns - 1)
+        row = min(max(int(y // self.chunk_size), 0), self.rows - 1)
+        return (col, row)
+
+    def _slot(self, chunk: Chunk) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get views of a chunk's count, records and tiles in the mapping."""
+        col, row = chunk
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            raise IndexError(f"No chunk {chunk}")
+        offset = _HEADER_BYTES + (row * self.columns + col) * self._slot_bytes
+        count = np.ndarray((1,), np.int64, self._mmap, offset)
+        records = np.ndarray(
+            (self.capacity,), ENEMY_RECORD, self._mmap, offset + _ALIGN
+        )
+        tiles = np.ndarray(
+            (self.tiles, self.tiles), np.uint8, self._mmap, offset + self._tiles_offset
+        )
+        return count, records, tiles
+
+    def count(self, chunk: Chunk) -> int:
+        """Get the number of enemies stored in a chunk."""
+        return int(self._slot(chunk)[0][0])
+
+    def read(self, chunk: Chunk) -> tuple[np.ndarray, np.ndarray]:
+        """Copy a chunk's enemy records and terrain tiles out of the file."""
+        count, records, tiles = self._slot(chunk)
+        return records[: count[0]].copy(), tiles.copy()
+
+    def take(self, chunk: Chunk) -> tuple[np.ndarray, np.ndarray]:
+        """Read a chunk and empty its enemies, which now live elsewhere."""
+        records, tiles = self.read(chunk)
+        self._slot(chunk)[0][0] = 0
+        return records, tiles
+
+    def append(self, chunk: Chunk, records: np.ndarray) -> None:
+        """Add enemy records to a chunk."""
+        count, stored, _ = self._slot(chunk)
+        start = int(count[0])
+        if start + len(records) > self.capacity:
+            raise ValueError(f"Chunk {chunk} holds at most {self.capacity} enemies")
+        stored[start : start + len(records)] = records
+        count[0] = start + len(records)
+
+    def write_tiles(self, chunk: Chunk, tiles: np.ndarray) -> None:
+        """Replace a chunk's terrain tiles."""
+        self._slot(chunk)[2][:] = tiles
+
+    def add_enemy(
+        self,
+        x: float,
+        y: float,
+        agent_type: type[AIAgent] | None = None,
+        velocity: tuple[float, float] = (0.0, 0.0),
+        speed: float = math.nan,
+    ) -> Chunk:
+        """Store one enemy in the chunk containing it, e.g. to build a map.
+
+        Returns the chunk it went to.
+        """
+        chunk = self.chunk_of(x, y)
+        code = -1 if agent_type is None else self.type_code(agent_type)
+        record = np.array([(x, y, *velocity, speed, code)], ENEMY_RECORD)
+        self.append(chunk, record)
+        return chunk
+
+    def type_code(self, kind: type[AIAgent]) -> int:
+        """Get the code records use for an agent type, registering it if new."""
+        code = self._codes.get(kind)
+        if code is None:
+            contents = {
+                "columns": self.columns,
+                "rows": self.rows,
+                "chunk_size": self.chunk_size,
+                "tiles": self.tiles,
+                "capacity": self.capacity,
+                "types": [type_name(t) for t in (*self._types, kind)],
+            }
+            self._mmap[:_HEADER_BYTES] = self._pack_header(contents)
+            code = self._codes[kind] = len(self._types)
+            self._types.append(kind)
+        return code
+
+    def agent_type(self, code: int) -> type[AIAgent] | None:
+        """Get the agent type of a record code, None for -1."""
+        return None if code < 0 else self._types[code]
+
+    def flush(self) -> None:
+        """Write changed pages of the mapping to disk."""
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """Flush and unmap the file."""
+        if not self._mmap.closed:
+            self._mmap.flush()
+            self._mmap.close()
+
+
+class WorldStreamer:
+    """Keeps the chunks near the player and chase targets loaded into a scene.
+
+    Each update requests the chunks within ``radius`` of the player's chunk
+    and of every active ChasingAI target's chunk. A loader thread reads them
+    and empties their slots, and the next update spawns their enemies and
+    blocks their terrain on the scene's navigation grid, so every enemy
+    lives either in the scene or in the file. Chunks that drift more than a
+    chunk past the radius are frozen: their enemies are written back with
+    their agent's type and speed and despawned, and their terrain is written
+    back and cleared. Enemies that wander out of the loaded chunks are
+    written to the chunk they entered. An enemy whose chunk is full, counting
+    writes still queued for it, stays in the scene until there is room.
+    Other agent state, such as a chaser's path or a policy, starts fresh when
+    its chunk loads again.
+    """
+
+    def __init__(self, chunks: ChunkFile, radius: int = STREAM_RADIUS):
+        """Initialize a streamer over a chunk file."""
+        if radius < 0:
+            raise ValueError("radius must not be negative")
+        self.chunks = chunks
+        self.radius = radius
+        self.loaded: set[Chunk] = set()
+        self._loading: dict[Chunk, Future] = {}
+        self._writes: list[Future] = []
+        # Enemy records queued for each chunk, with the writes carrying them
+        self._queued: dict[Chunk, int] = {}
+        self._appends: list[tuple[Future, Chunk, int]] = []
+        # One thread keeps every read and write of a chunk in request order
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="chunk-loader")
+
+    @property
+    def pending(self) -> int:
+        """Get the number of chunks being read."""
+        return len(self._loading)
+
+    def start(self, scene: "GameScene") -> None:
+        """Load the chunks around the scene's player, waiting for them."""
+        chunks, navigation = self.chunks, scene.navigation
+        if (scene.world_width, scene.world_height) != (
+            chunks.world_width,
+            chunks.world_height,
+        ):
+            raise ValueError("The scene's world size must match the chunk file's")
+        if navigation.cell_size != chunks.tile_size:
+            raise ValueError("Navigation cells must match the chunk file's tiles")
+        self.update(scene)
+        self.finish_loading(scene)
+
+    def update(self, scene: "GameScene") -> None:
+        """Spawn read chunks, request nearby ones and freeze far ones."""
+        self._check_writes()
+        for chunk, future in list(self._loading.items()):
+            if future.done():
+                del self._loading[chunk]
+                self._spawn(scene, chunk, *future.result())
+
+        wanted, kept = self._nearby(scene)
+        for chunk in wanted.difference(self.loaded, self._loading):
+            self._loading[chunk] = self._executor.submit(self.chunks.take, chunk)
+        for chunk in self.loaded - kept:
+            self._freeze_terrain(scene, chunk)
+        self.loaded &= kept
+        self._evict(scene, self.loaded.union(self._loading))
+
+    def finish_loading(self, scene: "GameScene") -> None:
+        """Wait for every requested chunk and spawn it."""
+        for chunk, future in list(self._loading.items()):
+            del self._loading[chunk]
+            self._spawn(scene, chunk, *future.result())
+
+    def stop(self, scene: "GameScene") -> None:
+        """Write every loaded chunk back to the file and stop the loader."""
+        self.finish_loading(scene)
+        for chunk in self.loaded:
+            self._freeze_terrain(scene, chunk)
+        self.loaded.clear()
+        self._evict(scene, ())
+        self._executor.shutdown(wait=True)
+        self._check_writes()
+        self.chunks.flush()
+
+    def _nearby(self, scene: "GameScene") -> tuple[set[Chunk], set[Chunk]]:
+        """Get the chunks to load and the wider set of chunks to keep."""
+        focus = [scene.player]
+        focus.extend(
+            agent.target
+            for agent in scene.agents
+            if isinstance(agent, ChasingAI)
+            and agent.target is not None
+            and agent.target.active
+        )
+        columns, rows = self.chunks.columns, self.chunks.rows
+        wanted: set[Chunk] = set()
+        kept: set[Chunk] = set()
+        for entity in dict.fromkeys(focus):
+            col, row = self.chunks.chunk_of(
+                entity.x + entity.width / 2, entity.y + entity.height / 2
+            )
+            for reach, chunks in ((self.radius, wanted), (self.radius + 1, kept)):
+                chunks.update(
+                    (c, r)
+                    for c in range(max(col - reach, 0), min(col + reach + 1, columns))
+                    for r in range(max(row - reach, 0), min(row + reach + 1, rows))
+                )
+        return wanted, kept
+
+    def _spawn(
+        self, scene: "GameScene", chunk: Chunk, records: np.ndarray, tiles: np.ndarray
+    ) -> None:
+        """Add a read chunk's enemies and terrain to the scene."""
+        for x, y, velocity_x, velocity_y, speed, code in records.tolist():
+            enemy, agent = scene.spawn_enemy_and_agent(
+                x, y, self.chunks.agent_type(code)
+            )
+            enemy.velocity_x = velocity_x
+            enemy.velocity_y = velocity_y
+            if not math.isnan(speed):
+                (enemy if agent is None else agent).speed = speed
+        tiles_per_chunk = self.chunks.tiles
+        col, row = chunk
+        scene.navigation.set_cells(
+            col * tiles_per_chunk, row * tiles_per_chunk, tiles != 0
+        )
+        self.loaded.add(chunk)
+
+    def _freeze_terrain(self, scene: "GameScene", chunk: Chunk) -> None:
+        """Write a chunk's terrain back to the file and clear it from navigation."""
+        size = self.chunks.tiles
+        col, row = chunk[0] * size, chunk[1] * size
+        navigation = scene.navigation
+        tiles = navigation.blocked[row : row + size, col : col + size].astype(np.uint8)
+        self._write(self.chunks.write_tiles, chunk, tiles)
+        navigation.set_cells(col, row, np.zeros_like(tiles, dtype=bool))
+
+    def _evict(self, scene: "GameScene", keep: Iterable[Chunk]) -> None:
+        """Write enemies outside the kept chunks to the file and despawn them."""
+        enemies = scene.enemies
+        if not enemies:
+            return
+        chunks = self.chunks
+        store = scene.store
+        rows = np.fromiter((enemy.row for enemy in enemies), np.intp, len(enemies))
+        x, y = store.gather("x", rows), store.gather("y", rows)
+        centers_x = x + store.gather("width", rows) / 2
+        centers_y = y + store.gather("height", rows) / 2
+        cols = np.clip(centers_x // chunks.chunk_size, 0, chunks.columns - 1)
+        lines = np.clip(centers_y // chunks.chunk_size, 0, chunks.rows - 1)
+        flat = (lines * chunks.columns + cols).astype(np.intp)
+        kept = np.array([r * chunks.columns + c for c, r in keep], np.intp)
+        leaving = np.flatnonzero(~np.isin(flat, kept))
+        if not len(leaving):
+            return
+
+        # Leave enemies whose chunk is full in the scene; the file is only
+        # appended to on the loader thread, so count its queued records too
+        self._check_appends()
+        leaving = leaving[np.argsort(flat[leaving], kind="stable")]
+        targets = flat[leaving]
+        starts = np.flatnonzero(np.diff(targets, prepend=-1))
+        fits = np.zeros(len(leaving), bool)
+        groups = []
+        for start, end in zip(starts.tolist(), [*starts[1:].tolist(), len(targets)]):
+            row, col = divmod(int(targets[start]), chunks.columns)
+            chunk = (col, row)
+            room = chunks.capacity - chunks.count(chunk) - self._queued.get(chunk, 0)
+            count = max(min(end - start, room), 0)
+            fits[start : start + count] = True
+            if count:
+                groups.append((chunk, count))
+        leaving = leaving[fits]
+        if not len(leaving):
+            return
+
+        agents = {agent.entity: agent for agent in scene.agents}
+        records = np.empty(len(leaving), ENEMY_RECORD)
+        records["x"], records["y"] = x[leaving], y[leaving]
+        records["velocity_x"] = store.gather("velocity_x", rows[leaving])
+        records["velocity_y"] = store.gather("velocity_y", rows[leaving])
+        departing = [enemies[index] for index in leaving.tolist()]
+        codes, speeds = [], []
+        for enemy in departing:
+            agent = agents.get(enemy)
+            if agent is None:
+                codes.append(-1)
+                speeds.append(enemy.speed)
+            else:
+                codes.append(chunks.type_code(type(agent)))
+                speeds.append(getattr(agent, "speed", math.nan))
+        records["agent"], records["speed"] = codes, speeds
+
+        # One append per chunk; records are grouped by chunk already
+        offset = 0
+        for chunk, count in groups:
+            future = self._write(chunks.append, chunk, records[offset : offset + count])
+            self._queued[chunk] = self._queued.get(chunk, 0) + count
+            self._appends.append((future, chunk, count))
+            offset += count
+        scene.despawn_enemies(departing)
+
+    def _write(
+        self,
+        method: Callable[[Chunk, np.ndarray], None],
+        chunk: Chunk,
+        data: np.ndarray,
+    ) -> Future:
+        """Queue a write to the file behind any reads of the same chunk."""
+        future = self._executor.submit(method, chunk, data)
+        self._writes.append(future)
+        return future
+
+    def _check_appends(self) -> None:
+        """Stop counting the queued records of appends that have finished."""
+        pending = []
+        for future, chunk, count in self._appends:
+            if future.done():
+                left = self._queued[chunk] - count
+                if left:
+                    self._queued[chunk] = left
+                else:
+                    del self._queued[chunk]
+            else:
+                pending.append((future, chunk, count))
+        self._appends = pending
+
+    def _check_writes(self) -> None:
+        """Raise the error of any failed write on this thread."""
+        pending = []
+        for future in self._writes:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._writes = pending
@@ -2,22 +2,60 @@
 Main entry point for the pygame game.
 """
 
+import argparse
 import sys
+import time
+from pathlib import Path
 
 import pygame
 
 from game.engine import GameEngine
+from game.replay import InputLog
+from game.scenes import GameScene, MenuScene
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Python AI Pygame Game")
+    parser.add_argument("--record", type=Path, help="record the session to a log")
+    parser.add_argument(
+        "--replay", type=Path, help="replay a recorded log headless and verify it"
+    )
+    return parser.parse_args(argv)
+
+
+def replay(path: Path) -> None:
+    """Replay a recorded session as fast as possible and report the speed."""
+    log = InputLog.load(path)
+    engine = GameEngine(headless=True, scene=GameScene())
+    start = time.perf_counter()
+    frames = engine.replay(log)
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {frames} frames in {elapsed:.2f}s, all checksums match")
 
 
 def main():
     """Main function to run the game."""
+    args = parse_args()
+
     # Initialize pygame
     pygame.init()
 
     try:
-        # Create and run the game engine
-        engine = GameEngine()
-        engine.run()
+        if args.replay:
+            replay(args.replay)
+        elif args.record:
+            # Create and run the game engine, recording every frame
+            engine = GameEngine(scene=GameScene())
+            engine.start_recording()
+            try:
+                engine.run()
+            finally:
+                engine.stop_recording().save(args.record)
+        else:
+            # Create and run the game engine, starting at the menu
+            engine = GameEngine(scene=MenuScene())
+            engine.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
     except Exception as e:
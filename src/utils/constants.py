@@ -6,8 +6,14 @@ Game constants and configuration values.
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
+# World dimensions; the camera scrolls when the world is larger than the screen
+WORLD_WIDTH = 800
+WORLD_HEIGHT = 600
+
 # Game settings
 FPS = 60
+SIM_RATE = 60  # Fixed simulation steps per second, independent of FPS
+MAX_SIM_STEPS = 5  # Most simulation steps run to catch up in one frame
 GAME_TITLE = "Python AI Pygame Game"
 
 # Colors (RGB tuples)
@@ -35,10 +41,19 @@ ENEMY_SIZE = 24
 
 # AI settings
 AI_UPDATE_FREQUENCY = 60  # Updates per second
+CHASING_SPEED = 100.0  # Default ChasingAI speed in pixels per second
+FLOCKING_SPEED = 80.0  # Default FlockingAI speed in pixels per second
 FLOCKING_RADIUS = 100.0
 SEPARATION_WEIGHT = 1.5
 ALIGNMENT_WEIGHT = 1.0
 COHESION_WEIGHT = 1.0
+NAV_CELL_SIZE = 32.0  # Pathfinding grid cell size in pixels
+NAV_FIELD_RADIUS = 64  # Cells a flow field reaches around its target
+
+# World streaming settings
+CHUNK_SIZE = 512.0  # Side of a streamed world chunk in pixels
+CHUNK_CAPACITY = 256  # Most enemies a chunk file stores per chunk
+STREAM_RADIUS = 1  # Chunks around the player and chase targets kept loaded
 
 # Input key mappings
 MOVEMENT_KEYS = {
@@ -61,3 +76,8 @@ ASSETS_DIR = "assets"
 IMAGES_DIR = f"{ASSETS_DIR}/images"
 SOUNDS_DIR = f"{ASSETS_DIR}/sounds"
 FONTS_DIR = f"{ASSETS_DIR}/fonts"
+POLICY_PATH = f"{ASSETS_DIR}/policies/enemy.npz"  # Trained enemy policy
+
+# Asset loading
+ASSET_CACHE_BYTES = 64 * 1024 * 1024  # Memory budget for decoded assets
+ASSET_LOADER_THREADS = 4
@@ -0,0 +1,260 @@
+"""
+Frame profiler module - per-phase timings kept in fixed-size ring buffers.
+"""
+
+import csv
+import functools
+import json
+from array import array
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+
+import pygame
+
+from utils.constants import COLORS
+from utils.text import get_text_renderer
+
+# Name of the series holding whole-frame durations
+FRAME_SERIES = "frame"
+
+# Default number of frames kept per series (10 seconds at 60 FPS)
+DEFAULT_CAPACITY = 600
+
+# Colors cycled through for series in the overlay graph
+OVERLAY_COLORS = ["GREEN", "CYAN", "YELLOW", "MAGENTA", "RED", "BLUE"]
+
+
+class RingBuffer:
+    """Fixed-size buffer of floats that overwrites its oldest values."""
+
+    def __init__(self, capacity: int):
+        """Initialize the ring buffer."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored values."""
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Add a value, overwriting the oldest one when full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def values(self) -> list[float]:
+        """Get the stored values from oldest to newest."""
+        if self._count < self.capacity:
+            return self._values[: self._count].tolist()
+        return (self._values[self._next :] + self._values[: self._next]).tolist()
+
+    def percentile(self, fraction: float) -> float:
+        """Get a nearest-rank percentile of the stored values."""
+        if not self._count:
+            return 0.0
+        ordered = sorted(self.values())
+        index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class _Span:
+    """Reusable context manager that times one named span."""
+
+    __slots__ = ("profiler", "name", "_starts")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self._starts: list[float] = []
+
+    def __enter__(self) -> "_Span":
+        if self.profiler.in_frame:
+            self._starts.append(perf_counter())
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._starts:
+            self.profiler.add_time(self.name, perf_counter() - self._starts.pop())
+
+
+class FrameProfiler:
+    """Records high-resolution durations of frame phases and named sub-spans.
+
+    Durations within a frame are summed per name; ``end_frame`` pushes each
+    total (in milliseconds) into that name's ring buffer. Time recorded
+    outside ``begin_frame`` and ``end_frame`` is dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = True):
+        """Initialize the profiler."""
+        self.capacity = capacity
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.frames = 0
+        self.series: dict[str, RingBuffer] = {}
+        self._current: dict[str, float] = {}
+        self._spans: dict[str, _Span] = {}
+        self._frame_start: float | None = None
+        self._enabled_by_overlay = False
+
+    @property
+    def in_frame(self) -> bool:
+        """Check whether a frame is being recorded."""
+        return self._frame_start is not None
+
+    def span(self, name: str) -> _Span:
+        """Get a context manager that times a named span."""
+        span = self._spans.get(name)
+        if span is None:
+            span = self._spans[name] = _Span(self, name)
+        return span
+
+    def profile(self, name: str) -> Callable:
+        """Decorate a function so every call is timed as a named span."""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Add a duration to a named span for the current frame."""
+        if self._frame_start is None:
+            return
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def begin_frame(self) -> None:
+        """Mark the start of a frame."""
+        if self.enabled:
+            self._frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        """Mark the end of a frame and record every series."""
+        if not self.enabled or self._frame_start is None:
+            return
+        self._current[FRAME_SERIES] = perf_counter() - self._frame_start
+        self._frame_start = None
+
+        for name in self._current:
+            if name not in self.series:
+                self._add_series(name)
+        for name, buffer in self.series.items():
+            buffer.append(1000.0 * self._current.get(name, 0.0))
+        self._current.clear()
+        self.frames += 1
+
+    def _add_series(self, name: str) -> None:
+        """Create a series, padded so it lines up with existing ones."""
+        buffer = RingBuffer(self.capacity)
+        for _ in range(min(self.frames, self.capacity)):
+            buffer.append(0.0)
+        self.series[name] = buffer
+
+    def stats(self, name: str = FRAME_SERIES) -> dict[str, float]:
+        """Get p50/p95/p99, mean and max in milliseconds for a series."""
+        buffer = self.series.get(name)
+        if buffer is None or not len(buffer):
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+        values = buffer.values()
+        return {
+            "p50": buffer.percentile(0.50),
+            "p95": buffer.percentile(0.95),
+            "p99": buffer.percentile(0.99),
+            "mean": sum(values) / len(values),
+            "max": max(values),
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        self.series.clear()
+        self._current.clear()
+        self._frame_start = None
+        self.frames = 0
+
+    def export_csv(self, path: str | Path) -> None:
+        """Write one row per recorded frame with a column per series."""
+        names = list(self.series)
+        columns = [self.series[name].values() for name in names]
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame", *names])
+            first_frame = self.frames - len(columns[0]) if columns else 0
+            for offset, row in enumerate(zip(*columns)):
+                writer.writerow([first_frame + offset, *row])
+
+    def export_json(self, path: str | Path) -> None:
+        """Write per-series stats and raw timings in milliseconds."""
+        report = {
+            "frames": self.frames,
+            "series": {
+                name: {"stats": self.stats(name), "values_ms": buffer.values()}
+                for name, buffer in self.series.items()
+            },
+        }
+        Path(path).write_text(json.dumps(report, indent=2))
+
+    def toggle_overlay(self) -> None:
+        """Show or hide the on-screen overlay.
+
+        Showing the overlay turns a disabled profiler on, and hiding it turns
+        the profiler back off.
+        """
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible and not self.enabled:
+            self.enabled = self._enabled_by_overlay = True
+        elif not self.overlay_visible and self._enabled_by_overlay:
+            self.enabled = self._enabled_by_overlay = False
+            self._current.clear()
+            self._frame_start = None
+
+    def render_overlay(self, screen: pygame.Surface, height: int = 80) -> None:
+        """Draw a frame-time graph and per-series percentiles."""
+        if not self.overlay_visible or FRAME_SERIES not in self.series:
+            return
+
+        width = screen.get_width()
+        top = screen.get_height() - height
+        pygame.draw.rect(screen, COLORS["DARK_GRAY"], (0, top, width, height))
+
+        # Frame-time bars, scaled so the slowest recorded frame fills the graph
+        frame_times = self.series[FRAME_SERIES].values()[-width:]
+        scale = (height - 2) / max(max(frame_times), 1e-6)
+        x = width - len(frame_times)
+        for value in frame_times:
+            bar = int(value * scale)
+            pygame.draw.line(
+                screen, COLORS["LIGHT_GRAY"], (x, top + height), (x, top + height - bar)
+            )
+            x += 1
+
+        # One line of percentiles per series, composed from cached glyphs
+        text_renderer = get_text_renderer()
+        y = 4
+        for index, name in enumerate(self.series):
+            stats = self.stats(name)
+            color = COLORS[OVERLAY_COLORS[index % len(OVERLAY_COLORS)]]
+            text = (
+                f"{name}: p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  "
+                f"p99 {stats['p99']:.2f} ms"
+            )
+            text_renderer.draw(screen, text, (4, y), color, 18)
+            y += 16
+
+
+# Off until the overlay is shown, so unprofiled runs don't pay for timing
+_default_profiler = FrameProfiler(enabled=False)
+
+
+def get_profiler() -> FrameProfiler:
+    """Get the profiler shared by the engine, scenes and AI systems."""
+    return _default_profiler
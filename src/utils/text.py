@@ -0,0 +1,154 @@
+"""
+Text module - cached fonts, text surfaces and glyphs for HUD rendering.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import pygame
+
+# Rendered strings kept before the least recently used one is dropped
+DEFAULT_MAX_SURFACES = 256
+
+# Glyph sets (one per font, color and antialias) kept before the least
+# recently used one is dropped
+DEFAULT_MAX_GLYPH_SETS = 64
+
+Color = Sequence[int]
+# (font path, size); a path of None is pygame's default font
+FontKey = tuple[str | None, int]
+# (font, text, color, antialias)
+TextKey = tuple[FontKey, str, tuple[int, ...], bool]
+# (font, color, antialias)
+StyleKey = tuple[FontKey, tuple[int, ...], bool]
+
+
+class TextRenderer:
+    """Renders text through caches of fonts, strings and glyphs.
+
+    ``render`` caches whole strings, which suits text that rarely changes.
+    ``draw`` blits a cached string when there is one and otherwise composes
+    the text from cached glyphs, so values that change every frame (scores,
+    timers, frame times) neither rasterize anything once their characters
+    have been seen nor churn the string cache. Glyph-composed text skips
+    kerning, which is invisible for digits and HUD labels.
+    """
+
+    def __init__(
+        self,
+        max_surfaces: int = DEFAULT_MAX_SURFACES,
+        max_glyph_sets: int = DEFAULT_MAX_GLYPH_SETS,
+    ):
+        """Initialize empty caches."""
+        self.max_surfaces = max_surfaces
+        self.max_glyph_sets = max_glyph_sets
+        self.hits = 0
+        self.misses = 0
+        self._fonts: dict[FontKey, pygame.font.Font] = {}
+        self._surfaces: OrderedDict[TextKey, pygame.Surface] = OrderedDict()
+        self._glyph_sets: OrderedDict[StyleKey, dict[str, pygame.Surface]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of cached strings and glyphs."""
+        return len(self._surfaces) + sum(map(len, self._glyph_sets.values()))
+
+    def font(self, size: int, path: str | None = None) -> pygame.font.Font:
+        """Get the font for a (path, size), loading it on first use."""
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def render(
+        self,
+        text: str,
+        color: Color,
+        size: int,
+        path: str | None = None,
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        """Get a surface with a whole string rendered, from the cache if seen."""
+        key = ((path, size), text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, path).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_surfaces:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        text: str,
+        position: tuple[int, int],
+        color: Color,
+        size: int,
+        path: str | None = None,
+        antialias: bool = True,
+    ) -> pygame.Rect:
+        """Blit a string, from the string cache or else glyph by glyph.
+
+        Returns the area drawn to.
+        """
+        x, y = position
+        font_key = (path, size)
+        style = tuple(color)
+        surface = self._surfaces.get((font_key, text, style, antialias))
+        if surface is not None:
+            self.hits += 1
+            return screen.blit(surface, position)
+
+        glyphs = self._glyph_set((font_key, style, antialias))
+        missing = set(text).difference(glyphs)
+        if missing:
+            font = self.font(size, path)
+            for char in missing:
+                glyphs[char] = font.render(char, antialias, color)
+            self.misses += len(missing)
+        self.hits += len(text) - len(missing)
+
+        # Every glyph of a font renders at the font's full line height
+        blits = []
+        glyph = None
+        for char in text:
+            glyph = glyphs[char]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        screen.blits(blits, doreturn=False)
+        height = glyph.get_height() if glyph is not None else 0
+        return pygame.Rect(position[0], y, x - position[0], height)
+
+    def clear(self) -> None:
+        """Drop every cached string and glyph; fonts are kept."""
+        self._surfaces.clear()
+        self._glyph_sets.clear()
+
+    def _glyph_set(self, key: StyleKey) -> dict[str, pygame.Surface]:
+        """Get the cached glyphs of one font, color and antialias setting."""
+        glyphs = self._glyph_sets.get(key)
+        if glyphs is None:
+            glyphs = self._glyph_sets[key] = {}
+            if len(self._glyph_sets) > self.max_glyph_sets:
+                self._glyph_sets.popitem(last=False)
+        else:
+            self._glyph_sets.move_to_end(key)
+        return glyphs
+
+
+_default_renderer = TextRenderer()
+
+
+def get_text_renderer() -> TextRenderer:
+    """Get the text renderer shared by scenes and overlays."""
+    return _default_renderer
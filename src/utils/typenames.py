@@ -0,0 +1,29 @@
+"""
+Type names module - importable names for classes saved in data files.
+"""
+
+import importlib
+
+
+def type_name(cls: type) -> str:
+    """Get the importable ``module:qualname`` name of a class."""
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_type(name: str, base: type | tuple[type, ...]) -> type:
+    """Import a class from its ``module:qualname`` name.
+
+    The class must subclass ``base``, so a file can't make its loader
+    construct arbitrary objects. Raises ValueError when the name doesn't
+    import or names anything else.
+    """
+    module, _, qualname = name.partition(":")
+    try:
+        value = importlib.import_module(module)
+        for part in qualname.split("."):
+            value = getattr(value, part)
+    except (ImportError, AttributeError, ValueError) as error:
+        raise ValueError(f"Unknown type: {name!r}") from error
+    if not (isinstance(value, type) and issubclass(value, base)):
+        raise ValueError(f"Not an allowed type: {name!r}")
+    return value
@@ -2,8 +2,10 @@
 Tests for AI agents.
 """
 
-from ai.agents import ChasingAI, SimpleAI
+from ai.agents import ChasingAI, FlockingAI, SimpleAI
+from ai.navigation import NavigationGrid
 from game.entities import Entity
+from game.spatial import SpatialHash
 
 
 class MockEntity(Entity):
@@ -52,6 +54,16 @@ class TestSimpleAI:
         # Velocity should be set (non-zero)
         assert entity.velocity_x != 0 or entity.velocity_y != 0
 
+    def test_simple_ai_seed_is_reproducible(self):
+        """Test agents with the same seed pick the same directions."""
+        first, second = MockEntity(0, 0, 5, 5), MockEntity(0, 0, 5, 5)
+
+        SimpleAI(first, seed=42).update(2.5, {})
+        SimpleAI(second, seed=42).update(2.5, {})
+
+        assert first.velocity_x == second.velocity_x
+        assert first.velocity_y == second.velocity_y
+
 
 class TestChasingAI:
     """Test the ChasingAI agent."""
@@ -110,3 +122,82 @@ class TestChasingAI:
         # Should not move when at same position
         assert entity.velocity_x == 0
         assert entity.velocity_y == 0
+
+    def test_chasing_ai_steers_between_centers(self):
+        """Test ChasingAI aims its center at the target's, whatever their sizes."""
+        entity = MockEntity(0, 8, 24, 24)
+        target = MockEntity(100, 0, 40, 40)
+        ai = ChasingAI(entity, speed=100.0)
+        ai.set_target(target)
+
+        ai.update(0.1, {})
+
+        assert entity.velocity_x == 100.0
+        assert entity.velocity_y == 0
+
+    def test_chasing_ai_follows_flow_field_around_wall(self):
+        """Test ChasingAI steers around a wall when a navigation grid is given."""
+        entity = MockEntity(40, 5, 5, 5)
+        target = MockEntity(85, 5, 5, 5)
+        ai = ChasingAI(entity, speed=100.0)
+        ai.set_target(target)
+        grid = NavigationGrid(100, 100, 10)
+        grid.set_blocked(50, 0, 10, 90)
+
+        ai.update(0.1, {"navigation": grid})
+
+        # The target is straight to the right, but the way round is down
+        assert entity.velocity_y > 0
+
+
+class TestFlockingAI:
+    """Test the FlockingAI agent."""
+
+    def test_find_neighbors_uses_radius(self):
+        """Test neighbors are limited to the flocking radius."""
+        entity = MockEntity(0, 0, 5, 5)
+        near = MockEntity(50, 0, 5, 5)
+        far = MockEntity(150, 0, 5, 5)
+        ai = FlockingAI(entity)
+
+        ai.find_neighbors([entity, near, far])
+
+        assert ai.neighbors == [near]
+
+    def test_find_neighbors_with_spatial_hash(self):
+        """Test spatial hash queries give the same neighbors as a full scan."""
+        entities = [MockEntity(i * 30, (i % 4) * 40, 5, 5) for i in range(20)]
+        grid = SpatialHash()
+        grid.rebuild(entities)
+
+        for entity in entities:
+            brute = FlockingAI(entity)
+            hashed = FlockingAI(entity)
+            brute.find_neighbors(entities)
+            hashed.find_neighbors(entities, grid)
+            assert set(hashed.neighbors) == set(brute.neighbors)
+
+    def test_separation_pushes_away(self):
+        """Test separation force points away from a close neighbor."""
+        entity = MockEntity(0, 0, 5, 5)
+        neighbor = MockEntity(10, 0, 5, 5)
+        ai = FlockingAI(entity)
+        ai.neighbors = [neighbor]
+
+        force_x, force_y = ai.separation()
+
+        assert force_x == -1.0
+        assert force_y == 0.0
+
+    def test_update_sets_speed(self):
+        """Test update steers at the configured speed."""
+        entity = MockEntity(0, 0, 5, 5)
+        neighbor = MockEntity(30, 40, 5, 5)
+        ai = FlockingAI(entity, speed=80.0)
+        grid = SpatialHash()
+        grid.rebuild([entity, neighbor])
+
+        ai.update(0.1, {"entities": [entity, neighbor], "spatial_hash": grid})
+
+        speed = (entity.velocity_x**2 + entity.velocity_y**2) ** 0.5
+        assert abs(speed - 80.0) < 1e-9
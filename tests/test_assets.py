@@ -0,0 +1,116 @@
+"""
+Tests for the asset manager.
+"""
+
+import time
+import wave
+
+import pygame
+import pytest
+
+from game.assets import IMAGES, SOUNDS, AssetManager
+
+
+@pytest.fixture
+def asset_dirs(tmp_path):
+    """Create image and sound directories with a few small assets."""
+    images = tmp_path / "images"
+    sounds = tmp_path / "sounds"
+    images.mkdir()
+    sounds.mkdir()
+    for index, size in enumerate((8, 16, 32)):
+        surface = pygame.Surface((size, size))
+        surface.fill((index * 80, 0, 0))
+        pygame.image.save(surface, images / f"square{size}.png")
+    with wave.open(str(sounds / "beep.wav"), "wb") as sound:
+        sound.setnchannels(1)
+        sound.setsampwidth(2)
+        sound.setframerate(22050)
+        sound.writeframes(bytes(4410))
+    return images, sounds
+
+
+def wait_for(manager: AssetManager, timeout: float = 5.0) -> None:
+    """Process background loads until none are pending."""
+    deadline = time.monotonic() + timeout
+    while manager.pending and time.monotonic() < deadline:
+        manager.process_loaded()
+        time.sleep(0.001)
+
+
+class TestAssetManager:
+    """Test loading and caching assets."""
+
+    def test_get_loads_and_caches(self, asset_dirs):
+        """Test an image is decoded once and then served from the cache."""
+        manager = AssetManager(*asset_dirs)
+
+        first = manager.image("square8.png")
+        second = manager.image("square8.png")
+
+        assert first is second
+        assert first.get_size() == (8, 8)
+        assert (manager.hits, manager.misses) == (1, 1)
+
+    def test_prefetch_loads_in_background(self, asset_dirs):
+        """Test a manifest is decoded off the main thread and then cached."""
+        manager = AssetManager(*asset_dirs)
+        manifest = {IMAGES: ["square8.png", "square16.png"]}
+
+        manager.prefetch(manifest)
+        wait_for(manager)
+
+        assert manager.is_ready(manifest)
+        assert manager.image("square16.png").get_size() == (16, 16)
+        assert manager.misses == 0
+        manager.shutdown()
+
+    def test_get_waits_for_pending_load(self, asset_dirs):
+        """Test asking for an asset that's still loading doesn't load it twice."""
+        manager = AssetManager(*asset_dirs)
+        manager.request(IMAGES, "square32.png")
+
+        image = manager.image("square32.png")
+
+        assert image.get_size() == (32, 32)
+        assert manager.pending == 0
+        manager.shutdown()
+
+    def test_evicts_least_recently_used(self, asset_dirs):
+        """Test the cache stays within its memory budget."""
+        manager = AssetManager(*asset_dirs, max_bytes=16 * 16 * 4 + 8 * 8 * 4)
+        manager.image("square8.png")
+        manager.image("square16.png")
+        manager.image("square8.png")
+
+        manager.image("square32.png")
+
+        assert (IMAGES, "square32.png") in manager
+        assert (IMAGES, "square16.png") not in manager
+        assert manager.evictions >= 1
+
+    def test_failed_load_raises_on_get(self, asset_dirs):
+        """Test a background load error surfaces when the asset is used."""
+        manager = AssetManager(*asset_dirs)
+        manager.request(IMAGES, "missing.png")
+        wait_for(manager, timeout=0.1)
+
+        with pytest.raises((pygame.error, FileNotFoundError)):
+            manager.image("missing.png")
+        manager.shutdown()
+
+    def test_loads_sounds(self, asset_dirs):
+        """Test sounds are loaded when the mixer is available."""
+        if pygame.mixer.get_init() is None:
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                pytest.skip("No audio device")
+        manager = AssetManager(*asset_dirs)
+
+        manager.prefetch({SOUNDS: ["beep.wav"]})
+        wait_for(manager)
+
+        assert manager.sound("beep.wav").get_length() == pytest.approx(0.1, abs=0.01)
+        assert manager.bytes_used > 0
+        manager.shutdown()
@@ -0,0 +1,68 @@
+"""
+Tests for the benchmark runner's regression check.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+RUNNER = Path(__file__).resolve().parent.parent / "benchmarks" / "run.py"
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Load benchmarks/run.py, which isn't part of an installed package."""
+    spec = importlib.util.spec_from_file_location("benchmark_runner", RUNNER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def report(*results: tuple[str, int, float]) -> dict:
+    """Build a benchmark report as written by ``--output``."""
+    return {
+        "results": [
+            {"case": case, "n": n, "frame_ms": frame_ms}
+            for case, n, frame_ms in results
+        ]
+    }
+
+
+class TestCompare:
+    """Test comparing benchmark results against a baseline."""
+
+    def test_flags_only_slowdowns_past_tolerance(self, runner):
+        """Test cases slower than the tolerance allows are reported."""
+        baseline = report(("enemy_update", 10, 1.0), ("enemy_update", 100, 2.0))
+        current = report(("enemy_update", 10, 1.05), ("enemy_update", 100, 3.0))
+
+        regressions = runner.compare(current, baseline, tolerance=0.10)
+
+        assert len(regressions) == 1
+        assert "n=100" in regressions[0] and "REGRESSED" in regressions[0]
+
+    def test_skips_cases_missing_from_baseline(self, runner):
+        """Test new cases and zero baseline times aren't regressions."""
+        baseline = report(("render", 10, 0.0))
+        current = report(("render", 10, 5.0), ("new_case", 10, 5.0))
+
+        assert runner.compare(current, baseline, tolerance=0.10) == []
+
+    def test_speedups_pass(self, runner):
+        """Test a faster run passes even with no tolerance."""
+        baseline = report(("render", 1000, 4.0))
+        current = report(("render", 1000, 2.0))
+
+        assert runner.compare(current, baseline, tolerance=0.0) == []
+
+    def test_reads_saved_reports(self, runner, tmp_path):
+        """Test reports saved as JSON compare like the ones in memory."""
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps(report(("render", 10, 1.0))))
+        current = report(("render", 10, 1.5))
+
+        regressions = runner.compare(current, json.loads(path.read_text()), 0.25)
+
+        assert len(regressions) == 1
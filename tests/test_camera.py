@@ -0,0 +1,61 @@
+"""
+Tests for the camera.
+"""
+
+import pytest
+
+from game.camera import Camera
+from game.entities import Player
+
+
+class TestCamera:
+    """Test the Camera view."""
+
+    def test_invalid_size(self):
+        """Test that a non-positive size is rejected."""
+        with pytest.raises(ValueError):
+            Camera(0, 600)
+
+    def test_move_stays_inside_world(self):
+        """Test the view is kept inside the world."""
+        camera = Camera(800, 600, 2000, 1000)
+        camera.move_to(-50, 900)
+        assert (camera.x, camera.y) == (0.0, 400.0)
+
+    def test_world_smaller_than_view(self):
+        """Test a world the view covers keeps the view at its corner."""
+        camera = Camera(800, 600, 400, 300)
+        camera.center_on(200, 150)
+        assert (camera.x, camera.y) == (0.0, 0.0)
+        assert camera.sees_world
+
+    def test_follow_centers_entity(self):
+        """Test following centers the view on an entity."""
+        camera = Camera(800, 600, 4000, 4000)
+        player = Player(1000, 1000)
+        camera.follow(player)
+        assert camera.x == 1000 + player.width / 2 - 400
+        assert camera.y == 1000 + player.height / 2 - 300
+
+    def test_transforms_round_trip(self):
+        """Test screen and world positions convert both ways."""
+        camera = Camera(800, 600, 4000, 4000)
+        camera.move_to(100, 200)
+        assert camera.world_to_screen(150, 250) == (50, 50)
+        assert camera.screen_to_world(50, 50) == (150, 250)
+
+    def test_offset_interpolates(self):
+        """Test the offset blends the previous and current positions."""
+        camera = Camera(800, 600, 4000, 4000)
+        camera.save_position()
+        camera.move_to(100, 40)
+        assert camera.offset(0.5) == (50.0, 20.0)
+        assert camera.offset() == (100.0, 40.0)
+
+    def test_is_visible(self):
+        """Test boxes are visible only when they overlap the view."""
+        camera = Camera(800, 600, 4000, 4000)
+        camera.move_to(1000, 1000)
+        assert camera.is_visible(990, 990, 20, 20)
+        assert not camera.is_visible(980, 990, 20, 20)
+        assert not camera.is_visible(1800, 1200, 10, 10)
@@ -0,0 +1,176 @@
+"""
+Tests for the collision system.
+"""
+
+import random
+
+import numpy as np
+
+from game.collision import (
+    ENTER,
+    EXIT,
+    STAY,
+    CollisionSystem,
+    overlapping_pairs,
+)
+from game.entities import Entity
+from game.store import EntityStore
+
+
+class MockEntity(Entity):
+    """Mock entity for testing."""
+
+    def update(self, dt):
+        pass
+
+    def render(self, screen):
+        pass
+
+
+def brute_force_pairs(left, top, right, bottom) -> set[tuple[int, int]]:
+    """Find overlapping boxes by testing every pair."""
+    count = len(left)
+    return {
+        (i, j)
+        for i in range(count)
+        for j in range(i + 1, count)
+        if left[i] < right[j]
+        and left[j] < right[i]
+        and top[i] < bottom[j]
+        and top[j] < bottom[i]
+    }
+
+
+class TestOverlappingPairs:
+    """Test the sweep-and-prune broadphase."""
+
+    def test_matches_brute_force(self):
+        """Test the sweep finds exactly the overlapping pairs, once each."""
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            left = rng.uniform(0, 400, 250)
+            top = rng.uniform(0, 300, 250)
+            right = left + rng.uniform(1, 60, 250)
+            bottom = top + rng.uniform(1, 60, 250)
+
+            first, second = overlapping_pairs(left, top, right, bottom)
+
+            pairs = list(zip(first.tolist(), second.tolist()))
+            assert len(pairs) == len(set(pairs))
+            assert set(pairs) == brute_force_pairs(left, top, right, bottom)
+
+    def test_zero_size_boxes(self):
+        """Test boxes with no size sweep like any others."""
+        rng = np.random.default_rng(1)
+        left = rng.uniform(0, 100, 50)
+        top = rng.uniform(0, 100, 50)
+        size = np.zeros(50)
+        size[:5] = 30.0
+
+        first, second = overlapping_pairs(left, top, left + size, top + size)
+
+        pairs = set(zip(first.tolist(), second.tolist()))
+        assert pairs == brute_force_pairs(left, top, left + size, top + size)
+        assert not overlapping_pairs(left, top, left, top)[0].size
+
+    def test_touching_edges_do_not_overlap(self):
+        """Test boxes that only share an edge are not reported."""
+        left = np.array([0.0, 10.0, 0.0])
+        top = np.array([0.0, 0.0, 10.0])
+
+        first, _ = overlapping_pairs(left, top, left + 10, top + 10)
+
+        assert len(first) == 0
+
+
+class TestCollisionSystem:
+    """Test contact tracking."""
+
+    def test_find_pairs_matches_colliderect(self):
+        """Test pairs match pygame.Rect.colliderect on integer layouts."""
+        rng = random.Random(1)
+        store = EntityStore()
+        entities = [
+            MockEntity(rng.randrange(300), rng.randrange(300), 20, 20, store)
+            for _ in range(200)
+        ]
+
+        pairs = CollisionSystem().find_pairs(entities)
+
+        expected = [
+            (a, b)
+            for i, a in enumerate(entities)
+            for b in entities[i + 1 :]
+            if a.rect.colliderect(b.rect)
+        ]
+        assert pairs == expected
+
+    def test_inactive_entities_never_collide(self):
+        """Test inactive entities are skipped."""
+        a = MockEntity(0, 0, 10, 10)
+        b = MockEntity(5, 5, 10, 10)
+        b.active = False
+
+        assert CollisionSystem().find_pairs([a, b]) == []
+
+    def test_enter_stay_exit(self):
+        """Test a pair is reported as entering, staying, then exiting."""
+        store = EntityStore()
+        a = MockEntity(0, 0, 10, 10, store=store)
+        b = MockEntity(50, 0, 10, 10, store=store)
+        system = CollisionSystem()
+
+        system.update([a, b])
+        assert list(system.contacts()) == []
+
+        b.x = 5
+        system.update([a, b])
+        assert [c.event for c in system.contacts()] == [ENTER]
+        assert system.touching(a) == [b]
+
+        system.update([a, b])
+        assert [c.event for c in system.contacts()] == [STAY]
+
+        b.x = 50
+        system.update([a, b])
+        assert [(c.a, c.b, c.event) for c in system.contacts()] == [(a, b, EXIT)]
+        assert len(system) == 0
+
+    def test_removed_entity_exits(self):
+        """Test a removed entity's contacts are reported as exits."""
+        a = MockEntity(0, 0, 10, 10)
+        b = MockEntity(5, 0, 10, 10)
+        system = CollisionSystem()
+        system.update([a, b])
+
+        system.update([a])
+
+        assert [c.event for c in system.contacts()] == [EXIT]
+
+    def test_reordered_list_keeps_contacts(self):
+        """Test shuffling the entity list doesn't end and restart contacts."""
+        store = EntityStore()
+        a, b, c = (MockEntity(i * 5, 0, 10, 10, store=store) for i in range(3))
+        system = CollisionSystem()
+        system.update([a, b, c])
+
+        system.update([c, b, a])
+
+        assert {contact.event for contact in system.contacts()} == {STAY}
+        assert [(contact.a, contact.b) for contact in system.contacts()] == [
+            (a, b),
+            (b, c),
+        ]
+        mixed = MockEntity(3, 0, 10, 10, store=EntityStore())
+        system.update([mixed, c, a, b])
+        system.update([b, a, c, mixed])
+        assert {contact.event for contact in system.contacts()} == {STAY}
+
+    def test_narrowphase_rejects_pairs(self):
+        """Test the narrowphase callable filters broadphase pairs."""
+        a = MockEntity(0, 0, 10, 10)
+        b = MockEntity(5, 5, 10, 10)
+
+        system = CollisionSystem(narrowphase=lambda first, second: False)
+
+        assert system.find_pairs([a, b]) == []
@@ -0,0 +1,201 @@
+"""
+Tests for the game engine.
+"""
+
+import pygame
+import pytest
+
+from game.engine import GameEngine
+from game.input import ScriptedInput
+from game.scenes import GameScene
+from utils.constants import GAME_STATES
+
+
+class TestHeadlessEngine:
+    """Test the headless fast-forward API."""
+
+    def test_headless_uses_offscreen_surface(self):
+        """Test headless mode renders without opening a window."""
+        engine = GameEngine(headless=True)
+        engine.render()
+
+        assert engine.screen.get_size() == (800, 600)
+
+    def test_run_steps_advances_scene(self):
+        """Test fixed steps update the scene and the step counters."""
+        scene = GameScene()
+        engine = GameEngine(headless=True, scene=scene)
+        start = scene.enemies[0].position
+
+        engine.run_steps(10, dt=0.05)
+
+        assert engine.frame == 10
+        assert engine.sim_time == pytest.approx(0.5)
+        assert scene.enemies[0].position != start
+
+    def test_quitting_exits_scenes(self):
+        """Test the scenes on the stack get on_exit when the engine stops."""
+        scene = GameScene()
+        exits = []
+        scene.on_exit = lambda: exits.append(scene)
+        engine = GameEngine(headless=True, scene=scene)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+        engine.run()
+
+        assert exits == [scene]
+        assert engine.scene is None
+
+    def test_run_for_step_count(self):
+        """Test run_for takes the exact number of fixed steps."""
+        engine = GameEngine(headless=True, scene=GameScene())
+
+        steps = engine.run_for(1.0, dt=1.0 / 60)
+
+        assert steps == 60
+        assert engine.frame == 60
+
+    def test_run_steps_with_render(self):
+        """Test rendering can be enabled while fast-forwarding."""
+        engine = GameEngine(headless=True, scene=GameScene())
+        engine.run_steps(3, render=True)
+
+        assert engine.frame == 3
+
+    def test_invalid_dt(self):
+        """Test non-positive step sizes are rejected."""
+        engine = GameEngine(headless=True)
+        with pytest.raises(ValueError):
+            engine.run_steps(1, dt=0)
+        with pytest.raises(ValueError):
+            engine.run_for(1.0, dt=-1)
+
+
+class TestDirtyRectRendering:
+    """Test the opt-in dirty-rect render path."""
+
+    def test_first_frame_is_full_redraw(self):
+        """Test the first frame repaints the whole screen."""
+        engine = GameEngine(headless=True, scene=GameScene(), dirty_rects=True)
+        engine.render()
+
+        assert engine.changed_regions is None
+
+    def test_later_frames_report_moved_entities(self):
+        """Test only regions around moved entities are presented."""
+        scene = GameScene()
+        engine = GameEngine(headless=True, scene=scene, dirty_rects=True)
+        engine.render()
+        enemy = scene.enemies[0]
+        old_rect = enemy.rect
+
+        enemy.x += 10
+        engine.render()
+
+        regions = engine.changed_regions
+        assert len(regions) == len(scene.entities)
+        assert any(region.contains(old_rect.union(enemy.rect)) for region in regions)
+
+    def test_old_position_is_cleared(self):
+        """Test the area an entity left is erased to the background."""
+        scene = GameScene()
+        engine = GameEngine(headless=True, scene=scene, dirty_rects=True)
+        enemy = scene.enemies[0]
+        engine.render()
+        left_behind = (int(enemy.x), int(enemy.y))
+
+        enemy.x += 100
+        engine.render()
+
+        assert engine.screen.get_at(left_behind) == (0, 0, 0, 255)
+        assert engine.screen.get_at((int(enemy.x), int(enemy.y))) == enemy.color
+
+    def test_full_redraw_without_dirty_rects(self):
+        """Test the default mode always repaints the whole screen."""
+        engine = GameEngine(headless=True, scene=GameScene())
+        engine.render()
+        engine.render()
+
+        assert engine.changed_regions is None
+
+
+class TestSceneDriving:
+    """Test the engine drives its scene stack."""
+
+    def test_events_reach_the_scene(self):
+        """Test key presses are forwarded to the current scene."""
+        engine = GameEngine(headless=True, scene=GameScene())
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+
+        engine.handle_events()
+
+        assert engine.scenes.state == GAME_STATES["PAUSED"]
+
+    def test_scene_switch_forces_full_redraw(self):
+        """Test the first frame of a new scene redraws the whole screen."""
+        engine = GameEngine(headless=True, scene=GameScene(), dirty_rects=True)
+        engine.render()
+        engine.render()
+        assert engine.changed_regions is not None
+
+        engine.scene = GameScene()
+        engine.render()
+
+        assert engine.changed_regions is None
+
+
+class TestFixedTimestep:
+    """Test the accumulator-driven simulation loop."""
+
+    def test_steps_at_sim_rate(self):
+        """Test a 30 Hz simulation steps once every two 60 FPS frames."""
+        engine = GameEngine(headless=True, scene=GameScene(), sim_rate=30)
+
+        steps = [engine.advance(1.0 / 60) for _ in range(6)]
+
+        assert sum(steps) == 3
+        assert engine.sim_time == pytest.approx(0.1)
+
+    def test_leftover_time_sets_alpha(self):
+        """Test the carried-over fraction of a step becomes alpha."""
+        engine = GameEngine(headless=True, scene=GameScene(), sim_rate=10)
+
+        assert engine.advance(0.25) == 2
+        assert engine.alpha == pytest.approx(0.5)
+
+    def test_spiral_of_death_guard(self):
+        """Test a long stall runs at most max_steps and drops the rest."""
+        engine = GameEngine(headless=True, sim_rate=60, max_steps=4)
+
+        steps = engine.advance(1.0)
+
+        assert steps == 4
+        assert engine.accumulator < engine.sim_dt
+        assert engine.dropped_time > 0.9
+
+    def test_results_do_not_depend_on_frame_rate(self):
+        """Test the same game time gives the same state at any frame rate."""
+        checksums = []
+        for frame_time in (1.0 / 30, 1.0 / 60, 1.0 / 144):
+            scene = GameScene(controls=ScriptedInput([]))
+            engine = GameEngine(headless=True, scene=scene, sim_rate=60)
+            while engine.frame < 120:
+                engine.advance(frame_time)
+            checksums.append(scene.checksum())
+
+        assert len(set(checksums)) == 1
+
+    def test_render_interpolates_sprites(self):
+        """Test sprites are drawn between their last two simulated positions."""
+        scene = GameScene(controls=ScriptedInput([]))
+        engine = GameEngine(headless=True, scene=scene, sim_rate=10)
+        enemy = scene.enemies[0]
+        enemy.x, enemy.y = 100.0, 100.0
+        engine.advance(0.1)
+        start, end = scene.store.previous_x[enemy.row], enemy.x
+
+        engine.advance(0.05)
+        scene.interpolate(engine.alpha)
+        changed = scene.render(engine.screen)
+
+        assert changed[scene.entities.index(enemy)].x == int((start + end) / 2)
@@ -111,6 +111,22 @@ class TestPlayer:
         assert player.velocity_x == 0.0
         assert player.velocity_y == 0.0
 
+    def test_player_clamp_to_screen(self):
+        """Test the player is kept inside the screen."""
+        player = Player(-10, 1000)
+        player.clamp_to_screen()
+
+        assert player.x == 0
+        assert player.y == 600 - player.height
+
+    def test_player_clamp_to_world(self):
+        """Test the player is kept inside a world larger than the screen."""
+        player = Player(1500, -10)
+        player.clamp_to_world(2000, 1000)
+
+        assert player.x == 1500
+        assert player.y == 0
+
     def test_player_render(self, mock_screen):
         """Test player rendering."""
         player = Player(100, 100)
@@ -139,6 +155,22 @@ class TestEnemy:
         assert enemy.velocity_x > 0  # Moving right towards center
         assert enemy.velocity_y > 0  # Moving down towards center
 
+    def test_enemy_steer_does_not_move(self):
+        """Test steering sets velocity without moving the enemy."""
+        enemy = Enemy(0, 0)
+        enemy.steer(0.1)
+
+        assert enemy.velocity_x > 0
+        assert enemy.position == (0, 0)
+
+    def test_enemy_steers_to_center_of_given_world(self):
+        """Test enemies head for the center of the world they are in."""
+        enemy = Enemy(1000, 300)
+        enemy.steer(0.1, 4000, 600)
+
+        assert enemy.velocity_x == 100.0
+        assert enemy.velocity_y == 0.0
+
     def test_enemy_render(self, mock_screen):
         """Test enemy rendering."""
         enemy = Enemy(200, 200)
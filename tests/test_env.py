@@ -0,0 +1,142 @@
+"""
+Tests for vectorized GameScene environments.
+"""
+
+import numpy as np
+import pytest
+
+from ai.env import (
+    ACTION_SIZE,
+    CATCH_REWARD,
+    OBSERVATION_SIZE,
+    GameEnvBatch,
+    VecGameEnv,
+)
+from utils.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def random_actions(env, steps: int, seed: int = 0) -> list[np.ndarray]:
+    """Generate a sequence of random action batches for an environment."""
+    rng = np.random.default_rng(seed)
+    return [rng.uniform(-1.0, 1.0, env.action_shape) for _ in range(steps)]
+
+
+class TestGameEnvBatch:
+    """Test the GameEnvBatch class."""
+
+    def test_shapes(self):
+        """Test observations, rewards and flags are batched per environment."""
+        batch = GameEnvBatch(3, enemies=5, seed=1)
+        observations = batch.reset()
+        assert observations.shape == (3, 5, OBSERVATION_SIZE)
+        assert observations.dtype == np.float32
+        assert batch.action_shape == (3, 5, ACTION_SIZE)
+
+        observations, rewards, terminated, truncated, _ = batch.step(
+            np.zeros(batch.action_shape)
+        )
+        assert observations.shape == (3, 5, OBSERVATION_SIZE)
+        assert rewards.shape == terminated.shape == truncated.shape == (3,)
+
+    def test_rejects_wrong_action_shape(self):
+        """Test actions must cover every enemy of every environment."""
+        batch = GameEnvBatch(2, enemies=3, seed=1)
+        batch.reset()
+        with pytest.raises(ValueError):
+            batch.step(np.zeros((2, 2, ACTION_SIZE)))
+
+    def test_environments_share_one_store(self):
+        """Test every scene lives on the batch's store with the asked enemy count."""
+        batch = GameEnvBatch(4, enemies=3, seed=1)
+        for scene in batch.scenes:
+            assert scene.store is batch.store
+            assert len(scene.enemies) == 3
+
+    def test_actions_steer_enemies(self):
+        """Test an enemy moves in the direction of its action."""
+        batch = GameEnvBatch(1, enemies=1, seed=2)
+        before = batch.reset()
+        actions = np.ones(batch.action_shape)
+        after, *_ = batch.step(actions)
+        ex, ey = before[0, 0, :2]
+        if ex < 0.9 and ey < 0.9:
+            assert after[0, 0, 0] > ex
+            assert after[0, 0, 1] > ey
+        assert after[0, 0, 2] == pytest.approx(1.0)
+
+    def test_entities_stay_on_screen(self):
+        """Test players and enemies are clamped to the screen."""
+        batch = GameEnvBatch(4, enemies=2, seed=3)
+        batch.reset()
+        for actions in random_actions(batch, 200):
+            batch.step(actions * 50)
+        x, y = batch.store.view("x"), batch.store.view("y")
+        rows = np.concatenate([batch.player_rows, batch.enemy_rows.ravel()])
+        assert np.all((x[rows] >= 0) & (x[rows] <= SCREEN_WIDTH))
+        assert np.all((y[rows] >= 0) & (y[rows] <= SCREEN_HEIGHT))
+
+    def test_catch_terminates_and_resets(self):
+        """Test catching the player ends the episode and restarts it."""
+        batch = GameEnvBatch(2, enemies=1, seed=4)
+        batch.reset()
+        player = batch.scenes[0].player
+        enemy = batch.scenes[0].enemies[0]
+        enemy.x, enemy.y = player.x, player.y
+
+        observations, rewards, terminated, truncated, info = batch.step(
+            np.zeros(batch.action_shape)
+        )
+        assert terminated.tolist() == [True, False]
+        assert not truncated.any()
+        assert rewards[0] > CATCH_REWARD - 0.1
+        assert info["_final_observation"].tolist() == [True, False]
+        assert batch.episode_steps[0] == 0
+        assert not np.array_equal(observations[0], info["final_observation"][0])
+
+    def test_truncates_long_episodes(self):
+        """Test episodes end after max_episode_steps."""
+        batch = GameEnvBatch(2, enemies=1, seed=5, max_episode_steps=3)
+        batch.reset()
+        actions = np.zeros(batch.action_shape)
+        for _ in range(2):
+            *_, truncated, info = batch.step(actions)
+            assert not truncated.any()
+        _, _, terminated, truncated, info = batch.step(actions)
+        assert (truncated | terminated).all()
+        assert info["_final_observation"].all()
+
+
+class TestVecGameEnv:
+    """Test the VecGameEnv class."""
+
+    def test_same_seed_same_episodes(self):
+        """Test two environments with the same seed step identically."""
+        first = VecGameEnv(3, enemies=2, seed=9)
+        second = VecGameEnv(3, enemies=2, seed=9)
+        assert np.array_equal(first.reset()[0], second.reset()[0])
+        for actions in random_actions(first, 50):
+            for a, b in zip(first.step(actions)[:4], second.step(actions)[:4]):
+                assert np.array_equal(a, b)
+
+    def test_reset_seed_restarts_episodes(self):
+        """Test reset with a seed replays the same episode."""
+        env = VecGameEnv(2, enemies=2)
+        first, _ = env.reset(seed=11)
+        env.step(np.zeros(env.action_shape))
+        second, _ = env.reset(seed=11)
+        assert np.array_equal(first, second)
+
+    def test_workers_match_in_process(self):
+        """Test worker processes produce the in-process results."""
+        actions = random_actions(VecGameEnv(5, enemies=2), 40, seed=1)
+        local = VecGameEnv(5, enemies=2, seed=3, max_episode_steps=15)
+        with VecGameEnv(5, enemies=2, workers=2, seed=3, max_episode_steps=15) as env:
+            assert np.array_equal(local.reset()[0], env.reset()[0])
+            for batch in actions:
+                expected = local.step(batch)
+                result = env.step(batch)
+                for a, b in zip(expected[:4], result[:4]):
+                    assert np.array_equal(a, b)
+                assert expected[4].keys() == result[4].keys()
+                for key, value in expected[4].items():
+                    assert np.array_equal(value, result[4][key])
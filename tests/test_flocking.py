@@ -0,0 +1,121 @@
+"""
+Tests for the batched flocking system.
+"""
+
+import random
+
+import pytest
+
+from ai.agents import FlockingAI
+from ai.flocking import FlockingSystem
+from game.entities import Entity
+
+
+class MockEntity(Entity):
+    """Mock entity for testing."""
+
+    def update(self, dt):
+        pass
+
+    def render(self, screen):
+        pass
+
+
+def make_flock(count: int, extent: float, seed: int = 0) -> list[MockEntity]:
+    """Create randomly placed entities with random velocities."""
+    rng = random.Random(seed)
+    flock = []
+    for _ in range(count):
+        entity = MockEntity(rng.uniform(-extent, extent), rng.uniform(0, extent), 5, 5)
+        entity.velocity_x = rng.uniform(-50, 50)
+        entity.velocity_y = rng.uniform(-50, 50)
+        flock.append(entity)
+    return flock
+
+
+def per_agent_velocities(agents, entities) -> list[tuple[float, float]]:
+    """Run FlockingAI.update for each agent against the same snapshot."""
+    results = []
+    for agent in agents:
+        saved = (agent.entity.velocity_x, agent.entity.velocity_y)
+        agent.update(0.016, {"entities": entities})
+        results.append((agent.entity.velocity_x, agent.entity.velocity_y))
+        agent.entity.velocity_x, agent.entity.velocity_y = saved
+    return results
+
+
+class TestFlockingSystem:
+    """Test the FlockingSystem batch path."""
+
+    @pytest.mark.parametrize("extent", [150.0, 600.0, 5000.0])
+    def test_matches_per_agent_update(self, extent):
+        """Test batched velocities match per-agent FlockingAI results."""
+        entities = make_flock(200, extent)
+        agents = [FlockingAI(entity) for entity in entities]
+        expected = per_agent_velocities(agents, entities)
+
+        system = FlockingSystem()
+        for agent in agents:
+            system.add(agent)
+        system.update(0.016, {"entities": entities})
+
+        for agent, (vx, vy) in zip(agents, expected):
+            assert agent.entity.velocity_x == pytest.approx(vx, abs=1e-9)
+            assert agent.entity.velocity_y == pytest.approx(vy, abs=1e-9)
+
+    def test_matches_with_mixed_agent_settings(self):
+        """Test per-agent radius, weights and speed are honored."""
+        entities = make_flock(120, 300.0, seed=3)
+        agents = []
+        for i, entity in enumerate(entities[:60]):
+            agent = FlockingAI(entity, speed=40.0 + i)
+            agent.neighbor_radius = 50.0 + (i % 3) * 40.0
+            agent.cohesion_weight = 0.5 * (i % 4)
+            agents.append(agent)
+        expected = per_agent_velocities(agents, entities)
+
+        system = FlockingSystem()
+        for agent in agents:
+            system.add(agent)
+        vel_x, vel_y = system.compute_velocities(agents, entities)
+
+        for i, (vx, vy) in enumerate(expected):
+            assert vel_x[i] == pytest.approx(vx, abs=1e-9)
+            assert vel_y[i] == pytest.approx(vy, abs=1e-9)
+
+    def test_isolated_agent_keeps_velocity(self):
+        """Test an agent without neighbors keeps its velocity."""
+        entity = MockEntity(0, 0, 5, 5)
+        entity.velocity_x = 12.0
+        far = MockEntity(1000, 1000, 5, 5)
+        system = FlockingSystem()
+        system.add(FlockingAI(entity))
+
+        system.update(0.016, {"entities": [entity, far]})
+
+        assert entity.velocity_x == 12.0
+        assert entity.velocity_y == 0.0
+
+    def test_inactive_agents_are_skipped(self):
+        """Test inactive agents are not steered."""
+        entity = MockEntity(0, 0, 5, 5)
+        neighbor = MockEntity(10, 0, 5, 5)
+        agent = FlockingAI(entity)
+        agent.active = False
+        system = FlockingSystem()
+        system.add(agent)
+
+        system.update(0.016, {"entities": [entity, neighbor]})
+
+        assert entity.velocity_x == 0.0
+        assert entity.velocity_y == 0.0
+
+    def test_add_and_remove(self):
+        """Test registering and unregistering agents."""
+        system = FlockingSystem()
+        agent = FlockingAI(MockEntity(0, 0, 5, 5))
+
+        system.add(agent)
+        assert len(system) == 1
+        system.remove(agent)
+        assert len(system) == 0
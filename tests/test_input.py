@@ -0,0 +1,56 @@
+"""
+Tests for input sources.
+"""
+
+import pygame
+
+from game.entities import Player
+from game.input import (
+    ACTION_BITS,
+    KeyboardInput,
+    RecordingInput,
+    ScriptedInput,
+    actions_to_bits,
+)
+
+
+class TestInputSources:
+    """Test the input sources."""
+
+    def test_keyboard_maps_movement_keys(self, monkeypatch):
+        """Test keyboard input sets the bit of each held movement key."""
+        held = {pygame.K_a, pygame.K_DOWN}
+
+        class MockKeys:
+            def __getitem__(self, key):
+                return key in held
+
+        monkeypatch.setattr(pygame.key, "get_pressed", MockKeys)
+        source = KeyboardInput()
+
+        assert source.poll() == actions_to_bits(["LEFT", "DOWN"])
+        assert source.pressed("LEFT") and not source.pressed("RIGHT")
+
+    def test_scripted_input_releases_after_script(self):
+        """Test scripted input plays its frames, then presses nothing."""
+        source = ScriptedInput([ACTION_BITS["UP"]])
+
+        assert source.poll() == ACTION_BITS["UP"]
+        assert source.poll() == 0
+
+    def test_recording_input_passes_through(self):
+        """Test recording input returns and records the wrapped source's bits."""
+        frames = [ACTION_BITS["UP"], actions_to_bits(["LEFT", "DOWN"])]
+        source = RecordingInput(ScriptedInput(frames))
+
+        assert [source.poll(), source.poll()] == frames
+        assert source.frames == frames
+
+    def test_player_steers_from_controls(self):
+        """Test the player's velocity follows its input source."""
+        player = Player(0, 0, controls=ScriptedInput([ACTION_BITS["RIGHT"]]))
+
+        player.steer(0.016)
+
+        assert player.velocity_x == player.speed
+        assert player.velocity_y == 0.0
@@ -0,0 +1,159 @@
+"""
+Tests for grid navigation and flow fields.
+"""
+
+import heapq
+import math
+import pickle
+
+import numpy as np
+import pytest
+
+from ai.navigation import NavigationGrid
+
+
+def dijkstra_distances(blocked: np.ndarray, target: tuple[int, int]) -> np.ndarray:
+    """Find path lengths to a cell with a plain 8-connected Dijkstra."""
+    rows, cols = blocked.shape
+    distances = np.full((rows, cols), math.inf)
+    tx, ty = target
+    distances[ty, tx] = 0.0
+    heap = [(0.0, tx, ty)]
+    while heap:
+        distance, x, y = heapq.heappop(heap)
+        if distance > distances[y, x]:
+            continue
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < cols and 0 <= ny < rows) or blocked[ny, nx]:
+                    continue
+                if dx and dy and (blocked[y, nx] or blocked[ny, x]):
+                    continue
+                candidate = distance + math.hypot(dx, dy)
+                if candidate < distances[ny, nx]:
+                    distances[ny, nx] = candidate
+                    heapq.heappush(heap, (candidate, nx, ny))
+    return distances
+
+
+class TestNavigationGrid:
+    """Test the NavigationGrid and its flow fields."""
+
+    def test_invalid_cell_size(self):
+        """Test that a non-positive cell size is rejected."""
+        with pytest.raises(ValueError):
+            NavigationGrid(cell_size=0)
+
+    def test_cell_of_clamps_to_grid(self):
+        """Test positions outside the grid map to edge cells."""
+        grid = NavigationGrid(100, 50, 10)
+        assert grid.cell_of(-5, -5) == (0, 0)
+        assert grid.cell_of(1000, 1000) == (9, 4)
+
+    def test_open_grid_distances(self):
+        """Test distances on an open grid count diagonal steps as sqrt(2)."""
+        grid = NavigationGrid(100, 100, 10)
+
+        field = grid.flow_field(5, 5)
+
+        assert field.distance_at(5, 5) == 0.0
+        assert field.distance_at(35, 5) == pytest.approx(3.0)
+        assert field.distance_at(35, 35) == pytest.approx(3 * math.sqrt(2))
+
+    def test_path_goes_around_wall(self):
+        """Test the field routes around a wall instead of through it."""
+        grid = NavigationGrid(100, 100, 10)
+        # Vertical wall at column 5 with a gap in the bottom row
+        grid.set_blocked(50, 0, 10, 90)
+
+        field = grid.flow_field(85, 5)
+
+        # Straight-line distance would be 7 cells; the detour is longer
+        assert field.distance_at(15, 5) > 10
+        # From the left of the wall the first step heads down, not right
+        waypoint = field.waypoint(45, 5)
+        assert waypoint is not None and waypoint[1] > 5
+
+    def test_matches_dijkstra(self):
+        """Test fields on cluttered grids match Dijkstra and lead downhill."""
+        rng = np.random.default_rng(0)
+        for density in (0.1, 0.3):
+            grid = NavigationGrid(400, 300, 10)
+            grid.blocked[:] = rng.random((30, 40)) < density
+            grid.blocked[3:27, 20] = True
+            grid.blocked[15, 5] = False
+
+            field = grid.flow_field(55, 155)
+
+            expected = dijkstra_distances(grid.blocked, (5, 15)).ravel()
+            actual = np.array(field.distances)
+            assert np.array_equal(np.isinf(actual), np.isinf(expected))
+            reachable = np.isfinite(expected)
+            assert actual[reachable] == pytest.approx(expected[reachable])
+            for index in np.flatnonzero(reachable).tolist():
+                step = field.next_cell[index]
+                assert step == index or actual[step] < actual[index]
+
+    def test_unreachable_has_no_waypoint(self):
+        """Test cells cut off from the target get no waypoint."""
+        grid = NavigationGrid(100, 100, 10)
+        grid.set_blocked(50, 0, 10, 100)
+
+        field = grid.flow_field(85, 5)
+
+        assert field.distance_at(15, 5) == math.inf
+        assert field.waypoint(15, 5) is None
+
+    def test_fields_are_cached_per_target_cell(self):
+        """Test a field is rebuilt only when the target cell or obstacles change."""
+        grid = NavigationGrid(100, 100, 10)
+
+        first = grid.flow_field(11, 11)
+        assert grid.flow_field(19, 19) is first
+        assert grid.builds == 1
+
+        grid.flow_field(31, 11)
+        assert grid.builds == 2
+
+        grid.set_blocked(50, 50, 10, 10)
+        assert grid.flow_field(11, 11) is not first
+        assert grid.builds == 3
+
+    def test_fields_reach_only_their_radius(self):
+        """Test cells beyond a field's radius have no path to the target."""
+        grid = NavigationGrid(1000, 100, 10, field_radius=5)
+
+        field = grid.flow_field(5, 5)
+
+        assert field.distance_at(45, 5) == pytest.approx(4.0)
+        assert field.distance_at(75, 5) == math.inf
+        assert field.waypoint(75, 5) is None
+        assert len(field.distances) == 6 * 6
+        assert field.waypoint(45, 45) == (35.0, 35.0)
+
+    def test_only_overlapping_fields_are_rebuilt(self):
+        """Test obstacle changes only invalidate fields whose window they touch."""
+        grid = NavigationGrid(1000, 100, 10, field_radius=5)
+        near, far = grid.flow_field(5, 5), grid.flow_field(905, 5)
+
+        grid.set_cells(88, 0, np.ones((2, 2), bool))
+        version = grid.version
+        grid.set_cells(88, 0, np.ones((2, 2), bool))
+
+        assert grid.version == version
+        assert grid.flow_field(5, 5) is near
+        assert grid.flow_field(905, 5) is not far
+        assert grid.builds == 3
+
+    def test_pickle_drops_cached_fields(self):
+        """Test pickled grids carry obstacles but not cached fields."""
+        grid = NavigationGrid(100, 100, 10)
+        grid.set_blocked(0, 0, 10, 10)
+        grid.flow_field(55, 55)
+
+        copy = pickle.loads(pickle.dumps(grid))
+
+        assert copy.is_blocked(5, 5)
+        assert copy.flow_field(55, 55) is not None
+        assert copy.builds == 2
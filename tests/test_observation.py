@@ -0,0 +1,115 @@
+"""
+Tests for scene observations.
+"""
+
+import numpy as np
+import pygame
+
+from ai.env import GameEnvBatch
+from ai.observation import (
+    ENEMY_CHANNEL,
+    PLAYER_CHANNEL,
+    SceneObserver,
+    occupancy_grid,
+)
+from game.entities import Enemy
+from game.scenes import GameScene
+from game.store import EntityStore
+
+
+class TestOccupancyGrid:
+    """Test the occupancy_grid function."""
+
+    def test_marks_cells_under_boxes(self):
+        """Test every cell an entity's box touches is set, and only those."""
+        store = EntityStore()
+        enemy = Enemy(0, 0, store)
+        enemy.x, enemy.y = 100.0, 60.0
+        grid = occupancy_grid(store, [enemy.row], (80, 60))
+
+        # 10x10 pixel cells: the 24 pixel enemy covers columns 10-12, rows 6-8
+        assert grid.shape == (60, 80)
+        assert grid.sum() == 9
+        assert grid[6:9, 10:13].all()
+
+    def test_skips_inactive_and_off_screen_entities(self):
+        """Test inactive and off-screen entities leave the grid empty."""
+        store = EntityStore()
+        hidden = Enemy(100, 100, store)
+        hidden.active = False
+        away = Enemy(-500, 100, store)
+        grid = occupancy_grid(store, [hidden.row, away.row], (80, 60))
+        assert not grid.any()
+
+    def test_keeps_leading_dimensions(self):
+        """Test batched rows give one grid per leading index."""
+        batch = GameEnvBatch(3, enemies=2, seed=1)
+        batch.reset()
+        grids = occupancy_grid(batch.store, batch.enemy_rows, (40, 30))
+        assert grids.shape == (3, 30, 40)
+        for env, scene in enumerate(batch.scenes):
+            rows = [enemy.row for enemy in scene.enemies]
+            expected = occupancy_grid(batch.store, rows, (40, 30))
+            assert np.array_equal(grids[env], expected)
+
+    def test_reuses_output_buffer(self):
+        """Test an output buffer is cleared and filled in place."""
+        store = EntityStore()
+        enemy = Enemy(0, 0, store)
+        out = np.ones((60, 80), dtype=np.uint8)
+        result = occupancy_grid(store, [enemy.row], (80, 60), out=out)
+        assert result is out
+        assert out.sum() == 9
+
+
+class TestSceneObserver:
+    """Test the SceneObserver class."""
+
+    def test_observe_returns_surface_view(self):
+        """Test frames are views of the observer's surface, not copies."""
+        observer = SceneObserver((40, 30))
+        frame = observer.observe(GameScene())
+        assert frame.shape == (30, 40, 3)
+        assert np.shares_memory(frame, observer.pixels)
+        assert frame.base is not None
+        assert frame.any()
+
+    def test_frames_update_in_place(self):
+        """Test the same view shows the scene's new state after observing again."""
+        scene = GameScene()
+        observer = SceneObserver((40, 30))
+        first = observer.observe(scene).copy()
+        for enemy in scene.enemies:
+            enemy.active = False
+        scene.player.active = False
+        frame = observer.observe(scene)
+        assert first.any()
+        assert not frame.any()
+
+    def test_grayscale(self):
+        """Test grayscale frames are two-dimensional brightness views."""
+        scene = GameScene()
+        observer = SceneObserver((40, 30), grayscale=True)
+        color = SceneObserver((40, 30)).observe(scene)
+        frame = observer.observe(scene)
+        assert frame.shape == (30, 40)
+        assert np.array_equal(frame > 0, color.max(axis=2) > 0)
+
+    def test_draw_keeps_dirty_rects(self):
+        """Test observing a scene doesn't change what the screen redraws."""
+        scene = GameScene()
+        screen = pygame.Surface((800, 600))
+        scene.render(screen)
+        scene.player.x += 50
+        SceneObserver((40, 30)).observe(scene)
+        changed = scene.render(screen)
+        assert any(rect.width > scene.player.width for rect in changed)
+
+    def test_occupancy_channels(self):
+        """Test the player and enemies land in their own channels."""
+        scene = GameScene()
+        grid = SceneObserver((80, 60)).occupancy(scene)
+        assert grid.shape == (2, 60, 80)
+        player = occupancy_grid(scene.store, [scene.player.row], (80, 60))
+        assert np.array_equal(grid[PLAYER_CHANNEL], player)
+        assert grid[ENEMY_CHANNEL].sum() == 9 * len(scene.enemies)
@@ -0,0 +1,168 @@
+"""
+Tests for parallel AI stepping.
+"""
+
+import random
+
+import pytest
+
+from ai.agents import ChasingAI, FlockingAI, SimpleAI
+from ai.parallel import ParallelAIExecutor
+from ai.policy import MLPPolicy, PolicyAI
+from game.entities import Enemy
+from game.scenes import GameScene
+from game.spatial import SpatialHash
+from game.store import EntityStore
+
+
+def make_world(count: int) -> tuple[EntityStore, list[Enemy]]:
+    """Create a store with randomly placed, moving enemies."""
+    rng = random.Random(7)
+    store = EntityStore()
+    enemies = []
+    for _ in range(count):
+        enemy = Enemy(rng.uniform(0, 300), rng.uniform(0, 300), store)
+        enemy.velocity_x = rng.uniform(-20, 20)
+        enemy.velocity_y = rng.uniform(-20, 20)
+        enemies.append(enemy)
+    return store, enemies
+
+
+class TestParallelAIExecutor:
+    """Test the ParallelAIExecutor."""
+
+    def test_matches_serial_snapshot_update(self):
+        """Test worker results equal serial updates against the same snapshot."""
+        store, enemies = make_world(40)
+        agents = [
+            FlockingAI(enemy) if i % 2 else ChasingAI(enemy)
+            for i, enemy in enumerate(enemies)
+        ]
+        for agent in agents:
+            if isinstance(agent, ChasingAI):
+                agent.set_target(enemies[0])
+
+        snapshot = [(e.velocity_x, e.velocity_y) for e in enemies]
+        spatial_hash = SpatialHash()
+        spatial_hash.rebuild(enemies)
+        expected = []
+        for agent, saved in zip(agents, snapshot):
+            agent.update(0.016, {"entities": enemies, "spatial_hash": spatial_hash})
+            expected.append((agent.entity.velocity_x, agent.entity.velocity_y))
+            agent.entity.velocity_x, agent.entity.velocity_y = saved
+
+        with ParallelAIExecutor(store, workers=2) as executor:
+            executor.start(agents)
+            executor.update(0.016, {"entities": enemies})
+
+        for enemy, (vx, vy) in zip(enemies, expected):
+            assert enemy.velocity_x == pytest.approx(vx, abs=1e-9)
+            assert enemy.velocity_y == pytest.approx(vy, abs=1e-9)
+
+    def test_agent_state_syncs_back_and_store_can_grow(self):
+        """Test worker-side agent state returns on stop, across store growth."""
+        store, enemies = make_world(3)
+        agent = SimpleAI(enemies[0])
+        executor = ParallelAIExecutor(store, workers=1)
+        executor.start([agent])
+
+        executor.update(0.5, {"entities": enemies})
+        enemies.extend(Enemy(0, 0, store) for _ in range(10))
+        executor.update(0.5, {"entities": enemies})
+        executor.stop()
+
+        assert not executor.running
+        assert agent.direction_change_timer == pytest.approx(1.0)
+        assert agent.entity is enemies[0]
+
+    def test_due_agents_step_by_their_own_dt(self):
+        """Test only due agents step, and discarded agents step locally."""
+        store, enemies = make_world(3)
+        agents = [SimpleAI(enemy) for enemy in enemies]
+        executor = ParallelAIExecutor(store, workers=2)
+        executor.start(agents[:2])
+
+        executor.update(0.1, {"entities": enemies}, due=[(agents[1], 0.25)])
+        executor.discard(agents[0])
+        executor.update(0.1, {"entities": enemies}, due=[(agents[0], 0.5)])
+        executor.update(0.1, {"entities": enemies}, due=[(agents[2], 0.75)])
+        executor.stop()
+
+        timers = [agent.direction_change_timer for agent in agents]
+        assert timers == [pytest.approx(0.5), pytest.approx(0.25), pytest.approx(0.75)]
+
+    def test_discarded_agents_skip_full_steps(self):
+        """Test stepping every agent leaves discarded agents' entities alone."""
+        store, enemies = make_world(3)
+        agents = [SimpleAI(enemy, seed=i) for i, enemy in enumerate(enemies)]
+        executor = ParallelAIExecutor(store, workers=2)
+        executor.start(agents)
+
+        executor.discard(agents[1])
+        # Its row now belongs to someone else, e.g. after despawn and reuse
+        enemies[1].velocity_x = enemies[1].velocity_y = 7.0
+        executor.update(5.0, {"entities": enemies})
+        executor.stop()
+
+        assert (enemies[1].velocity_x, enemies[1].velocity_y) == (7.0, 7.0)
+        assert agents[1].direction_change_timer == 0.0
+        assert agents[0].direction_change_timer == 0.0  # Turned after 5 s
+        assert (enemies[0].velocity_x, enemies[0].velocity_y) != (7.0, 7.0)
+
+    def test_rejects_policy_agents(self):
+        """Test agents sharing a policy can't be split across workers."""
+        store, enemies = make_world(1)
+        agent = PolicyAI(enemies[0], MLPPolicy.random((4,), seed=0))
+
+        with pytest.raises(ValueError):
+            ParallelAIExecutor(store, workers=1).start([agent])
+
+    def test_rejects_foreign_entities(self):
+        """Test agents must use entities from the executor's store."""
+        store, _ = make_world(1)
+        agent = SimpleAI(Enemy(0, 0, EntityStore()))
+
+        with pytest.raises(ValueError):
+            ParallelAIExecutor(store, workers=1).start([agent])
+
+    def test_update_requires_start(self):
+        """Test updating before start is an error."""
+        with pytest.raises(RuntimeError):
+            ParallelAIExecutor(EntityStore()).update(0.1, {})
+
+    def test_game_scene_parallel_mode(self):
+        """Test a scene steps scheduled agents in workers and batches the rest."""
+        scene = GameScene()
+        chaser = ChasingAI(scene.enemies[0])
+        chaser.set_target(scene.player)
+        scene.add_agent(chaser)
+        policy = MLPPolicy.random((4,), seed=0)
+        scene.add_agent(PolicyAI(scene.spawn_enemy(10, 10), policy))
+        scene.add_agent(FlockingAI(scene.spawn_enemy(20, 20)))
+
+        scene.start_parallel_ai(workers=1)
+        try:
+            assert scene.parallel.agents == [chaser]
+            scene.update(0.1)
+        finally:
+            scene.stop_parallel_ai()
+
+        assert scene.enemies[0].velocity_x < 0
+        assert scene.parallel is None
+        assert scene.agents[1].policy is policy
+
+    def test_game_scene_parallel_keeps_rates(self):
+        """Test agents in workers update at their scheduled rate."""
+        scene = GameScene()
+        agent = SimpleAI(scene.enemies[0])
+        scene.add_agent(agent, rate=10)
+
+        scene.start_parallel_ai(workers=1)
+        try:
+            for _ in range(30):
+                scene.update(1 / 60)
+                assert scene.scheduler.updates_last_frame <= 1
+        finally:
+            scene.stop_parallel_ai()
+
+        assert agent.direction_change_timer == pytest.approx(0.5)
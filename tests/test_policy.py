@@ -0,0 +1,173 @@
+"""
+Tests for learned policy agents.
+"""
+
+import numpy as np
+import pytest
+
+from ai.env import GameEnvBatch
+from ai.policy import (
+    ACTION_SIZE,
+    OBSERVATION_SIZE,
+    MLPPolicy,
+    PolicyAI,
+    PolicySystem,
+    get_default_policy,
+)
+from game.entities import Enemy, Player
+from game.scenes import GameScene
+from game.snapshot import WorldSnapshot
+from game.store import EntityStore
+from utils.constants import ENEMY_SPEED
+
+
+def make_agents(count: int, policy: MLPPolicy) -> tuple[Player, list[PolicyAI]]:
+    """Create a player and policy agents spread over one store."""
+    rng = np.random.default_rng(5)
+    store = EntityStore()
+    player = Player(400, 300, store)
+    agents = []
+    for _ in range(count):
+        enemy = Enemy(rng.uniform(0, 780), rng.uniform(0, 580), store)
+        enemy.velocity_x = rng.uniform(-50, 50)
+        agents.append(PolicyAI(enemy, policy))
+    return player, agents
+
+
+class TestMLPPolicy:
+    """Test the MLPPolicy class."""
+
+    def test_forward_shapes_and_range(self):
+        """Test a batch of observations maps to bounded actions."""
+        policy = MLPPolicy.random((16,), seed=1)
+        observations = np.random.default_rng(0).normal(size=(10, OBSERVATION_SIZE))
+        actions = policy.forward(observations)
+        assert actions.shape == (10, ACTION_SIZE)
+        assert actions.dtype == np.float32
+        assert np.all(np.abs(actions) <= 1.0)
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved policy loads with identical outputs."""
+        policy = MLPPolicy.random((16, 8), seed=2)
+        path = tmp_path / "policy.npz"
+        policy.save(path)
+        loaded = MLPPolicy.load(path)
+        observations = np.ones((3, OBSERVATION_SIZE))
+        assert len(loaded.weights) == 3
+        assert np.array_equal(
+            policy.forward(observations), loaded.forward(observations)
+        )
+
+    def test_rejects_mismatched_layers(self):
+        """Test layers whose shapes don't chain are refused."""
+        with pytest.raises(ValueError):
+            MLPPolicy([np.zeros((8, 4)), np.zeros((5, 2))], [np.zeros(4), np.zeros(2)])
+        with pytest.raises(ValueError):
+            MLPPolicy([np.zeros((8, 4))], [np.zeros(3)])
+
+
+class TestPolicyAI:
+    """Test the PolicyAI class."""
+
+    def test_default_policy_is_shared(self):
+        """Test agents created without a policy share the default one."""
+        store = EntityStore()
+        first = PolicyAI(Enemy(0, 0, store))
+        second = PolicyAI(Enemy(10, 10, store))
+        assert first.policy is second.policy is get_default_policy()
+
+    def test_update_sets_velocity_from_action(self):
+        """Test an agent steers with its policy's action times its speed."""
+        policy = MLPPolicy.random(seed=3)
+        player, (agent,) = make_agents(1, policy)
+        action = policy.forward(agent.observe(player)[None])[0]
+        agent.update(0.016, {"player": player})
+        assert agent.entity.velocity_x == pytest.approx(action[0] * ENEMY_SPEED)
+        assert agent.entity.velocity_y == pytest.approx(action[1] * ENEMY_SPEED)
+
+    def test_observation_matches_environment(self):
+        """Test agents observe what training environments report."""
+        batch = GameEnvBatch(1, enemies=2, seed=4)
+        observations = batch.reset()
+        scene = batch.scenes[0]
+        for index, enemy in enumerate(scene.enemies):
+            agent = PolicyAI(enemy)
+            assert np.allclose(agent.observe(scene.player), observations[0, index])
+
+
+class TestPolicySystem:
+    """Test the PolicySystem class."""
+
+    def test_batch_matches_per_agent_updates(self):
+        """Test the batched pass gives each agent its own update's velocity."""
+        policy = MLPPolicy.random(seed=6)
+        player, agents = make_agents(50, policy)
+        saved = [(a.entity.velocity_x, a.entity.velocity_y) for a in agents]
+        expected = []
+        for agent, (vx, vy) in zip(agents, saved):
+            agent.update(0.016, {"player": player})
+            expected.append((agent.entity.velocity_x, agent.entity.velocity_y))
+            agent.entity.velocity_x, agent.entity.velocity_y = vx, vy
+
+        system = PolicySystem()
+        for agent in agents:
+            system.add(agent)
+        system.update(0.016, {"player": player})
+        for agent, (vx, vy) in zip(agents, expected):
+            assert agent.entity.velocity_x == pytest.approx(vx, abs=1e-4)
+            assert agent.entity.velocity_y == pytest.approx(vy, abs=1e-4)
+
+    def test_observes_scene_world_size(self):
+        """Test positions are scaled by the scene's world, not the default one."""
+        scene = GameScene(world_size=(4000, 3000))
+        agent = PolicyAI(scene.enemies[0])
+        observation = agent.observe(scene.player, (4000, 3000))
+        assert observation[0] == pytest.approx(scene.enemies[0].x / 4000)
+
+        policy = agent.policy
+        expected = policy.forward(observation[None])[0] * agent.speed
+        system = PolicySystem()
+        system.add(agent)
+        system.update(0.016, scene.game_state)
+        assert agent.entity.velocity_x == pytest.approx(expected[0], abs=1e-4)
+        assert agent.entity.velocity_y == pytest.approx(expected[1], abs=1e-4)
+
+    def test_one_forward_pass_per_policy(self, monkeypatch):
+        """Test agents sharing a policy are evaluated in a single call."""
+        first, second = MLPPolicy.random(seed=7), MLPPolicy.random(seed=8)
+        player, agents = make_agents(20, first)
+        for agent in agents[::2]:
+            agent.policy = second
+        calls = []
+        for policy in (first, second):
+            forward = policy.forward
+            monkeypatch.setattr(
+                policy,
+                "forward",
+                lambda obs, f=forward: calls.append(len(obs)) or f(obs),
+            )
+
+        system = PolicySystem()
+        for agent in agents:
+            system.add(agent)
+        agents[1].active = False
+        system.update(0.016, {"player": player})
+        assert sorted(calls) == [9, 10]
+
+    def test_scene_steps_policy_agents(self):
+        """Test scenes batch policy agents and keep them through snapshots."""
+        scene = GameScene()
+        for index in range(5):
+            scene.spawn_enemy(100.0 * index, 50.0, PolicyAI)
+        assert len(scene.policies) == 5
+        before = WorldSnapshot.capture(scene)
+        scene.update(0.016)
+        moved = [enemy.velocity_x for enemy in scene.enemies[2:]]
+        assert any(moved)
+
+        before.restore(scene)
+        assert len(scene.policies) == 5
+        scene.update(0.016)
+        assert [enemy.velocity_x for enemy in scene.enemies[2:]] == moved
+        scene.despawn_enemies(scene.enemies[2:])
+        assert len(scene.policies) == 0
@@ -0,0 +1,148 @@
+"""
+Tests for entity and agent pools.
+"""
+
+import pytest
+
+from ai.agents import ChasingAI, SimpleAI
+from game.entities import Enemy
+from game.pool import AgentPool, EntityPool, Pool
+from game.store import EntityStore
+
+
+class TestPool:
+    """Test the generic pool."""
+
+    def test_reuses_released_objects(self):
+        """Test a released object is reset and handed out again."""
+        resets = []
+        pool = Pool(list, lambda obj, *args: resets.append(args))
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire(1, 2)
+
+        assert second is first
+        assert resets == [(1, 2)]
+
+    def test_stats(self):
+        """Test misses, in-use counts and the high-water mark."""
+        pool = Pool(object, lambda obj: None)
+        objects = [pool.acquire() for _ in range(3)]
+        for obj in objects:
+            pool.release(obj)
+        pool.acquire()
+
+        stats = pool.stats()
+
+        assert stats.acquired == 4
+        assert stats.released == 3
+        assert stats.misses == 3
+        assert stats.in_use == 1
+        assert stats.free == 2
+        assert stats.high_water == 3
+
+    def test_prewarm_avoids_misses(self):
+        """Test prewarmed objects are acquired without misses."""
+        pool = Pool(object, lambda obj: None)
+        pool.prewarm(5)
+
+        for _ in range(5):
+            pool.acquire()
+
+        assert pool.stats().misses == 0
+
+    def test_max_free(self):
+        """Test releases beyond max_free are dropped."""
+        pool = Pool(object, lambda obj: None, max_free=1)
+
+        pool.release(object())
+        pool.release(object())
+
+        assert len(pool) == 1
+
+    def test_double_release(self):
+        """Test releasing an object that is already free is refused."""
+        pool = Pool(list, lambda obj: None)
+        obj = pool.acquire()
+        pool.release(obj)
+
+        with pytest.raises(ValueError):
+            pool.release(obj)
+
+        assert len(pool) == 1
+        assert pool.stats().released == 1
+        pool.acquire()
+        pool.release(obj)
+
+
+class TestEntityPool:
+    """Test pooling entities."""
+
+    def test_released_entity_keeps_its_row_inactive(self):
+        """Test a released entity stays on its row but is skipped."""
+        store = EntityStore()
+        pool = EntityPool(Enemy, store)
+        enemy = pool.acquire(10, 20)
+        enemy.velocity_x = 5.0
+
+        pool.release(enemy)
+
+        assert not enemy.active
+        assert enemy.velocity_x == 0.0
+        assert len(store) == 1
+
+    def test_acquire_resets_position(self):
+        """Test a reused entity comes back active at the new position."""
+        pool = EntityPool(Enemy, EntityStore())
+        enemy = pool.acquire(10, 20)
+        pool.release(enemy)
+
+        again = pool.acquire(30, 40)
+
+        assert again is enemy
+        assert enemy.active
+        assert enemy.position == (30, 40)
+
+    def test_reused_enemy_gets_default_look(self):
+        """Test a reused enemy's speed and color are back to the defaults."""
+        pool = EntityPool(Enemy, EntityStore())
+        enemy = pool.acquire(10, 20)
+        enemy.speed, enemy.color = 42.0, (1, 2, 3)
+        pool.release(enemy)
+
+        pool.acquire(30, 40)
+
+        assert enemy.speed == 100.0
+        assert enemy.color == (255, 0, 0)
+
+
+class TestAgentPool:
+    """Test pooling agents."""
+
+    def test_reset_points_agent_at_new_entity(self):
+        """Test a reused agent steers its new entity with fresh state."""
+        store = EntityStore()
+        first, second = Enemy(0, 0, store), Enemy(10, 10, store)
+        pool = AgentPool(ChasingAI)
+        agent = pool.acquire(first)
+        agent.set_target(second)
+        pool.release(agent)
+
+        again = pool.acquire(second)
+
+        assert again is agent
+        assert agent.active
+        assert agent.entity is second
+        assert agent.target is None
+
+    def test_simple_ai_timer_restarts(self):
+        """Test a reused SimpleAI waits a full interval again."""
+        pool = AgentPool(SimpleAI)
+        agent = pool.acquire(Enemy(0, 0, EntityStore()))
+        agent.direction_change_timer = 1.5
+        pool.release(agent)
+
+        pool.acquire(agent.entity)
+
+        assert agent.direction_change_timer == 0.0
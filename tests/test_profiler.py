@@ -0,0 +1,172 @@
+"""
+Tests for the frame profiler.
+"""
+
+import csv
+import json
+
+import pytest
+
+from utils.profiler import FRAME_SERIES, FrameProfiler, RingBuffer
+
+
+class TestRingBuffer:
+    """Test the RingBuffer."""
+
+    def test_invalid_capacity(self):
+        """Test a non-positive capacity is rejected."""
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+    def test_overwrites_oldest(self):
+        """Test values wrap around once the buffer is full."""
+        buffer = RingBuffer(3)
+        for value in range(5):
+            buffer.append(value)
+
+        assert len(buffer) == 3
+        assert buffer.values() == [2.0, 3.0, 4.0]
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles."""
+        buffer = RingBuffer(100)
+        for value in range(1, 101):
+            buffer.append(value)
+
+        assert buffer.percentile(0.5) == 51.0
+        assert buffer.percentile(0.99) == 99.0
+        assert RingBuffer(4).percentile(0.5) == 0.0
+
+
+class TestFrameProfiler:
+    """Test the FrameProfiler."""
+
+    def record(self, profiler, timings):
+        """Record one frame with fixed span durations in seconds."""
+        profiler.begin_frame()
+        for name, seconds in timings.items():
+            profiler.add_time(name, seconds)
+        profiler.end_frame()
+
+    def test_spans_are_recorded_per_frame(self):
+        """Test span and decorator timings land in their series."""
+        profiler = FrameProfiler(capacity=10)
+
+        @profiler.profile("work")
+        def work():
+            return 42
+
+        profiler.begin_frame()
+        with profiler.span("update"):
+            assert work() == 42
+        profiler.end_frame()
+
+        assert set(profiler.series) == {"update", "work", FRAME_SERIES}
+        assert profiler.frames == 1
+        assert profiler.stats("update")["max"] >= profiler.stats("work")["max"]
+
+    def test_durations_sum_within_frame(self):
+        """Test repeated spans in a frame are summed."""
+        profiler = FrameProfiler()
+        profiler.begin_frame()
+        profiler.add_time("ai", 0.001)
+        profiler.add_time("ai", 0.002)
+        profiler.end_frame()
+
+        assert profiler.series["ai"].values() == [pytest.approx(3.0)]
+
+    def test_late_series_are_padded(self):
+        """Test a series first seen later lines up with earlier frames."""
+        profiler = FrameProfiler(capacity=4)
+        self.record(profiler, {"update": 0.001})
+        self.record(profiler, {"update": 0.001, "render": 0.002})
+
+        assert profiler.series["render"].values() == [0.0, pytest.approx(2.0)]
+
+    def test_disabled_records_nothing(self):
+        """Test a disabled profiler ignores frames and spans."""
+        profiler = FrameProfiler(enabled=False)
+        profiler.begin_frame()
+        with profiler.span("update"):
+            pass
+        profiler.end_frame()
+
+        assert profiler.frames == 0
+        assert not profiler.series
+
+    def test_spans_outside_frames_are_dropped(self):
+        """Test time recorded between frames doesn't leak into the next one."""
+        profiler = FrameProfiler()
+        with profiler.span("loading"):
+            pass
+        profiler.add_time("loading", 1.0)
+        profiler.begin_frame()
+        span = profiler.span("late")
+        span.__enter__()
+        profiler.end_frame()
+        span.__exit__(None, None, None)
+        self.record(profiler, {"update": 0.001})
+
+        assert set(profiler.series) == {"update", FRAME_SERIES}
+
+    def test_overlay_enables_profiler(self):
+        """Test showing the overlay turns recording on and hiding it off."""
+        profiler = FrameProfiler(enabled=False)
+
+        profiler.toggle_overlay()
+        self.record(profiler, {"update": 0.001})
+        assert profiler.enabled and profiler.frames == 1
+
+        profiler.toggle_overlay()
+        self.record(profiler, {"update": 0.001})
+        assert not profiler.enabled and profiler.frames == 1
+
+    def test_stats(self):
+        """Test percentile stats over recorded frames."""
+        profiler = FrameProfiler()
+        for ms in range(1, 101):
+            self.record(profiler, {"update": ms / 1000.0})
+
+        stats = profiler.stats("update")
+        assert stats["p50"] == pytest.approx(51.0)
+        assert stats["p95"] == pytest.approx(95.0)
+        assert stats["max"] == pytest.approx(100.0)
+        assert profiler.stats("missing")["p99"] == 0.0
+
+    def test_export_csv(self, tmp_path):
+        """Test CSV export has one row per frame."""
+        profiler = FrameProfiler(capacity=2)
+        for _ in range(3):
+            self.record(profiler, {"update": 0.001})
+        path = tmp_path / "frames.csv"
+
+        profiler.export_csv(path)
+
+        rows = list(csv.reader(path.open()))
+        assert rows[0] == ["frame", "update", FRAME_SERIES]
+        assert [row[0] for row in rows[1:]] == ["1", "2"]
+
+    def test_export_json(self, tmp_path):
+        """Test JSON export includes stats and raw values."""
+        profiler = FrameProfiler()
+        self.record(profiler, {"update": 0.004})
+        path = tmp_path / "frames.json"
+
+        profiler.export_json(path)
+
+        report = json.loads(path.read_text())
+        assert report["frames"] == 1
+        assert report["series"]["update"]["values_ms"] == [pytest.approx(4.0)]
+
+    def test_render_overlay(self, mock_screen):
+        """Test the overlay draws only when visible."""
+        profiler = FrameProfiler()
+        self.record(profiler, {"update": 0.004})
+        before = mock_screen.copy()
+
+        profiler.render_overlay(mock_screen)
+        assert mock_screen.get_at((0, 599)) == before.get_at((0, 599))
+
+        profiler.toggle_overlay()
+        profiler.render_overlay(mock_screen)
+        assert mock_screen.get_at((0, 599)) != before.get_at((0, 599))
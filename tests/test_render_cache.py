@@ -0,0 +1,56 @@
+"""
+Tests for the render cache.
+"""
+
+import pytest
+
+from game.entities import Enemy, Player
+from game.render_cache import RenderCache
+
+
+class TestRenderCache:
+    """Test the RenderCache."""
+
+    def test_surfaces_are_reused(self):
+        """Test each sprite key is rasterized once."""
+        cache = RenderCache()
+        key = ("rect", 24, 24, (255, 0, 0))
+
+        first = cache.get(key)
+        second = cache.get(key)
+
+        assert first is second
+        assert len(cache) == 1
+        assert key in cache
+
+    def test_rect_sprite_matches_draw_rect(self, mock_screen):
+        """Test a blitted rect sprite matches pygame.draw.rect output."""
+        enemy = Enemy(10.5, 20.25)
+        expected = mock_screen.copy()
+        enemy.render(expected)
+
+        cache = RenderCache()
+        mock_screen.blit(cache.get(enemy.sprite_key()), (enemy.x, enemy.y))
+
+        for point in [(10, 20), (33, 43), (34, 44), (9, 19)]:
+            assert mock_screen.get_at(point) == expected.get_at(point)
+
+    def test_circle_sprite_is_transparent_in_corners(self):
+        """Test circle sprites keep transparent corners."""
+        surface = RenderCache().get(("circle", 10, 10, (0, 255, 0)))
+
+        assert surface.get_at((0, 0)).a == 0
+        assert surface.get_at((5, 5))[:3] == (0, 255, 0)
+
+    def test_unknown_shape(self):
+        """Test unknown shapes are rejected."""
+        with pytest.raises(ValueError):
+            RenderCache().get(("star", 10, 10, (0, 0, 0)))
+
+    def test_clear(self):
+        """Test clearing drops cached surfaces."""
+        cache = RenderCache()
+        cache.get(Player(0, 0).sprite_key())
+        cache.clear()
+
+        assert len(cache) == 0
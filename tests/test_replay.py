@@ -0,0 +1,101 @@
+"""
+Tests for input logs and session replay.
+"""
+
+import pytest
+
+from ai.agents import SimpleAI
+from game.engine import GameEngine
+from game.input import ACTION_BITS, ScriptedInput
+from game.replay import InputLog, ReplayMismatchError
+from game.scenes import GameScene, PauseScene
+
+# A short scripted session: right, then down-left, then idle
+SCRIPT = [ACTION_BITS["RIGHT"]] * 20 + [ACTION_BITS["DOWN"] | ACTION_BITS["LEFT"]] * 15
+
+
+def make_scene(seed: int = 3) -> GameScene:
+    """Create a scene with one randomly wandering enemy."""
+    scene = GameScene(controls=ScriptedInput([]))
+    scene.add_agent(SimpleAI(scene.enemies[0], seed=seed), rate=1e6)
+    return scene
+
+
+def record_session(frames: int = 60) -> InputLog:
+    """Record a scripted session on a headless engine."""
+    scene = make_scene()
+    scene.player.controls = ScriptedInput(SCRIPT)
+    engine = GameEngine(headless=True, scene=scene)
+    engine.start_recording(dt=0.05)
+    engine.run_steps(frames, dt=0.05)
+    return engine.stop_recording()
+
+
+class TestInputLog:
+    """Test the binary input log format."""
+
+    def test_round_trip(self, tmp_path):
+        """Test a log survives saving and loading unchanged."""
+        log = record_session()
+        path = tmp_path / "session.pgil"
+
+        log.save(path)
+        loaded = InputLog.load(path)
+
+        assert loaded.dt == log.dt
+        assert loaded.inputs == log.inputs
+        assert loaded.checksums == log.checksums
+
+    def test_inputs_are_run_length_encoded(self):
+        """Test repeated inputs take one run each on disk."""
+        log = InputLog()
+        log.inputs.extend([ACTION_BITS["UP"]] * 1000)
+
+        assert len(log.to_bytes()) < 40
+
+    def test_rejects_bad_data(self):
+        """Test foreign and truncated data are rejected."""
+        data = record_session(5).to_bytes()
+
+        with pytest.raises(ValueError):
+            InputLog.from_bytes(b"XXXX" + data[4:])
+        with pytest.raises(ValueError):
+            InputLog.from_bytes(data[:-1])
+
+
+class TestReplay:
+    """Test replaying recorded sessions."""
+
+    def test_replay_matches_recording(self):
+        """Test a replay reproduces every recorded checksum."""
+        log = record_session()
+        engine = GameEngine(headless=True, scene=make_scene())
+
+        assert engine.replay(log) == 60
+        assert engine.scene.player.x != 100
+
+    def test_pausing_mid_recording_replays(self):
+        """Test frames spent paused are left out of the recording."""
+        scene = make_scene()
+        scene.player.controls = ScriptedInput(SCRIPT)
+        engine = GameEngine(headless=True, scene=scene)
+        engine.start_recording(dt=0.05)
+        engine.run_steps(10, dt=0.05)
+        engine.scenes.push(PauseScene(scene))
+        engine.run_steps(5, dt=0.05)
+        engine.scenes.pop()
+        engine.run_steps(10, dt=0.05)
+        log = engine.stop_recording()
+
+        assert len(log) == len(log.checksums) == 20
+        replayer = GameEngine(headless=True, scene=make_scene())
+        assert replayer.replay(log) == 20
+
+    def test_replay_detects_divergence(self):
+        """Test a differently seeded agent makes the replay fail."""
+        log = record_session()
+        engine = GameEngine(headless=True, scene=make_scene(seed=4))
+
+        with pytest.raises(ReplayMismatchError) as error:
+            engine.replay(log)
+        assert error.value.frame >= 0
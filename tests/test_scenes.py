@@ -0,0 +1,297 @@
+"""
+Tests for game scenes.
+"""
+
+import threading
+import time
+
+import pygame
+import pytest
+
+from ai.agents import ChasingAI, SimpleAI
+from game.assets import AssetManager
+from game.scenes import GameScene, MenuScene, PauseScene, Scene, SceneManager
+from utils.constants import GAME_STATES
+
+
+class TestGameScene:
+    """Test the GameScene."""
+
+    def test_render_reports_drawn_rects(self, mock_screen):
+        """Test the first render reports every entity's area."""
+        scene = GameScene()
+
+        changed = scene.render(mock_screen)
+
+        assert sorted(map(tuple, changed)) == sorted(
+            tuple(entity.rect) for entity in scene.entities
+        )
+
+    def test_render_reports_removed_entity(self, mock_screen):
+        """Test a removed enemy's last area is reported for clearing."""
+        scene = GameScene()
+        scene.render(mock_screen)
+        removed = scene.enemies.pop()
+
+        changed = scene.render(mock_screen)
+
+        assert removed.rect in changed
+
+    def test_clear_erases_drawn_rects(self, mock_screen):
+        """Test clear fills the areas drawn last frame."""
+        scene = GameScene()
+        scene.render(mock_screen)
+
+        scene.clear(mock_screen, (0, 0, 0))
+
+        player = scene.player
+        assert mock_screen.get_at((int(player.x), int(player.y))) == (0, 0, 0, 255)
+
+    def test_draw_culls_entities_outside_camera(self, mock_screen):
+        """Test only entities in the camera's view of a large world are drawn."""
+        scene = GameScene(world_size=(4000, 4000))
+        scene.despawn_enemies(list(scene.enemies))
+        px, py = scene.player.x, scene.player.y
+        near = scene.spawn_enemy(px + 50, py + 50)
+        far = scene.spawn_enemy(3900, 3900)
+
+        drawn = scene.draw(mock_screen)
+
+        assert near in drawn and scene.player in drawn
+        assert far not in drawn
+        left, top = scene.camera.offset()
+        assert drawn[near].topleft == (round(near.x - left), round(near.y - top))
+
+    def test_culling_follows_moves_and_despawns(self, mock_screen):
+        """Test the per-frame hash update keeps culling right as things change."""
+        scene = GameScene(world_size=(4000, 4000))
+        scene.despawn_enemies(list(scene.enemies))
+        px, py = scene.player.x, scene.player.y
+        arriving = scene.spawn_enemy(3900, 3900)
+        leaving = scene.spawn_enemy(px + 50, py + 50)
+        scene.update(0.0)
+
+        arriving.x, arriving.y = px + 60, py + 60
+        leaving.x, leaving.y = 3900, 3900
+        scene.update(0.0)
+        drawn = scene.draw(mock_screen)
+        assert arriving in drawn and leaving not in drawn
+
+        scene.despawn_enemies([arriving])
+        scene.update(0.0)
+        assert arriving not in scene.draw(mock_screen)
+
+    def test_render_redraws_all_when_camera_scrolls(self, mock_screen):
+        """Test a scrolled camera makes render report a full redraw."""
+        scene = GameScene(world_size=(4000, 4000))
+        scene.render(mock_screen)
+        assert scene.render(mock_screen) is not None
+
+        scene.player.x, scene.player.y = 2000, 2000
+        scene.update(0.0)
+
+        assert scene.render(mock_screen) is None
+        assert scene.render(mock_screen) is not None
+
+    def test_update_reports_player_enemy_contact(self):
+        """Test the scene detects the player touching an enemy."""
+        scene = GameScene()
+        enemy = scene.enemies[0]
+        enemy.x, enemy.y = scene.player.x + 10, scene.player.y + 10
+
+        scene.update(0.0)
+
+        contacts = list(scene.collisions.contacts())
+        assert [(c.a, c.b, c.event) for c in contacts] == [
+            (scene.player, enemy, "enter")
+        ]
+
+    def test_spawn_and_despawn_recycle_enemies(self):
+        """Test despawned enemies and agents are reused by the next wave."""
+        scene = GameScene()
+        wave = [scene.spawn_enemy(10.0 * i, 0.0, ChasingAI) for i in range(5)]
+        agents = list(scene.agents)
+        assert all(agent.target is scene.player for agent in agents)
+
+        scene.despawn_enemies(wave)
+        assert scene.agents == []
+        assert len(scene.scheduler) == 0
+        again = [scene.spawn_enemy(0.0, 10.0 * i, ChasingAI) for i in range(5)]
+
+        assert set(again) == set(wave)
+        assert set(scene.agents) == set(agents)
+        stats = scene.pool_stats()
+        assert stats["Enemy"].misses == 5
+        assert stats["ChasingAI"].high_water == 5
+
+    def test_spawn_enemy_and_agent(self):
+        """Test the spawned agent is returned with its enemy."""
+        scene = GameScene()
+
+        enemy, agent = scene.spawn_enemy_and_agent(0.0, 0.0, ChasingAI)
+
+        assert agent.entity is enemy and agent in scene.agents
+        assert scene.spawn_enemy_and_agent(0.0, 0.0)[1] is None
+
+    def test_prewarm_fills_pools(self):
+        """Test a prewarmed wave spawns without allocating."""
+        scene = GameScene()
+        scene.prewarm(10, SimpleAI)
+
+        for _ in range(10):
+            scene.spawn_enemy(0.0, 0.0, SimpleAI)
+
+        stats = scene.pool_stats()
+        assert stats["Enemy"].misses == 0
+        assert stats["SimpleAI"].misses == 0
+
+
+class TestPauseScene:
+    """Test the PauseScene."""
+
+    def test_render_reports_label(self, mock_screen):
+        """Test pausing a frozen scene reports only its regions and the label."""
+        game = GameScene()
+        game.render(mock_screen)
+        pause = PauseScene(game)
+
+        changed = pause.render(mock_screen)
+
+        assert changed is not None
+        label = changed[-1]
+        assert label.center == mock_screen.get_rect().center
+        assert sorted(map(tuple, changed[:-1])) == sorted(
+            tuple(entity.rect) for entity in game.entities
+        )
+
+    def test_clear_erases_label(self, mock_screen):
+        """Test clear erases the label drawn last frame."""
+        pause = PauseScene(GameScene())
+        pause.render(mock_screen)
+        label = pause.render(mock_screen)[-1]
+
+        pause.clear(mock_screen, (0, 0, 0))
+
+        assert mock_screen.get_at(label.center) == (0, 0, 0, 255)
+
+
+def wait_for_switch(manager: SceneManager, timeout: float = 5.0) -> None:
+    """Poll a scene manager until a background-built scene is switched in."""
+    deadline = time.monotonic() + timeout
+    while not manager.poll() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestSceneManager:
+    """Test the scene stack."""
+
+    def test_push_pop_replace(self):
+        """Test the top scene and its game state follow the stack."""
+        manager = SceneManager()
+        menu, game = MenuScene(), GameScene()
+
+        manager.push(menu)
+        assert manager.state == GAME_STATES["MENU"]
+        manager.replace(game)
+        assert manager.current is game
+        assert menu.manager is None
+
+        manager.push(PauseScene(game))
+        assert manager.state == GAME_STATES["PAUSED"]
+        manager.pop()
+        assert manager.state == GAME_STATES["PLAYING"]
+        assert len(manager) == 1
+
+    def test_scenes_exit_when_they_leave_the_stack(self):
+        """Test pop, replace and clear call on_exit, and covering doesn't."""
+        exited = []
+
+        class ExitingScene(MenuScene):
+            def on_exit(self):
+                exited.append(self)
+
+        manager = SceneManager()
+        first, second, third = ExitingScene(), ExitingScene(), ExitingScene()
+        manager.push(first)
+        manager.push(second)
+        assert exited == []
+
+        manager.pop()
+        manager.replace(third)
+        manager.clear()
+
+        assert exited == [second, first, third]
+        assert not hasattr(MenuScene(), "stop_streaming")
+
+    def test_current_scene_runs_while_next_builds(self):
+        """Test the current scene keeps updating until the next is built."""
+        manager = SceneManager()
+        menu = MenuScene()
+        manager.push(menu)
+        release = threading.Event()
+
+        def build() -> GameScene:
+            release.wait(5.0)
+            return GameScene()
+
+        manager.replace_async(build)
+        for _ in range(3):
+            manager.update(0.01)
+            assert manager.current is menu
+        assert manager.loading
+
+        release.set()
+        wait_for_switch(manager)
+
+        assert manager.state == GAME_STATES["PLAYING"]
+        assert not manager.loading
+        manager.shutdown()
+
+    def test_switch_waits_for_assets(self, tmp_path):
+        """Test a built scene only shows once its manifest is loaded."""
+        pygame.image.save(pygame.Surface((4, 4)), tmp_path / "tile.png")
+        assets = AssetManager(images_dir=tmp_path)
+        manager = SceneManager(assets)
+
+        class TiledScene(MenuScene):
+            def asset_manifest(self):
+                return {"images": ["tile.png"]}
+
+        manager.push_async(TiledScene)
+        deadline = time.monotonic() + 5.0
+        while not manager.poll() and time.monotonic() < deadline:
+            assets.process_loaded()
+            time.sleep(0.001)
+
+        assert isinstance(manager.current, TiledScene)
+        assert ("images", "tile.png") in assets
+        manager.shutdown()
+        assets.shutdown()
+
+    def test_failed_build_raises(self):
+        """Test a scene constructor's error surfaces on the main thread."""
+        manager = SceneManager()
+
+        def build() -> Scene:
+            raise ValueError("broken level")
+
+        manager.push_async(build)
+        with pytest.raises(ValueError):
+            wait_for_switch(manager)
+        manager.shutdown()
+
+    def test_menu_starts_game_and_pause_resumes(self):
+        """Test Enter loads the game and P pauses and resumes it."""
+        manager = SceneManager()
+        manager.push(MenuScene())
+
+        manager.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+        wait_for_switch(manager)
+        assert manager.state == GAME_STATES["PLAYING"]
+
+        pause = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p)
+        manager.handle_event(pause)
+        assert manager.state == GAME_STATES["PAUSED"]
+        manager.handle_event(pause)
+        assert manager.state == GAME_STATES["PLAYING"]
+        manager.shutdown()
@@ -0,0 +1,195 @@
+"""
+Tests for the AI scheduler.
+"""
+
+import pytest
+
+from ai.agents import AIAgent
+from ai.scheduler import AIScheduler
+from game.entities import Entity
+
+
+class MockEntity(Entity):
+    """Mock entity for testing."""
+
+    def update(self, dt):
+        pass
+
+    def render(self, screen):
+        pass
+
+
+class RecordingAI(AIAgent):
+    """Agent that records the dt of every update."""
+
+    def __init__(self, clock=None, cost: float = 0.0):
+        super().__init__(MockEntity(0, 0, 5, 5))
+        self.dts: list[float] = []
+        self.clock = clock
+        self.cost = cost
+
+    def update(self, dt, game_state):
+        self.dts.append(dt)
+        if self.clock is not None:
+            self.clock.now += self.cost
+
+
+class FakeClock:
+    """Manually advanced timer."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAIScheduler:
+    """Test the AIScheduler."""
+
+    def test_invalid_rate(self):
+        """Test a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            AIScheduler().register(RecordingAI(), rate=0)
+
+    def test_rate_limits_updates(self):
+        """Test agents update at their target rate with accumulated dt."""
+        scheduler = AIScheduler()
+        agent = RecordingAI()
+        scheduler.register(agent, rate=20)
+
+        for _ in range(60):
+            scheduler.update(1 / 60, {})
+
+        # The first update lands on the first frame, then every 1/20 s
+        assert len(agent.dts) == 21
+        assert sum(agent.dts) == pytest.approx(1.0)
+        assert all(dt == pytest.approx(1 / 20) for dt in agent.dts[2:])
+
+    def test_first_updates_are_staggered(self):
+        """Test agents with the same rate don't all update on one frame."""
+        scheduler = AIScheduler()
+        agents = [RecordingAI() for _ in range(30)]
+        for agent in agents:
+            scheduler.register(agent, rate=10)
+
+        per_frame = []
+        for _ in range(12):
+            scheduler.update(1 / 60, {})
+            per_frame.append(scheduler.updates_last_frame)
+
+        assert max(per_frame) < len(agents)
+        assert all(len(agent.dts) >= 1 for agent in agents)
+
+    def test_budget_defers_and_round_robins(self):
+        """Test the budget limits work per frame without starving agents."""
+        clock = FakeClock()
+        scheduler = AIScheduler(budget_ms=2.0, agent_budget_ms=10.0, timer=clock)
+        agents = [RecordingAI(clock, cost=0.001) for _ in range(6)]
+        for agent in agents:
+            scheduler.register(agent, rate=1000)
+
+        scheduler.update(0.01, {})
+        assert scheduler.updates_last_frame == 2
+        assert scheduler.deferred_last_frame == 4
+
+        scheduler.update(0.01, {})
+        scheduler.update(0.01, {})
+        assert all(len(agent.dts) == 1 for agent in agents)
+        # Deferred agents are handed the frames they waited
+        assert agents[-1].dts == [pytest.approx(0.03)]
+
+    def test_deferred_agent_gets_real_elapsed_time(self):
+        """Test an agent deferred for several intervals keeps its game time."""
+        scheduler = AIScheduler(max_updates=1)
+        agents = [RecordingAI() for _ in range(3)]
+        for agent in agents:
+            scheduler.register(agent, rate=1000)
+
+        for _ in range(12):
+            scheduler.update(0.01, {})
+
+        # Each agent waits two frames, ~20 intervals, between its updates
+        for index, agent in enumerate(agents):
+            assert len(agent.dts) == 4
+            assert agent.dts[1:] == [pytest.approx(0.03)] * 3
+            assert sum(agent.dts) == pytest.approx(0.01 * (10 + index))
+
+    def test_max_catchup_clamps_elapsed_time(self):
+        """Test the opt-in catch-up cap limits the dt of a late update."""
+        with pytest.raises(ValueError):
+            AIScheduler(max_catchup=0)
+        scheduler = AIScheduler(max_catchup=0.1)
+        agent = RecordingAI()
+        scheduler.register(agent, rate=20)
+        agent.active = False
+        for _ in range(30):
+            scheduler.update(1 / 60, {})
+
+        agent.active = True
+        scheduler.update(1 / 60, {})
+
+        assert agent.dts == [pytest.approx(0.1)]
+
+    def test_update_cap_is_deterministic(self):
+        """Test a count budget defers the same agents whatever the timer says."""
+        clock = FakeClock()
+        scheduler = AIScheduler(max_updates=2, timer=clock)
+        agents = [RecordingAI(clock, cost=1.0) for _ in range(5)]
+        for agent in agents:
+            scheduler.register(agent, rate=1000)
+
+        scheduler.update(0.01, {})
+        assert scheduler.updates_last_frame == 2
+        assert scheduler.deferred_last_frame == 3
+
+        scheduler.update(0.01, {})
+        scheduler.update(0.01, {})
+        assert [len(agent.dts) for agent in agents] == [2, 1, 1, 1, 1]
+
+    def test_no_budget_by_default(self):
+        """Test an unbudgeted scheduler updates every due agent."""
+        clock = FakeClock()
+        scheduler = AIScheduler(timer=clock)
+        agents = [RecordingAI(clock, cost=1.0) for _ in range(5)]
+        for agent in agents:
+            scheduler.register(agent, rate=1000)
+
+        scheduler.update(0.01, {})
+
+        assert scheduler.updates_last_frame == 5
+
+    def test_overrunning_agents_are_reported(self):
+        """Test agents that keep exceeding the agent budget are reported."""
+        clock = FakeClock()
+        scheduler = AIScheduler(
+            budget_ms=100.0, agent_budget_ms=1.0, overrun_limit=3, timer=clock
+        )
+        slow = RecordingAI(clock, cost=0.002)
+        fast = RecordingAI(clock)
+        scheduler.register(slow, rate=1000)
+        scheduler.register(fast, rate=1000)
+
+        for _ in range(2):
+            scheduler.update(0.01, {})
+        assert scheduler.overrunning_agents() == []
+
+        scheduler.update(0.01, {})
+        assert scheduler.overrunning_agents() == [slow]
+        assert scheduler.overrun_counts() == {slow: 3}
+
+    def test_inactive_and_unregistered_agents_skip(self):
+        """Test inactive or unregistered agents are not updated."""
+        scheduler = AIScheduler()
+        inactive = RecordingAI()
+        inactive.active = False
+        removed = RecordingAI()
+        scheduler.register(inactive)
+        scheduler.register(removed)
+        scheduler.unregister(removed)
+
+        scheduler.update(1.0, {})
+
+        assert len(scheduler) == 1
+        assert inactive.dts == []
+        assert removed.dts == []
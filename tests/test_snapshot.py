@@ -0,0 +1,274 @@
+"""
+Tests for world snapshots and rollback.
+"""
+
+import gc
+
+import pytest
+
+from ai.agents import ChasingAI, FlockingAI, SimpleAI
+from ai.env import GameEnvBatch
+from ai.policy import MLPPolicy, PolicyAI, get_default_policy
+from game.entities import Enemy
+from game.input import ScriptedInput
+from game.scenes import GameScene
+from game.snapshot import SnapshotRing, WorldSnapshot
+
+
+def make_scene() -> GameScene:
+    """Create a scene with one agent of each kind."""
+    scene = GameScene(controls=ScriptedInput([]))
+    scene.enemies.extend(Enemy(200 + 30 * i, 250, scene.store) for i in range(4))
+    scene.add_agent(SimpleAI(scene.enemies[0], seed=5))
+    chaser = ChasingAI(scene.enemies[1])
+    chaser.set_target(scene.player)
+    scene.add_agent(chaser)
+    scene.add_agent(FlockingAI(scene.enemies[2]))
+    scene.add_agent(FlockingAI(scene.enemies[3]))
+    return scene
+
+
+def run(scene: GameScene, frames: int) -> int:
+    """Step a scene and return its final checksum."""
+    for _ in range(frames):
+        scene.update(0.05)
+    return scene.checksum()
+
+
+class TestWorldSnapshot:
+    """Test capturing and restoring scenes."""
+
+    def test_restore_rewinds_state(self):
+        """Test restoring brings back entity and agent state exactly."""
+        scene = make_scene()
+        run(scene, 10)
+        snapshot = WorldSnapshot.capture(scene)
+        checksum = scene.checksum()
+        timer = scene.agents[0].direction_change_timer
+
+        expected = run(scene, 50)
+        snapshot.restore(scene)
+
+        assert scene.checksum() == checksum
+        assert scene.agents[0].direction_change_timer == timer
+        assert scene.agents[1].target is scene.player
+        # Random draws and scheduler timings rewind too
+        assert run(scene, 50) == expected
+
+    def test_restore_leaves_spatial_hash_to_draw(self, mock_screen):
+        """Test a restored scene culls by its restored positions."""
+        scene = GameScene(world_size=(4000, 4000))
+        enemy = scene.enemies[0]
+        enemy.x, enemy.y = scene.player.x + 50, scene.player.y
+        scene.update(0.0)
+        snapshot = WorldSnapshot.capture(scene)
+        enemy.x, enemy.y = 3900, 3900
+        scene.update(0.0)
+        assert enemy not in scene.draw(mock_screen)
+
+        snapshot.restore(scene)
+
+        assert scene.enemies[0] in scene.draw(mock_screen)
+
+    def test_restore_brings_back_removed_enemy(self):
+        """Test a removed enemy gets a live entity on its old row again."""
+        scene = make_scene()
+        snapshot = WorldSnapshot.capture(scene)
+        checksum = scene.checksum()
+        removed = scene.enemies.pop()
+        row = removed.row
+        del removed
+        gc.collect()
+
+        snapshot.restore(scene)
+
+        assert scene.checksum() == checksum
+        assert scene.enemies[-1].row == row
+        assert scene.enemies[-1].active
+
+    def test_stale_entities_keep_their_rows(self):
+        """Test an entity dropped by a restore doesn't free a row in use."""
+        scene = make_scene()
+        snapshot = WorldSnapshot.capture(scene)
+        spawned = Enemy(10, 10, scene.store)
+        scene.enemies.append(spawned)
+        snapshot.restore(scene)
+
+        newcomer = Enemy(20, 20, scene.store)
+        del spawned
+        gc.collect()
+
+        assert newcomer.row not in scene.store.free_rows
+
+    def test_restore_keeps_pooled_rows_owned(self):
+        """Test pooled enemies spawned after a capture don't share rows."""
+        scene = make_scene()
+        snapshot = WorldSnapshot.capture(scene)
+        scene.despawn_enemies([scene.spawn_enemy(0, 0) for _ in range(3)])
+
+        snapshot.restore(scene)
+        spawned = [scene.spawn_enemy(0, 0) for _ in range(3)]
+
+        rows = [entity.row for entity in scene.entities]
+        assert len(rows) == len(set(rows))
+        assert not set(rows) & set(scene.store.free_rows)
+        assert all(enemy.active for enemy in spawned)
+
+    def test_save_and_load(self, tmp_path):
+        """Test a saved snapshot loads into a fresh scene."""
+        scene = make_scene()
+        run(scene, 10)
+        path = tmp_path / "world.snap"
+        WorldSnapshot.capture(scene).save(path)
+        expected = run(scene, 30)
+
+        loaded = GameScene(controls=ScriptedInput([]))
+        WorldSnapshot.load(path).restore(loaded)
+
+        assert [type(agent) for agent in loaded.agents] == [
+            type(agent) for agent in scene.agents
+        ]
+        assert loaded.agents[1].target is loaded.player
+        assert len(loaded.flocking) == 2
+        assert run(loaded, 30) == expected
+
+    def test_restore_writes_into_existing_columns(self):
+        """Test restoring copies into the store's arrays instead of replacing them."""
+        scene = make_scene()
+        snapshot = WorldSnapshot.capture(scene)
+        column = scene.store.x
+        run(scene, 5)
+
+        snapshot.restore(scene)
+
+        assert scene.store.x is column
+
+    def test_loaded_enemies_keep_speed_and_color(self, tmp_path):
+        """Test enemy speed and color survive a load into a fresh scene."""
+        scene = make_scene()
+        scene.enemies[2].speed = 42.0
+        scene.enemies[2].color = (1, 2, 3)
+        path = tmp_path / "world.snap"
+        WorldSnapshot.capture(scene).save(path)
+
+        loaded = GameScene(controls=ScriptedInput([]))
+        with WorldSnapshot.load(path) as snapshot:
+            snapshot.restore(loaded)
+
+        assert snapshot.data.closed
+        assert loaded.enemies[2].speed == 42.0
+        assert loaded.enemies[2].color == (1, 2, 3)
+        assert loaded.enemies[3].speed == 100.0
+
+    def test_policy_agents_share_policies(self, tmp_path):
+        """Test restored policy agents share policy objects as before."""
+        scene = make_scene()
+        trained = MLPPolicy.random(seed=3)
+        for enemy in scene.enemies[:3]:
+            scene.add_agent(PolicyAI(enemy, trained))
+        scene.add_agent(PolicyAI(scene.enemies[3]))
+        path = tmp_path / "world.snap"
+        snapshot = WorldSnapshot.capture(scene)
+        snapshot.save(path)
+
+        snapshot.restore(scene)
+        assert scene.agents[4].policy is trained
+
+        loaded = GameScene(controls=ScriptedInput([]))
+        with WorldSnapshot.load(path) as saved:
+            saved.restore(loaded)
+        policies = [agent.policy for agent in loaded.agents[4:]]
+        assert policies[0] is policies[1] is policies[2]
+        assert policies[3] is get_default_policy()
+        assert all((a == b).all() for a, b in zip(policies[0].weights, trained.weights))
+
+    def test_nullable_and_mixed_fields(self):
+        """Test fields mixing None or ints with floats round-trip as written."""
+        scene = make_scene()
+        scene.add_agent(SimpleAI(scene.enemies[1], seed=6))
+        first, second = scene.agents[0], scene.agents[-1]
+        first.limit, second.limit = None, 2
+        first.scale, second.scale = 1, 0.5
+        snapshot = WorldSnapshot.capture(scene)
+        first.limit = second.limit = first.scale = second.scale = 7
+
+        snapshot.restore(scene)
+
+        assert (first.limit, second.limit) == (None, 2)
+        assert (first.scale, second.scale) == (1.0, 0.5)
+
+    def test_unsupported_field(self):
+        """Test agent fields with no column encoding are refused."""
+        scene = make_scene()
+        scene.agents[0].label = "wanderer"
+
+        with pytest.raises(ValueError, match="label"):
+            WorldSnapshot.capture(scene)
+
+    def test_rejects_foreign_data(self):
+        """Test data that isn't a snapshot is rejected."""
+        with pytest.raises(ValueError):
+            WorldSnapshot(b"NOPE" + bytes(64)).restore(make_scene())
+
+    def test_rejects_shared_store(self):
+        """Test scenes sharing a store can't be captured or restored."""
+        snapshot = WorldSnapshot.capture(make_scene())
+        batch = GameEnvBatch(2, enemies=2)
+
+        with pytest.raises(ValueError, match="shares its store"):
+            WorldSnapshot.capture(batch.scenes[0])
+        with pytest.raises(ValueError, match="shares its store"):
+            snapshot.restore(batch.scenes[1])
+
+    def test_rejects_foreign_types(self):
+        """Test type names are checked before anything is built from them."""
+        scene = make_scene()
+        data = bytes(WorldSnapshot.capture(scene).data)
+        checksum = scene.checksum()
+
+        # Same-length swaps (padded with JSON spaces) keep the layout intact
+        for old, new in [
+            ('"game.entities:Enemy"', '"ai.agents:SimpleAI"'),
+            ('"ai.agents:SimpleAI"', '"subprocess:Popen"'),
+        ]:
+            forged = data.replace(old.encode(), new.ljust(len(old)).encode())
+            assert forged != data
+            with pytest.raises(ValueError):
+                WorldSnapshot(forged).restore(scene)
+        assert scene.checksum() == checksum
+
+    def test_agent_target_outside_scene(self):
+        """Test agents may only reference entities in the scene."""
+        scene = make_scene()
+        scene.agents[1].set_target(Enemy(0, 0, scene.store))
+
+        with pytest.raises(ValueError):
+            WorldSnapshot.capture(scene)
+
+
+class TestSnapshotRing:
+    """Test the rollback ring."""
+
+    def test_rollback_to_earlier_frame(self):
+        """Test rollback restores the latest snapshot at or before a frame."""
+        scene = make_scene()
+        ring = SnapshotRing(capacity=3)
+        checksums = {}
+        for frame in range(5):
+            ring.capture(scene, frame)
+            checksums[frame] = scene.checksum()
+            run(scene, 1)
+
+        assert ring.frames() == [2, 3, 4]
+        assert ring.rollback(scene, 3) == 3
+        assert scene.checksum() == checksums[3]
+        assert ring.frames() == [2, 3]
+
+    def test_rollback_too_far(self):
+        """Test rolling back past the oldest snapshot fails."""
+        ring = SnapshotRing(capacity=2)
+        scene = make_scene()
+        ring.capture(scene, 10)
+
+        with pytest.raises(KeyError):
+            ring.rollback(scene, 5)
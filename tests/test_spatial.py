@@ -0,0 +1,139 @@
+"""
+Tests for the spatial hash.
+"""
+
+import pytest
+
+from game.entities import Entity
+from game.spatial import SpatialHash
+from game.store import EntityStore
+
+
+class MockEntity(Entity):
+    """Mock entity for testing."""
+
+    def update(self, dt):
+        pass
+
+    def render(self, screen):
+        pass
+
+
+class TestSpatialHash:
+    """Test the SpatialHash grid."""
+
+    def test_invalid_cell_size(self):
+        """Test that a non-positive cell size is rejected."""
+        with pytest.raises(ValueError):
+            SpatialHash(0)
+
+    def test_cell_of_negative_coordinates(self):
+        """Test cell lookup floors negative coordinates."""
+        grid = SpatialHash(10)
+        assert grid.cell_of(5, 5) == (0, 0)
+        assert grid.cell_of(-1, -15) == (-1, -2)
+
+    def test_rebuild_skips_inactive(self):
+        """Test rebuild only indexes active entities."""
+        active = MockEntity(0, 0, 5, 5)
+        inactive = MockEntity(0, 0, 5, 5)
+        inactive.active = False
+        grid = SpatialHash(10)
+
+        grid.rebuild([active, inactive])
+
+        assert len(grid) == 1
+        assert grid.query(0, 0, 1) == [active]
+
+    def test_query_returns_nearby_cells_only(self):
+        """Test query returns entities from overlapping cells only."""
+        near = MockEntity(12, 12, 5, 5)
+        far = MockEntity(500, 500, 5, 5)
+        grid = SpatialHash(10)
+        grid.rebuild([near, far])
+
+        result = grid.query(5, 5, 10)
+
+        assert near in result
+        assert far not in result
+
+    def test_update_moves_entity_between_cells(self):
+        """Test incremental update re-buckets an entity that moved."""
+        entity = MockEntity(0, 0, 5, 5)
+        grid = SpatialHash(10)
+        grid.insert(entity)
+
+        entity.x = 55
+        grid.update(entity)
+
+        assert grid.query(0, 0, 1) == []
+        assert grid.query(55, 0, 1) == [entity]
+
+    def test_remove(self):
+        """Test removing an entity empties its cell."""
+        entity = MockEntity(0, 0, 5, 5)
+        grid = SpatialHash(10)
+        grid.insert(entity)
+
+        grid.remove(entity)
+        grid.remove(entity)  # Removing twice is a no-op
+
+        assert len(grid) == 0
+        assert not grid.cells
+
+    def test_query_rect(self):
+        """Test rect queries return the same cells walked either way."""
+        inside = MockEntity(25, 35, 5, 5)
+        outside = MockEntity(95, 5, 5, 5)
+        grid = SpatialHash(10)
+        grid.rebuild([inside, outside])
+
+        assert grid.query_rect(20, 30, 40, 50) == [inside]
+        # A rect spanning more cells than are occupied walks the occupied ones
+        assert sorted(map(id, grid.query_rect(-1000, -1000, 1000, 1000))) == sorted(
+            [id(inside), id(outside)]
+        )
+
+    def test_rebuild_moves_only_changed_entities(self):
+        """Test repeated rebuilds track moves, deactivation and row reuse."""
+        store = EntityStore()
+        entities = [MockEntity(i * 10, -i * 10, 5, 5, store=store) for i in range(6)]
+        grid = SpatialHash(25)
+        grid.rebuild(entities, store)
+
+        entities[0].x = -60
+        entities[1].active = False
+        removed = entities.pop(2)
+        removed.active = False
+        store.release(removed.row)
+        reused = MockEntity(300, 300, 5, 5, store=store)
+        assert reused.row == removed.row
+        entities.append(reused)
+        grid.rebuild(entities, store)
+
+        fresh = SpatialHash(25)
+        for entity in entities:
+            if entity.active:
+                fresh.insert(entity)
+        assert grid._entity_cells == fresh._entity_cells
+        assert {cell: set(bucket) for cell, bucket in grid.cells.items()} == {
+            cell: set(bucket) for cell, bucket in fresh.cells.items()
+        }
+        assert grid.query(-60, 0, 1) == [entities[0]]
+        assert len(grid) == 5
+
+    def test_rebuild_after_insert_and_remove(self):
+        """Test rebuild stays consistent with entities inserted in between."""
+        store = EntityStore()
+        first = MockEntity(0, 0, 5, 5, store=store)
+        grid = SpatialHash(10)
+        grid.rebuild([first], store)
+
+        second = MockEntity(50, 50, 5, 5, store=store)
+        grid.insert(second)
+        grid.remove(first)
+        grid.rebuild([first, second], store)
+
+        assert len(grid) == 2
+        assert grid.query(0, 0, 1) == [first]
+        assert grid.query(50, 50, 1) == [second]
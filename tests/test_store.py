@@ -0,0 +1,156 @@
+"""
+Tests for the structure-of-arrays entity store.
+"""
+
+import pytest
+
+from game.entities import Enemy, Player
+from game.store import EntityStore, get_default_store
+
+
+class TestEntityStore:
+    """Test the EntityStore."""
+
+    def test_allocate_and_views(self):
+        """Test entities read and write their store row."""
+        store = EntityStore()
+        enemy = Enemy(10, 20, store)
+
+        assert enemy.store is store
+        assert len(store) == 1
+        assert store.x[enemy.row] == 10
+        enemy.velocity_x = 5
+        assert store.velocity_x[enemy.row] == 5.0
+
+    def test_default_store(self):
+        """Test entities without a store use the default one."""
+        enemy = Enemy(0, 0)
+        assert enemy.store is get_default_store()
+
+    def test_active_is_bool(self):
+        """Test the active flag round-trips as a bool."""
+        enemy = Enemy(0, 0, EntityStore())
+        enemy.active = False
+        assert enemy.active is False
+        enemy.active = True
+        assert enemy.active is True
+
+    def test_released_rows_are_reused(self):
+        """Test a deleted entity's row is recycled."""
+        store = EntityStore()
+        enemy = Enemy(0, 0, store)
+        row = enemy.row
+        del enemy
+
+        assert len(store) == 0
+        replacement = Player(5, 5, store)
+        assert replacement.row == row
+        assert replacement.active is True
+        assert replacement.velocity_x == 0.0
+        assert store.capacity == 1
+
+    def test_allocate_while_view_alive(self):
+        """Test the store grows while a view of it is still held."""
+        store = EntityStore()
+        first = store.allocate(1.0, 2.0, 3.0, 4.0)
+        held = store.view("x")
+
+        rows = [store.allocate(float(i), 0.0, 1.0, 1.0) for i in range(500)]
+
+        assert len(held) == 1
+        assert store.view("x")[rows[-1]] == 499.0
+        assert store.x[first] == 1.0 and store.height[first] == 4.0
+        assert store.capacity == 501
+
+    def test_integrate_moves_active_rows(self):
+        """Test bulk integration matches per-entity move."""
+        store = EntityStore()
+        moving = Enemy(0, 0, store)
+        frozen = Enemy(0, 0, store)
+        reference = Enemy(0, 0, EntityStore())
+        for entity in (moving, frozen, reference):
+            entity.velocity_x = 100
+            entity.velocity_y = -50
+        frozen.active = False
+
+        store.integrate(0.1)
+        reference.move(0.1)
+
+        assert moving.position == reference.position
+        assert frozen.position == (0, 0)
+
+    def test_integrate_empty_store(self):
+        """Test integrating an empty store is a no-op."""
+        EntityStore().integrate(0.1)
+
+    def test_view_unknown_field(self):
+        """Test views reject unknown fields."""
+        with pytest.raises(KeyError):
+            EntityStore().view("speed")
+
+    def test_checksum_tracks_state(self):
+        """Test the checksum changes with state and matches identical stores."""
+        first, second = EntityStore(), EntityStore()
+        for store in (first, second):
+            store.allocate(1.0, 2.0, 5.0, 5.0)
+        assert first.checksum() == second.checksum()
+
+        second.velocity_x[0] = 1e-9
+        assert first.checksum() != second.checksum()
+
+    def test_interpolated_positions(self):
+        """Test positions blend between the saved and current step."""
+        store = EntityStore()
+        row = store.allocate(0.0, 10.0, 1.0, 1.0)
+        store.save_positions()
+        store.x[row], store.y[row] = 10.0, 20.0
+        added = store.allocate(50.0, 50.0, 1.0, 1.0)
+
+        xs, ys = store.interpolated_positions(0.25)
+
+        assert (xs[row], ys[row]) == (2.5, 12.5)
+        assert (xs[added], ys[added]) == (50.0, 50.0)
+
+    def test_interpolated_positions_of_some_rows(self):
+        """Test only the requested rows are blended, in the order given."""
+        store = EntityStore()
+        rows = [store.allocate(10.0 * i, 0.0, 1.0, 1.0) for i in range(4)]
+        store.save_positions()
+        for row in rows:
+            store.x[row] += 4.0
+
+        xs, ys = store.interpolated_positions(0.5, [rows[3], rows[1]])
+
+        assert xs == [32.0, 12.0]
+        assert ys == [0.0, 0.0]
+        assert store.interpolated_positions(1.0, [rows[2]])[0] == [24.0]
+
+    def test_reused_row_does_not_interpolate(self):
+        """Test a recycled row starts from its new position."""
+        store = EntityStore()
+        row = store.allocate(0.0, 0.0, 1.0, 1.0)
+        store.save_positions()
+        store.release(row)
+
+        store.allocate(100.0, 100.0, 1.0, 1.0)
+
+        assert store.interpolated_positions(0.0)[0][row] == 100.0
+
+    def test_allocate_many(self):
+        """Test bulk rows reuse free rows first and start still and active."""
+        store = EntityStore()
+        freed = store.allocate(0.0, 0.0, 1.0, 1.0)
+        store.release(freed)
+
+        rows = store.allocate_many([1.0, 2.0, 3.0], 5.0, 24.0, 24.0)
+
+        assert rows.tolist() == [freed, 1, 2]
+        assert store.view("x")[rows].tolist() == [1.0, 2.0, 3.0]
+        assert store.view("active")[rows].all()
+        assert store.interpolated_positions(0.0)[1][2] == 5.0
+        enemy = Enemy.from_row(store, int(rows[1]))
+        assert enemy.position == (2.0, 5.0)
+
+        del enemy
+        store.release_many(rows[[0, 2]])
+        assert len(store) == 0
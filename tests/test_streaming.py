@@ -0,0 +1,207 @@
+"""
+Tests for chunked world streaming.
+"""
+
+import numpy as np
+import pytest
+
+from ai.agents import ChasingAI, SimpleAI
+from game.scenes import GameScene, MenuScene, SceneManager
+from game.streaming import ChunkFile, WorldStreamer
+
+# An 8 x 8 chunk world of 512-pixel chunks
+COLUMNS = ROWS = 8
+WORLD = (COLUMNS * 512.0, ROWS * 512.0)
+
+
+@pytest.fixture
+def chunks(tmp_path):
+    """Create an empty chunk file, closed after the test."""
+    with ChunkFile.create(tmp_path / "world.chunks", COLUMNS, ROWS) as chunk_file:
+        yield chunk_file
+
+
+def streamed_scene(chunks: ChunkFile, radius: int = 1) -> GameScene:
+    """Build an empty scene streaming a chunk file."""
+    scene = GameScene(world_size=WORLD)
+    scene.despawn_enemies(list(scene.enemies))
+    scene.start_streaming(chunks, radius)
+    return scene
+
+
+def stored(chunks: ChunkFile) -> int:
+    """Count the enemies stored across every chunk."""
+    return sum(chunks.count((c, r)) for c in range(COLUMNS) for r in range(ROWS))
+
+
+class TestChunkFile:
+    """Test the ChunkFile storage."""
+
+    def test_records_round_trip(self, chunks):
+        """Test stored enemies and agent types survive reopening the file."""
+        chunk = chunks.add_enemy(1000, 1500, ChasingAI, velocity=(3.0, -4.0))
+        chunks.add_enemy(1000, 1200)
+        chunks.close()
+
+        with ChunkFile(chunks.path) as reopened:
+            records, tiles = reopened.read(chunk)
+            assert chunk == (1, 2)
+            assert records["velocity_y"].tolist() == [-4.0, 0.0]
+            assert reopened.agent_type(int(records["agent"][0])) is ChasingAI
+            assert reopened.agent_type(int(records["agent"][1])) is None
+            assert not tiles.any()
+
+    def test_take_empties_chunk(self, chunks):
+        """Test taking a chunk leaves no enemies behind."""
+        chunk = chunks.add_enemy(10, 10)
+        records, _ = chunks.take(chunk)
+        assert len(records) == 1
+        assert chunks.count(chunk) == 0
+
+    def test_full_chunk(self, tmp_path):
+        """Test a chunk refuses enemies past its capacity."""
+        with ChunkFile.create(tmp_path / "small.chunks", 2, 2, capacity=1) as small:
+            small.add_enemy(10, 10)
+            with pytest.raises(ValueError):
+                small.add_enemy(20, 20)
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files that aren't chunk files are refused."""
+        path = tmp_path / "bogus.chunks"
+        path.write_bytes(bytes(64))
+        with pytest.raises(ValueError):
+            ChunkFile(path)
+
+    def test_rejects_foreign_agent_types(self, chunks):
+        """Test agent type names that aren't agent classes are refused."""
+        chunks.add_enemy(10, 10, ChasingAI)
+        chunks.close()
+        data = chunks.path.read_bytes()
+        old = b'"ai.agents:ChasingAI"'
+        chunks.path.write_bytes(data.replace(old, b'"game.entities:Enemy"'))
+
+        with pytest.raises(ValueError):
+            ChunkFile(chunks.path)
+
+    def test_empty_world_takes_no_disk(self, tmp_path):
+        """Test a huge empty world is a sparse file."""
+        with ChunkFile.create(tmp_path / "huge.chunks", 512, 512) as huge:
+            path = huge.path
+        assert path.stat().st_size > 1 << 30
+        assert path.stat().st_blocks * 512 < 1 << 20
+
+
+class TestWorldStreamer:
+    """Test paging chunks in and out of a scene."""
+
+    def test_leaving_the_stack_stops_streaming(self, chunks):
+        """Test a scene replaced on the stack writes its chunks back."""
+        for i in range(10):
+            chunks.add_enemy(100 + 20 * i, 100)
+        scene = streamed_scene(chunks)
+        manager = SceneManager()
+        manager.push(scene)
+        assert stored(chunks) == 0
+
+        manager.replace(MenuScene())
+
+        assert scene.streamer is None
+        assert stored(chunks) == 10
+
+    def test_only_nearby_chunks_load(self, chunks):
+        """Test enemies load around the player and the rest stay on disk."""
+        for c in range(COLUMNS):
+            for r in range(ROWS):
+                chunks.add_enemy(c * 512 + 100, r * 512 + 100, SimpleAI)
+        scene = streamed_scene(chunks)
+
+        # The player starts in chunk (0, 0), so its 2 x 2 corner loads
+        assert scene.streamer.loaded == {(0, 0), (0, 1), (1, 0), (1, 1)}
+        assert len(scene.enemies) == 4
+        assert all(isinstance(agent, SimpleAI) for agent in scene.agents)
+        assert stored(chunks) == COLUMNS * ROWS - 4
+        scene.stop_streaming()
+
+    def test_far_chunks_freeze(self, chunks):
+        """Test moving away writes old chunks back and loads new ones."""
+        chunks.add_enemy(150, 150, ChasingAI, speed=42.0)
+        chunks.add_enemy(3000, 3000)
+        scene = streamed_scene(chunks)
+        assert len(scene.enemies) == 1
+
+        scene.player.x, scene.player.y = 3000, 3000
+        scene.update(0.0)
+        scene.streamer.finish_loading(scene)
+
+        assert (0, 0) not in scene.streamer.loaded
+        assert [(e.x, e.y) for e in scene.enemies] == [(3000, 3000)]
+        scene.stop_streaming()
+        records, _ = chunks.read((0, 0))
+        assert records["speed"].tolist() == [42.0]
+        assert chunks.agent_type(int(records["agent"][0])) is ChasingAI
+        assert stored(chunks) == 2
+
+    def test_wanderers_are_written_to_their_chunk(self, chunks):
+        """Test an enemy leaving the loaded chunks is stored where it went."""
+        scene = streamed_scene(chunks)
+        enemy = scene.spawn_enemy(100, 100)
+        enemy.x = 3500
+
+        scene.streamer.update(scene)
+        scene.streamer.stop(scene)
+
+        assert chunks.count((6, 0)) == 1
+
+    def test_chase_targets_keep_chunks_loaded(self, chunks):
+        """Test the chunks around a chase target load too."""
+        scene = streamed_scene(chunks)
+        chaser, agent = scene.spawn_enemy_and_agent(100, 100, ChasingAI)
+        target = scene.spawn_enemy(200, 200)
+        agent.set_target(target)
+        target.x, target.y = 3700, 3700
+
+        scene.streamer.update(scene)
+        scene.streamer.finish_loading(scene)
+
+        assert (7, 7) in scene.streamer.loaded
+        assert target in scene.enemies and chaser in scene.enemies
+        scene.stop_streaming()
+
+    def test_full_chunk_keeps_enemies_in_scene(self, tmp_path):
+        """Test enemies leaving for a full chunk stay until it has room."""
+        path = tmp_path / "small.chunks"
+        with ChunkFile.create(path, COLUMNS, ROWS, capacity=1) as small:
+            scene = streamed_scene(small)
+            first = scene.spawn_enemy(100, 100)
+            second = scene.spawn_enemy(100, 100)
+            first.x = 3500
+            scene.streamer.update(scene)
+            # The first write may still be queued; it counts against the chunk
+            second.x = 3500
+            scene.streamer.update(scene)
+
+            assert first not in scene.enemies and second in scene.enemies
+            scene.despawn_enemies([second])
+            scene.stop_streaming()
+            assert small.count((6, 0)) == 1
+
+    def test_terrain_streams_into_navigation(self, chunks):
+        """Test chunk terrain blocks navigation while loaded and keeps edits."""
+        tiles = np.zeros((chunks.tiles, chunks.tiles), np.uint8)
+        tiles[2, 3] = 1
+        chunks.write_tiles((0, 0), tiles)
+        scene = streamed_scene(chunks)
+        assert scene.navigation.blocked[2, 3]
+
+        scene.navigation.set_blocked(0, 0, 32, 32)
+        scene.stop_streaming()
+
+        assert not scene.navigation.blocked.any()
+        _, saved = chunks.read((0, 0))
+        assert saved[0, 0] and saved[2, 3]
+
+    def test_world_must_match(self, chunks):
+        """Test a scene of another size can't stream the file."""
+        scene = GameScene()
+        with pytest.raises(ValueError):
+            WorldStreamer(chunks).start(scene)
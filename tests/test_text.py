@@ -0,0 +1,64 @@
+"""
+Tests for the text renderer.
+"""
+
+import pygame
+
+from utils.text import TextRenderer
+
+
+class TestTextRenderer:
+    """Test cached text rendering."""
+
+    def test_fonts_are_shared(self):
+        """Test one font object is created per (path, size)."""
+        renderer = TextRenderer()
+
+        assert renderer.font(18) is renderer.font(18)
+        assert renderer.font(18) is not renderer.font(24)
+
+    def test_render_caches_strings(self):
+        """Test a string is rasterized once per color and antialias setting."""
+        renderer = TextRenderer()
+
+        first = renderer.render("Score", (255, 255, 255), 18)
+        second = renderer.render("Score", [255, 255, 255], 18)
+        other = renderer.render("Score", (255, 0, 0), 18)
+
+        assert first is second
+        assert other is not first
+        assert (renderer.hits, renderer.misses) == (1, 2)
+
+    def test_render_evicts_least_recently_used(self):
+        """Test the string cache stays within its limit."""
+        renderer = TextRenderer(max_surfaces=2)
+        a = renderer.render("a", (255, 255, 255), 18)
+        renderer.render("b", (255, 255, 255), 18)
+        renderer.render("a", (255, 255, 255), 18)
+        renderer.render("c", (255, 255, 255), 18)
+
+        assert renderer.render("a", (255, 255, 255), 18) is a
+        assert len(renderer) == 2
+
+    def test_draw_reuses_glyphs(self):
+        """Test changing numbers only rasterize each digit once."""
+        renderer = TextRenderer()
+        screen = pygame.Surface((200, 50))
+
+        for value in range(100):
+            renderer.draw(screen, f"{value:02d}", (0, 0), (255, 255, 255), 18)
+
+        assert renderer.misses == 10
+
+    def test_draw_matches_whole_string_width(self):
+        """Test glyph-composed text covers the area of the rendered string."""
+        renderer = TextRenderer()
+        screen = pygame.Surface((200, 50))
+
+        area = renderer.draw(screen, "1234", (10, 5), (255, 255, 255), 18)
+
+        width, height = renderer.render("1234", (255, 255, 255), 18).get_size()
+        assert area.topleft == (10, 5)
+        assert abs(area.width - width) <= 2
+        assert area.height == height
+        assert screen.get_bounding_rect().colliderect(area)
@@ -0,0 +1,140 @@
+"""
+Tests for AI parameter sweeps.
+"""
+
+import json
+
+import pytest
+
+from ai.agents import ChasingAI, FlockingAI
+from ai.tuning import (
+    METRICS,
+    PARAMETERS,
+    grid_configs,
+    load_results,
+    random_configs,
+    run_sweep,
+    simulate,
+    summarize,
+)
+from game.entities import Enemy
+from game.store import EntityStore
+
+# Small simulations keep sweeps fast
+SETTINGS = {"flockers": 8, "chasers": 2, "steps": 20}
+
+
+class TestSearchSpaces:
+    """Test grid and random configuration generation."""
+
+    def test_grid_crosses_every_value(self):
+        """Test a grid holds every combination of values."""
+        configs = grid_configs(
+            {"separation_weight": [1.0, 2.0], "cohesion_weight": [0.5, 1.0, 1.5]}
+        )
+        assert len(configs) == 6
+        assert {"separation_weight": 2.0, "cohesion_weight": 1.5} in configs
+
+    def test_random_draws_within_ranges(self):
+        """Test random configurations are reproducible and within range."""
+        space = {"neighbor_radius": (50.0, 150.0)}
+        configs = random_configs(space, 10, seed=3)
+        assert configs == random_configs(space, 10, seed=3)
+        assert all(50.0 <= c["neighbor_radius"] <= 150.0 for c in configs)
+
+    def test_rejects_unknown_parameters(self):
+        """Test parameters that can't be tuned are refused."""
+        with pytest.raises(ValueError):
+            grid_configs({"gravity": [1.0]})
+
+
+class TestSimulate:
+    """Test the simulate function."""
+
+    def test_metrics(self):
+        """Test a run reports every metric."""
+        metrics = simulate({}, **SETTINGS)
+        assert set(metrics) == set(METRICS)
+        assert metrics["cohesion"] > 0
+        assert metrics["frame_ms"] > 0
+
+    def test_same_seed_same_behavior(self):
+        """Test runs are deterministic apart from timing."""
+        config = {"cohesion_weight": 2.0}
+        first = simulate(config, seed=4, **SETTINGS)
+        second = simulate(config, seed=4, **SETTINGS)
+        assert first["cohesion"] == second["cohesion"]
+        assert first["collisions"] == second["collisions"]
+
+    def test_parameters_change_behavior(self):
+        """Test the tuned parameters reach the agents."""
+        tight = simulate({"cohesion_weight": 5.0, "separation_weight": 0.0}, **SETTINGS)
+        loose = simulate({"flocking_speed": 0.0, "chasing_speed": 0.0}, **SETTINGS)
+        assert tight["cohesion"] != loose["cohesion"]
+        assert set(PARAMETERS) >= {"cohesion_weight", "flocking_speed"}
+
+    def test_defaults_match_agents(self):
+        """Test untuned speeds are the agents' own defaults."""
+        enemy = Enemy(0, 0, EntityStore())
+        assert PARAMETERS["flocking_speed"] == FlockingAI(enemy).speed
+        assert PARAMETERS["chasing_speed"] == ChasingAI(enemy).speed
+
+
+class TestRunSweep:
+    """Test the run_sweep function."""
+
+    def test_streams_results(self, tmp_path):
+        """Test each run is written as one JSON line with its metrics."""
+        path = tmp_path / "sweep.jsonl"
+        configs = grid_configs({"alignment_weight": [0.5, 1.0]})
+        results = run_sweep(configs, path, workers=0, repeats=2, **SETTINGS)
+        assert len(results) == 4
+        lines = path.read_text().splitlines()
+        assert len(lines) == 4
+        assert {json.loads(line)["seed"] for line in lines} == {0, 1}
+
+    def test_resumes_after_interruption(self, tmp_path):
+        """Test recorded runs are skipped and a cut-off line is ignored."""
+        path = tmp_path / "sweep.jsonl"
+        configs = grid_configs({"alignment_weight": [0.5, 1.0, 1.5]})
+        run_sweep(configs[:2], path, workers=0, **SETTINGS)
+        with path.open("a") as results:
+            results.write('{"config": {"alignment_weight"')
+
+        ran = []
+        results = run_sweep(configs, path, workers=0, on_result=ran.append, **SETTINGS)
+        assert [result["config"] for result in ran] == [configs[2]]
+        assert [result["config"] for result in results] == configs
+        assert len(load_results(path)) == 3
+
+    def test_changed_settings_rerun(self, tmp_path):
+        """Test runs recorded with other settings don't count as done."""
+        path = tmp_path / "sweep.jsonl"
+        configs = [{"chasing_speed": 50.0}]
+        run_sweep(configs, path, workers=0, **SETTINGS)
+        ran = []
+        run_sweep(
+            configs, path, workers=0, on_result=ran.append, **{**SETTINGS, "steps": 5}
+        )
+        assert len(ran) == 1
+
+    def test_process_pool(self, tmp_path):
+        """Test worker processes produce the in-process results."""
+        configs = grid_configs({"separation_weight": [1.0, 2.0]})
+        local = run_sweep(configs, tmp_path / "a.jsonl", workers=0, **SETTINGS)
+        pooled = run_sweep(configs, tmp_path / "b.jsonl", workers=2, **SETTINGS)
+        for a, b in zip(local, pooled):
+            assert a["config"] == b["config"]
+            assert a["metrics"]["cohesion"] == b["metrics"]["cohesion"]
+
+    def test_summarize_averages_repeats(self, tmp_path):
+        """Test the summary has one entry per configuration."""
+        configs = grid_configs({"cohesion_weight": [1.0, 2.0]})
+        results = run_sweep(
+            configs, tmp_path / "s.jsonl", workers=0, repeats=3, **SETTINGS
+        )
+        summary = summarize(results)
+        assert [entry["runs"] for entry in summary] == [3, 3]
+        assert summary[0]["metrics"]["collisions"] == pytest.approx(
+            sum(r["metrics"]["collisions"] for r in results[:3]) / 3
+        )
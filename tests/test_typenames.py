@@ -0,0 +1,34 @@
+"""
+Tests for importable type names.
+"""
+
+import pytest
+
+from ai.agents import AIAgent, ChasingAI
+from game.entities import Enemy, Entity
+from utils.typenames import resolve_type, type_name
+
+
+class TestTypeNames:
+    """Test naming and resolving classes."""
+
+    def test_round_trip(self):
+        """Test a class resolves back from its name."""
+        assert type_name(ChasingAI) == "ai.agents:ChasingAI"
+        assert resolve_type(type_name(ChasingAI), AIAgent) is ChasingAI
+        assert resolve_type(type_name(Enemy), (Entity, AIAgent)) is Enemy
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "ai.agents:NoSuchAgent",
+            "no_such_module:Thing",
+            ":ChasingAI",
+            "os:system",
+            "game.entities:Enemy",
+        ],
+    )
+    def test_rejects_unknown_or_foreign_names(self, name):
+        """Test names that don't import or aren't agent classes are refused."""
+        with pytest.raises(ValueError):
+            resolve_type(name, AIAgent)
@@ -0,0 +1,137 @@
+"""
+Parameter sweep runner for flocking weights and agent speeds.
+
+Usage:
+    python tools/tune.py --grid separation_weight=1,1.5,2 --output sweep.jsonl
+    python tools/tune.py --random cohesion_weight=0.5:2 --samples 50 --output s.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Run without a window and make the game packages importable
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from ai.tuning import (
+    DEFAULT_CHASERS,
+    DEFAULT_FLOCKERS,
+    DEFAULT_STEPS,
+    METRICS,
+    PARAMETERS,
+    grid_configs,
+    random_configs,
+    run_sweep,
+    summarize,
+)
+
+
+def parse_param(text: str) -> tuple[str, str]:
+    """Split a ``name=values`` parameter argument."""
+    name, sep, values = text.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"Expected name=values, got {text!r}")
+    return name, values
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[1],
+        epilog=f"Parameters: {', '.join(PARAMETERS)}",
+    )
+    parser.add_argument(
+        "--grid",
+        type=parse_param,
+        action="append",
+        default=[],
+        help="name=v1,v2,... values to cross with every other grid parameter",
+    )
+    parser.add_argument(
+        "--random",
+        type=parse_param,
+        action="append",
+        default=[],
+        help="name=low:high range to sample uniformly",
+    )
+    parser.add_argument(
+        "--samples", type=int, default=20, help="random configurations to draw"
+    )
+    parser.add_argument(
+        "--output", type=Path, required=True, help="JSON Lines results file"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="worker processes (default: every core)"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=1, help="seeded runs per configuration"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="first run seed")
+    parser.add_argument("--flockers", type=int, default=DEFAULT_FLOCKERS)
+    parser.add_argument("--chasers", type=int, default=DEFAULT_CHASERS)
+    parser.add_argument(
+        "--steps", type=int, default=DEFAULT_STEPS, help="simulation steps per run"
+    )
+    parser.add_argument(
+        "--sort",
+        default="cohesion",
+        choices=METRICS,
+        help="metric to rank configurations by",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the sweep and print the configurations ranked by one metric."""
+    args = parse_args(argv)
+    if bool(args.grid) == bool(args.random):
+        print("Give either --grid or --random parameters", file=sys.stderr)
+        return 2
+    try:
+        if args.grid:
+            configs = grid_configs(
+                {
+                    name: [float(value) for value in values.split(",")]
+                    for name, values in args.grid
+                }
+            )
+        else:
+            space = {}
+            for name, values in args.random:
+                low, _, high = values.partition(":")
+                space[name] = (float(low), float(high or low))
+            configs = random_configs(space, args.samples, args.seed)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+
+    total = len(configs) * args.repeats
+
+    def progress(result: dict) -> None:
+        metrics = " ".join(f"{k}={v:.3f}" for k, v in result["metrics"].items())
+        print(f"{json.dumps(result['config'])} seed={result['seed']} {metrics}")
+
+    print(f"Running {total} simulations into {args.output}", file=sys.stderr)
+    results = run_sweep(
+        configs,
+        args.output,
+        workers=args.workers,
+        repeats=args.repeats,
+        seed=args.seed,
+        flockers=args.flockers,
+        chasers=args.chasers,
+        steps=args.steps,
+        on_result=progress,
+    )
+
+    summary = summarize(results)
+    summary.sort(key=lambda entry: entry["metrics"][args.sort])
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())